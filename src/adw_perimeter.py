@@ -3,6 +3,7 @@
 Create / Manipulate figure perimiters
 """
 import re 
+from collections import deque
 
 from select_trace import SlTrace
 from braille_cell import BrailleCell 
@@ -334,6 +335,12 @@ class SurroundingSquares:
 
     
 class AdwPerimeter:
+    # Moore neighborhood, clockwise (iy increases downward)
+    # from east: E, SE, S, SW, W, NW, N, NE
+    MOORE_DIRS = [(1,0), (1,1), (0,1), (-1,1),
+                  (-1,0), (-1,-1), (0,-1), (1,-1)]
+    MOORE_DIR_INDEX = {d: i for i, d in enumerate(MOORE_DIRS)}
+    DIR_W = 4
     
     def __init__(self, adw, cells=None):
         """ Setup for perimeter calculation 
@@ -352,8 +359,362 @@ class AdwPerimeter:
                 cells = cdict
         self.cells = cells
         
-    def get_perimeter(self):
-        """ Get perimeter list of cells
+    def get_perimeter(self, include_holes=False):
+        """ Get perimeter list of cells, as get_perimeter_shrink
+            1. Get the surrounding squares get_perimeter_shrink
+            ends with (get_surrounding_list)
+            2. As get_perimeter_shrink does with its surrounding
+            squares, take, for each surrounding square, its first
+            not yet used neighboring cell, in get_n_ixys order
+        Disjoint figures are surrounded, as get_perimeter_shrink
+        does, by one ring.
+        
+        :include_holes: True - also traverse cells around holes
+                (enclosed empty regions), and figures within holes,
+                after the outside perimeter, with pi_type "h"
+                default: False - outside perimeter only
+        :returns: list of cells(BrailleCell) which is the perimeter of
+                the figure(s). Sets perimeter cells
+                         pi_number=position number
+                         pi_type = "p" ("h" for holes)
+        """
+        cells = self.cells
+        if len(cells) == 0:
+            return []
+        
+        cell_list = []
+        used = set()
+        self.add_surrounding_cells(self.get_surrounding_list(),
+                                   cell_list, used, pi_type="p")
+        if include_holes:
+            ixs = [ixy[0] for ixy in cells]
+            iys = [ixy[1] for ixy in cells]
+            box = (min(ixs)-1, min(iys)-1, max(ixs)+1, max(iys)+1)
+            outside = self.get_outside_spaces(box)
+            for hole_start, hole in self.get_holes(box, outside):
+                squares = self.trace_contour(hole_start, hole)
+                self.add_surrounding_cells(squares, cell_list, used,
+                                           pi_type="h")
+            for figure_start in self.get_figure_starts():
+                ix,iy = figure_start
+                if (ix,iy-1) in outside:
+                    continue        # Not within a hole
+                
+                squares = []
+                self.trace_contour(figure_start, cells, surrounding=squares)
+                self.add_surrounding_cells(squares, cell_list, used,
+                                           pi_type="h")
+        SlTrace.lg(lambda: "perimeter cell list\n"
+                   + " ".join(f"{cell.pi_number}: {cell}"
+                              for cell in cell_list), "ssquare_list")
+        return cell_list
+
+    def get_surrounding_list(self):
+        """ Get the surrounding squares, in traversal order, that
+        get_perimeter_shrink ends with, by the same reduce_extra and
+        expand_if_possible passes over the same square list (including
+        its repeated corner squares), on plain dictionaries.
+        A pass only rechecks squares whose neighbors or list
+        neighbors changed since their last check - the others would
+        not change - so the work is a list scan per pass, plus the
+        squares actually moved, instead of print_text and neighbor
+        checks of every square on every pass.
+        :returns: list of square ixys (repeats possible)
+        """
+        ix_min,iy_min, ix_max,iy_max = self.bounding_box_ci(
+                        cells=self.cells, add_edge=2)
+        cells = self.cells
+        n_dirs = [(dx,dy) for dx in range(-1,2) for dy in range(-1,2)
+                  if dx != 0 or dy != 0]      # get_n_ixys order
+        state = {}          # "o" - outside, "s" - surrounding, else inside
+        for ix in range(ix_min, ix_max+1):
+            state[(ix,iy_min)] = state[(ix,iy_max)] = "o"
+        for iy in range(iy_min, iy_max+1):
+            state[(ix_min,iy)] = state[(ix_max,iy)] = "o"
+        ring = ([(ix,iy_min+1) for ix in range(ix_min+1, ix_max)]
+                + [(ix_max-1,iy) for iy in range(iy_min+1, iy_max)]
+                + [(ix,iy_max-1) for ix in range(ix_max-1, ix_min, -1)]
+                + [(ix_min+1,iy) for iy in range(iy_max-1, iy_min, -1)])
+        # Square list, as SurroundingSquares, by node number
+        sq_ixy = list(ring)
+        sq_prev = [None] + list(range(len(ring)-1))
+        sq_next = list(range(1, len(ring))) + [None]
+        sq_at = {}          # ixy's current node, as squares dictionary
+        sq_all = {}         # all of ixy's nodes - corners are repeated
+        for nsq, ixy in enumerate(ring):
+            sq_at[ixy] = nsq
+            sq_all.setdefault(ixy, []).append(nsq)
+            state[ixy] = "s"
+        check_reduce = set(state)   # to be checked
+        check_expand = set(state)
+
+        def is_inside(ixy):
+            ix,iy = ixy
+            return (ixy not in state and ix_min <= ix <= ix_max
+                    and iy_min <= iy <= iy_max)
+        
+        def changed(ixy):
+            """ ixy changed state: recheck it, its neighbors,
+            and list neighbors of its squares
+            """
+            ix,iy = ixy
+            check_ixys = [ixy] + [(ix+dx,iy+dy) for dx,dy in n_dirs]
+            for nsq in sq_all[ixy]:
+                for nsq_link in (sq_prev[nsq], sq_next[nsq]):
+                    if nsq_link is not None:
+                        check_ixys.append(sq_ixy[nsq_link])
+            check_reduce.update(check_ixys)
+            check_expand.update(check_ixys)
+            
+        def reduce_extra(ixy):
+            """ As AdwPerimeter.reduce_extra
+            """
+            if state.get(ixy) != "s":
+                return False
+            
+            ix,iy = ixy
+            n_ixys = [(ix+dx,iy+dy) for dx,dy in n_dirs]
+            if not any(state.get(n_ixy) == "o" for n_ixy in n_ixys):
+                return False
+            
+            if any(is_inside(n_ixy) for n_ixy in n_ixys):
+                return False
+            
+            nsq = sq_at.pop(ixy)
+            nsq_prev, nsq_next = sq_prev[nsq], sq_next[nsq]
+            if nsq_prev is not None:
+                sq_next[nsq_prev] = nsq_next
+            if nsq_next is not None:
+                sq_prev[nsq_next] = nsq_prev
+            for nsq_link in (nsq_prev, nsq_next):
+                if nsq_link is not None:
+                    check_reduce.add(sq_ixy[nsq_link])
+                    check_expand.add(sq_ixy[nsq_link])
+            sq_all[ixy].remove(nsq)
+            state[ixy] = "o"
+            changed(ixy)
+            return True
+
+        def expand_if_possible(ixy):
+            """ As SurroundingSquare.expand_if_possible
+            """
+            ix,iy = ixy
+            spaces = [(ix+dx,iy+dy) for dx,dy in n_dirs
+                      if is_inside((ix+dx,iy+dy))
+                      and (ix+dx,iy+dy) not in cells]
+            nsq = sq_at.get(ixy)
+            if len(spaces) == 0 or nsq is None:
+                return False
+            
+            conns = [nsq_conn
+                     for nsq_conn in (sq_prev[nsq], nsq, sq_next[nsq])
+                     if nsq_conn is not None
+                     and state.get(sq_ixy[nsq_conn]) == "s"]
+            for sp_ix,sp_iy in spaces:
+                conn_neighbors = [nsq_conn for nsq_conn in conns
+                                  if abs(sq_ixy[nsq_conn][0]-sp_ix) <= 1
+                                  and abs(sq_ixy[nsq_conn][1]-sp_iy) <= 1]
+                if len(conn_neighbors) > 1:
+                    break
+            else:
+                return False
+            
+            after = sq_at[sq_ixy[conn_neighbors[0]]]  # as insert_square
+            after_next = sq_next[after]
+            nsq_new = len(sq_ixy)
+            space_ixy = (sp_ix,sp_iy)
+            sq_ixy.append(space_ixy)
+            sq_prev.append(after)
+            sq_next.append(after_next)
+            sq_next[after] = nsq_new
+            if after_next is not None:
+                sq_prev[after_next] = nsq_new
+            sq_at[space_ixy] = nsq_new
+            sq_all.setdefault(space_ixy, []).append(nsq_new)
+            state[space_ixy] = "s"
+            changed(space_ixy)
+            return True
+
+        def get_squares_list():
+            nsqs = []
+            nsq = 0
+            while nsq is not None:
+                nsqs.append(nsq)
+                nsq = sq_next[nsq]
+            return nsqs
+
+        def check_squares(check, check_fun):
+            """ One pass over the square list
+            :returns: number of changes
+            """
+            n_change = 0
+            for nsq in get_squares_list():
+                ixy = sq_ixy[nsq]
+                if ixy not in check:
+                    continue
+                
+                if check_fun(ixy):
+                    n_change += 1
+                else:
+                    check.discard(ixy)
+            return n_change
+
+        while True:
+            while check_squares(check_reduce, reduce_extra) > 0:
+                pass
+            if check_squares(check_expand, expand_if_possible) == 0:
+                break
+            
+        return [sq_ixy[nsq] for nsq in get_squares_list()]
+
+    def add_surrounding_cells(self, squares, cell_list, used, pi_type="p"):
+        """ Append, numbering it, the first not yet used neighboring
+        cell, in get_n_ixys order, of each surrounding square,
+        as surrounding_to_perimeter
+        :squares: surrounding square ixys in traversal order
+        :cell_list: perimeter list to append to
+        :used: set of ixy already in perimeter list - updated
+        :pi_type: perimeter type to set default: "p"
+        """
+        cells = self.cells
+        for sq_ixy in squares:
+            for ixy in self.get_n_ixys(ixy=sq_ixy):
+                if ixy in cells and ixy not in used:
+                    used.add(ixy)
+                    cell = cells[ixy]
+                    cell.pi_number = len(cell_list) + 1
+                    cell.pi_type = pi_type
+                    cell_list.append(cell)
+                    break
+        
+    def get_outside_spaces(self, box):
+        """ Flood fill (4-connected) empty squares, within box,
+        reachable from box edge, which must be empty
+        :box: (ix_min,iy_min, ix_max,iy_max)
+        :returns: set of outside square ixys
+        """
+        ix_min,iy_min, ix_max,iy_max = box
+        cells = self.cells
+        outside = {(ix_min,iy_min)}
+        to_visit = deque(outside)
+        while to_visit:
+            ix,iy = to_visit.popleft()
+            for n_ixy in ((ix+1,iy), (ix-1,iy), (ix,iy+1), (ix,iy-1)):
+                n_ix,n_iy = n_ixy
+                if (n_ixy not in outside and n_ixy not in cells
+                        and ix_min <= n_ix <= ix_max
+                        and iy_min <= n_iy <= iy_max):
+                    outside.add(n_ixy)
+                    to_visit.append(n_ixy)
+        return outside
+
+    def get_figure_starts(self):
+        """ Get top-left cell of each (8-connected) figure
+        :returns: list of ixy, sorted top to bottom, left to right
+        """
+        cells = self.cells
+        seen = set()
+        starts = []
+        for ixy in cells:
+            if ixy in seen:
+                continue
+            
+            start = ixy
+            seen.add(ixy)
+            to_visit = [ixy]
+            while to_visit:
+                ix,iy = to_visit.pop()
+                if (iy,ix) < (start[1],start[0]):
+                    start = (ix,iy)
+                for dx,dy in self.MOORE_DIRS:
+                    n_ixy = (ix+dx,iy+dy)
+                    if n_ixy in cells and n_ixy not in seen:
+                        seen.add(n_ixy)
+                        to_visit.append(n_ixy)
+            starts.append(start)
+        starts.sort(key=lambda ixy: (ixy[1],ixy[0]))
+        return starts
+
+    def get_holes(self, box, outside):
+        """ Get enclosed empty regions (4-connected)
+        :box: (ix_min,iy_min, ix_max,iy_max)
+        :outside: set of outside squares
+        :returns: list of (top-left ixy, set of hole ixy),
+                sorted top to bottom, left to right
+        """
+        ix_min,iy_min, ix_max,iy_max = box
+        cells = self.cells
+        seen = set()
+        holes = []
+        for iy in range(iy_min, iy_max+1):
+            for ix in range(ix_min, ix_max+1):
+                ixy = (ix,iy)
+                if ixy in cells or ixy in outside or ixy in seen:
+                    continue
+                
+                hole = {ixy}     # row scan => ixy is top-left
+                to_visit = [ixy]
+                while to_visit:
+                    h_ix,h_iy = to_visit.pop()
+                    for n_ixy in ((h_ix+1,h_iy), (h_ix-1,h_iy),
+                                  (h_ix,h_iy+1), (h_ix,h_iy-1)):
+                        if n_ixy not in cells and n_ixy not in hole:
+                            hole.add(n_ixy)
+                            to_visit.append(n_ixy)
+                seen |= hole
+                holes.append((ixy, hole))
+        return holes
+
+    def trace_contour(self, start, region, surrounding=None):
+        """ Moore-neighbor trace, clockwise, of region's outer
+        boundary, with Jacob's stopping criterion
+        :start: top-left ixy of (8-connected) region
+        :region: set/dictionary of region ixys
+        :surrounding: list to which the squares, not in region,
+                checked are appended, in order of first check
+                default: not collected
+        :returns: list of boundary ixys in traversal order,
+                possibly with repeats e.g. one square wide lines
+        """
+        dirs = self.MOORE_DIRS
+        dir_index = self.MOORE_DIR_INDEX
+        contour = [start]
+        checked = set()
+        back = self.DIR_W           # Left of top-left is not in region
+        start_back = None
+        cur = start
+        while True:
+            cx,cy = cur
+            for k in range(1, 9):
+                d = (back+k) % 8
+                dx,dy = dirs[d]
+                nxt = (cx+dx,cy+dy)
+                if nxt in region:
+                    break
+                
+                if surrounding is not None and nxt not in checked:
+                    checked.add(nxt)
+                    surrounding.append(nxt)
+            else:
+                return contour      # Isolated square
+            
+            if start_back is None:
+                start_back = d
+            elif cur == start and d == start_back:
+                return contour      # Back where we started
+            
+            # Backtrack: previous checked square, relative to next
+            pdx,pdy = dirs[(d-1) % 8]
+            back = dir_index[(cx+pdx-nxt[0], cy+pdy-nxt[1])]
+            cur = nxt
+            if cur == start and back == self.DIR_W:
+                return contour
+            
+            contour.append(cur)
+
+    def get_perimeter_shrink(self):
+        """ Get perimeter list of cells, by repeated shrinking
+        of a surrounding ring - replaced by get_perimeter
         Starts with:
             1. a rectangular region, labeled outside, of empty squares 2 squares
             outside the bounding box 2. a rectangular region, labeled
@@ -0,0 +1,189 @@
+# adw_perimeter_timing.py  18Oct2026  crs, Author
+""" AdwPerimeter perimeter extraction time, random figures
+    shrink: get_perimeter_shrink - repeated ring shrinking
+            (small figures only - it is superlinear)
+    get_perimeter - same passes, only rechecking changed squares
+First checks that get_perimeter gives get_perimeter_shrink's
+ordered cell list, with pi_number, pi_type, for single figures
+(CHECK_SHAPES) and random shrink_size figures, failing if not.
+Usage: python adw_perimeter_timing.py [--size N] [--shrink_size N]
+                        [--density F] [--repeat N]
+"""
+import argparse
+import random
+import sys
+import time
+
+from select_trace import SlTrace
+from braille_cell import BrailleCell
+from adw_perimeter import AdwPerimeter
+
+class FigureGrid:
+    """ Just the AudioDrawWindow links AdwPerimeter uses,
+    for a figure on a size x size grid
+    """
+    def __init__(self, cells, size):
+        self.cells = cells
+        self.size = size
+
+    def get_cells(self):
+        return self.cells
+
+    def get_cell_at_ixy(self, cell_ixy, cells=None):
+        if cells is None:
+            cells = self.cells
+        return cells.get(cell_ixy)
+
+    def is_space(self, ixy=None):
+        return ixy not in self.cells
+
+    def bounding_box_ci(self, cells=None, add_edge=None):
+        if cells is None:
+            cells = self.cells
+        ixys = [cell if isinstance(cell, tuple) else (cell.ix,cell.iy)
+                for cell in cells]
+        ix_min = min(ixy[0] for ixy in ixys)
+        ix_max = max(ixy[0] for ixy in ixys)
+        iy_min = min(ixy[1] for ixy in ixys)
+        iy_max = max(ixy[1] for ixy in ixys)
+        if add_edge is not None:
+            ix_min -= add_edge
+            iy_min -= add_edge
+            ix_max += add_edge
+            iy_max += add_edge
+        return ix_min,iy_min, ix_max,iy_max
+
+def make_figure(size, density, seed):
+    """ Random blobby figure(s): random fill, smoothed by
+    neighbor majority so there are solid areas, holes, and
+    disjoint pieces
+    :returns: dictionary of BrailleCell by (ix,iy)
+    """
+    random.seed(seed)
+    filled = {(ix,iy) for ix in range(size) for iy in range(size)
+              if random.random() < density}
+    for _ in range(2):
+        smoothed = set()
+        for ix in range(size):
+            for iy in range(size):
+                n_filled = sum((ix+dx,iy+dy) in filled
+                               for dx in (-1,0,1) for dy in (-1,0,1))
+                if n_filled >= 5:
+                    smoothed.add((ix,iy))
+        filled = smoothed
+    colors = "rgby"
+    return {ixy: BrailleCell(ix=ixy[0], iy=ixy[1], color=random.choice(colors))
+            for ixy in filled}
+
+CHECK_SHAPES = {
+    "plus": """
+.r.
+rrr
+.r.
+""",
+    "L": """
+r..
+r..
+r..
+rrr
+""",
+    "bar": """
+.rrr.
+ooooo
+.ggg.
+""",
+    "square colors": """
+ggrrrrrro
+ggrrrrrro
+ggrrrrrro
+gg......o
+gg......o
+ggyyyyyyy
+""",
+    }
+
+def shape_figure(shape):
+    """ Figure from text, "." for empty, one square in from 0,0
+    :returns: dictionary of BrailleCell by (ix,iy)
+    """
+    cells = {}
+    for iy, line in enumerate(shape.strip().split("\n")):
+        for ix, ch in enumerate(line):
+            if ch != ".":
+                cells[(ix+1,iy+1)] = BrailleCell(ix=ix+1, iy=iy+1, color=ch)
+    return cells
+
+def perimeter_ixys(cells, method):
+    """ :returns: list of perimeter cell (ix,iy,pi_number,pi_type),
+            traversal order
+    """
+    adwp = AdwPerimeter(adw=FigureGrid(cells, 0), cells=cells)
+    return [(cell.ix,cell.iy, cell.pi_number,cell.pi_type)
+            for cell in getattr(adwp, method)()]
+
+def compare_perimeters(cells):
+    """ Compare get_perimeter with get_perimeter_shrink
+    :returns: (same order, extra cells, missing cells)
+    """
+    shrink = perimeter_ixys(cells, "get_perimeter_shrink")
+    trace = perimeter_ixys(cells, "get_perimeter")
+    shrink_ixys = {perim[:2] for perim in shrink}
+    trace_ixys = {perim[:2] for perim in trace}
+    return (trace == shrink, len(trace_ixys - shrink_ixys),
+            len(shrink_ixys - trace_ixys))
+
+def time_perimeter(method, size, density, repeat):
+    """ :returns: (seconds per figure, average perimeter length, cells)
+    """
+    t_total = 0
+    n_perim = 0
+    n_cells = 0
+    for seed in range(repeat):
+        cells = make_figure(size, density, seed)
+        adwp = AdwPerimeter(adw=FigureGrid(cells, size), cells=cells)
+        t_beg = time.perf_counter()
+        perim = getattr(adwp, method)()
+        t_total += time.perf_counter() - t_beg
+        n_perim += len(perim)
+        n_cells += len(cells)
+    return t_total/repeat, n_perim/repeat, n_cells/repeat
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size', type=int, dest='size', default=100)
+    parser.add_argument('--shrink_size', type=int, dest='shrink_size', default=12)
+    parser.add_argument('--density', type=float, dest='density', default=.5)
+    parser.add_argument('--repeat', type=int, dest='repeat', default=5)
+    args = parser.parse_args()
+    failed = False
+    for name, shape in CHECK_SHAPES.items():
+        same, n_extra, n_missing = compare_perimeters(shape_figure(shape))
+        SlTrace.lg(f"{name:14} " + ("same" if same else
+                   f"DIFFERENT extra:{n_extra} missing:{n_missing}"),
+                   to_stdout=True)
+        if not same:
+            failed = True
+    n_same = 0
+    for seed in range(args.repeat):
+        cells = make_figure(args.shrink_size, args.density, seed)
+        same, n_extra, n_missing = compare_perimeters(cells)
+        if same:
+            n_same += 1
+        else:
+            failed = True
+        SlTrace.lg(f"random seed {seed:2}: "
+                   + ("same" if same else
+                      f"DIFFERENT extra:{n_extra} missing:{n_missing}"),
+                   to_stdout=True)
+    SlTrace.lg(f"random {args.shrink_size}x{args.shrink_size}:"
+               f" {n_same} of {args.repeat} same", to_stdout=True)
+    for method, size in [("get_perimeter_shrink", args.shrink_size),
+                         ("get_perimeter", args.shrink_size),
+                         ("get_perimeter", args.size)]:
+        t_per, n_perim, n_cells = time_perimeter(method, size, args.density,
+                                                 args.repeat)
+        SlTrace.lg(f"{method:22} {size:4}x{size:<4} cells:{n_cells:7.0f}"
+                   f" perimeter:{n_perim:6.0f}  msec: {t_per*1000:9.1f}",
+                   to_stdout=True)
+    SlTrace.lg("check " + ("FAILED" if failed else "passed"), to_stdout=True)
+    sys.exit(1 if failed else 0)
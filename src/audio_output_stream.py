@@ -0,0 +1,514 @@
+# audio_output_stream.py  18Oct2026  crs, Author
+"""
+Continuous audio output
+
+One output stream stays open; its callback pulls sample blocks
+from a queue of AudioSegment (tone, waveform or silence) so
+consecutive tones play without reopening the device, and delays
+are exact sample counts.
+
+The segment queue is a collections.deque, guarded by seg_lock,
+which the audio callback holds only to pop the next segment.
+The audio callback only copies samples; finished segments are
+passed to a completion thread which sets their done event and
+calls their on_done function, replacing sleep polling.
+
+Look ahead is bounded: when more than max_segments segments, or
+more than max_ahead seconds, are queued the oldest queued segments
+are dropped (cancelled).  Segments may have a key and group, as
+SpeakerCmdQueue commands: queuing a keyed segment cancels queued
+segments with its key, except those of its group.
+A feeder with its own (e.g. priority) queue can instead call
+wait_ahead before each play, keeping only a short look ahead
+queued, so later urgent sounds are not behind a long backlog.
+
+Devices:
+    "sounddevice" - sounddevice.OutputStream (default)
+    "null" - no sound, blocks consumed by a thread,
+            in real time or, realtime=False, as fast as possible
+    "file" - as "null", also writing the samples to a wav file
+The "null" and "file" devices support headless testing.
+"""
+import time
+import wave
+from collections import deque
+from threading import Thread, Event, Condition, Lock
+
+import numpy as np
+try:
+    import sounddevice as sd
+except (ImportError, OSError):     # OSError: no PortAudio library
+    sd = None           # Only "null", "file" devices
+
+from select_trace import SlTrace, SelectError
+
+class AudioOutputStreamError(SelectError):
+    pass
+
+
+class AudioSegment:
+    """ Samples (or silence) queued for output
+    """
+    def __init__(self, samples=None, nframes=None, on_done=None,
+                 key=None, group=None):
+        """ Setup segment
+        :samples: float32 ndarray (nframes, channels)
+                None - silence
+        :nframes: number of frames for silence
+                default: len(samples)
+        :on_done: function called, with this segment, when
+                played or cleared (cancelled) default: no call
+        :key: supersede queued segments with this key default: none
+        :group: don't supersede segments of this key and group
+                default: supersede all with key
+        """
+        self.samples = samples
+        if nframes is None:
+            nframes = len(samples)
+        self.nframes = nframes
+        self.on_done = on_done
+        self.key = key
+        self.group = group
+        self.pos = 0                # Next frame to output
+        self.cancelled = False
+        self.done_event = Event()
+        self.time_queued = time.perf_counter()
+        self.time_started = None    # First block containing segment
+        self.time_done = None
+
+    def is_done(self):
+        return self.done_event.is_set()
+
+    def wait(self, timeout=None):
+        """ Wait till played or cancelled
+        :timeout: maximum wait in seconds default: no limit
+        :returns: True if done
+        """
+        return self.done_event.wait(timeout)
+
+    def __str__(self):
+        st = "AudioSegment:"
+        st += " silence" if self.samples is None else " samples"
+        st += f" frames={self.pos}/{self.nframes}"
+        if self.cancelled:
+            st += " cancelled"
+        return st
+
+
+class AudioOutputStream:
+    DEVICES = ["sounddevice", "null", "file"]
+
+    def __init__(self, sample_rate=44100, channels=2, device=None,
+                 file_name=None, blocksize=256, realtime=True,
+                 latency="low", max_segments=None, max_ahead=None):
+        """ Setup stream, not yet started
+        :sample_rate: frames per second default: 44100
+        :channels: output channels default: 2 (left, right)
+        :device: "sounddevice", "null", "file"
+                default: "sounddevice" if available else "null"
+        :file_name: wav file for "file" device
+        :blocksize: frames per callback default: 256
+        :realtime: "null", "file" devices - False:
+                consume blocks as fast as possible default: True
+        :latency: sounddevice latency default: "low"
+        :max_segments: most queued segments, dropping the oldest
+                default: no limit
+        :max_ahead: most queued seconds, dropping the oldest
+                default: no limit
+        """
+        if device is None:
+            device = "sounddevice" if sd is not None else "null"
+        if device not in self.DEVICES:
+            raise AudioOutputStreamError(f"device {device}"
+                                         f" not one of {self.DEVICES}")
+        if device == "sounddevice" and sd is None:
+            raise AudioOutputStreamError("sounddevice is not available")
+        if device == "file" and file_name is None:
+            raise AudioOutputStreamError("file device requires file_name")
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.device = device
+        self.file_name = file_name
+        self.blocksize = blocksize
+        self.realtime = realtime
+        self.latency = latency
+        self.max_segments = max_segments
+        self.max_ahead_frames = (None if max_ahead is None
+                                 else int(max_ahead*sample_rate))
+        self.segments = deque()     # Queued AudioSegment
+        self.seg_lock = Lock()      # segments, queued_frames
+        self.queued_frames = 0      # Frames in segments
+        self.cur_seg = None         # Segment being output, callback only
+        self.done_segs = deque()    # Finished, for completion thread
+        self.done_wake = Event()
+        self.segment_wake = Event() # null device: segments queued
+        self.count_cond = Condition()   # n_queued, n_done, idle waits
+        self.n_queued = 0
+        self.n_done = 0
+        self.n_cancelled = 0
+        self.n_superseded = 0       # Cancelled by keyed segment
+        self.n_dropped = 0          # Cancelled by look ahead bound
+        self.frames_out = 0         # Frames output, including silence
+        self.n_underflows = 0       # sounddevice status output_underflow
+        self.latency_sum = 0.       # queued to started
+        self.latency_max = 0.
+        self.n_started = 0
+        self.stream = None          # sounddevice stream
+        self.null_thread = None
+        self.wav_writer = None
+        self.running = False
+        self.completion_thread = None
+
+    def start(self):
+        """ Start output and completion thread
+        """
+        if self.running:
+            return
+
+        self.running = True
+        self.completion_thread = Thread(target=self.completion_proc,
+                                        name="AudioOutputCompletion",
+                                        daemon=True)
+        self.completion_thread.start()
+        if self.device == "sounddevice":
+            self.stream = sd.OutputStream(samplerate=self.sample_rate,
+                                          channels=self.channels,
+                                          dtype="float32",
+                                          blocksize=self.blocksize,
+                                          latency=self.latency,
+                                          callback=self.sd_callback)
+            self.stream.start()
+        else:
+            if self.device == "file":
+                self.wav_writer = wave.open(self.file_name, "wb")
+                self.wav_writer.setnchannels(self.channels)
+                self.wav_writer.setsampwidth(2)
+                self.wav_writer.setframerate(self.sample_rate)
+            self.null_thread = Thread(target=self.null_proc,
+                                      name="AudioOutputNull", daemon=True)
+            self.null_thread.start()
+        SlTrace.lg(f"AudioOutputStream started device:{self.device}"
+                   f" sample_rate:{self.sample_rate}"
+                   f" blocksize:{self.blocksize}", "sound")
+
+    def close(self):
+        """ Stop output, cancelling anything queued
+        """
+        if not self.running:
+            return
+
+        self.clear()
+        self.running = False
+        self.segment_wake.set()
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+        if self.null_thread is not None:
+            self.null_thread.join(1.)
+            self.null_thread = None
+        if self.wav_writer is not None:
+            self.wav_writer.close()
+            self.wav_writer = None
+        self.done_wake.set()
+        self.completion_thread.join(1.)
+
+    def play(self, samples, delay=None, on_done=None, key=None,
+             group=None):
+        """ Queue samples to play after those already queued
+        :samples: ndarray (nframes, channels) or (nframes,) mono
+        :delay: silence (seconds) before samples default: none
+        :on_done: function(segment) called after played or cancelled
+                default: no call
+        :key, group: supersede key, group (see AudioSegment)
+                default: none
+        :returns: AudioSegment of samples
+        """
+        samples = np.asarray(samples, dtype=np.float32)
+        if samples.ndim == 1:
+            samples = np.repeat(samples[:, np.newaxis], self.channels,
+                                axis=1)
+        if delay is not None and delay > 0:
+            self.silence(delay, key=key, group=group)
+        return self.add_segment(AudioSegment(samples=samples,
+                                             on_done=on_done,
+                                             key=key, group=group))
+
+    def silence(self, dur, on_done=None, key=None, group=None):
+        """ Queue silence
+        :dur: seconds
+        :on_done: function(segment) called after
+        :key, group: supersede key, group (see AudioSegment)
+        :returns: AudioSegment
+        """
+        nframes = int(round(dur*self.sample_rate))
+        return self.add_segment(AudioSegment(nframes=nframes,
+                                             on_done=on_done,
+                                             key=key, group=group))
+
+    def add_segment(self, seg):
+        """ Queue segment, starting stream if needed
+        Supersedes queued segments with seg's key, then drops
+        the oldest queued segments beyond the look ahead bounds
+        """
+        if not self.running:
+            self.start()
+        with self.count_cond:
+            self.n_queued += 1
+        superseded = []
+        dropped = []
+        with self.seg_lock:
+            if seg.key is not None:
+                superseded = self.remove_key(seg.key, seg.group)
+            self.segments.append(seg)
+            self.queued_frames += seg.nframes
+            while (len(self.segments) > 1
+                   and ((self.max_segments is not None
+                         and len(self.segments) > self.max_segments)
+                        or (self.max_ahead_frames is not None
+                            and self.queued_frames > self.max_ahead_frames))):
+                old_seg = self.segments.popleft()
+                self.queued_frames -= old_seg.nframes
+                dropped.append(old_seg)
+        self.segment_wake.set()
+        if superseded or dropped:
+            self.n_superseded += len(superseded)
+            self.n_dropped += len(dropped)
+            SlTrace.lg(f"AudioOutputStream: superseded:{len(superseded)}"
+                       f" dropped:{len(dropped)}", "sound_queue")
+            self.cancel_segments(superseded + dropped)
+        return seg
+
+    def remove_key(self, key, group=None):
+        """ Remove queued segments with key, not in group
+        Caller holds seg_lock
+        :returns: list of removed segments
+        """
+        removed = []
+        keep = deque()
+        for seg in self.segments:
+            if seg.key == key and (group is None or seg.group != group):
+                removed.append(seg)
+                self.queued_frames -= seg.nframes
+            else:
+                keep.append(seg)
+        if removed:
+            self.segments = keep
+        return removed
+
+    def cancel_segments(self, segs):
+        """ Cancel segments removed from queue, completing them
+        :segs: list of AudioSegment
+        """
+        for seg in segs:
+            seg.cancelled = True
+            self.done_segs.append(seg)
+        self.done_wake.set()
+
+    def clear(self):
+        """ Cancel current and queued segments
+        """
+        cur_seg = self.cur_seg
+        if cur_seg is not None:
+            cur_seg.cancelled = True    # Finished by callback
+        with self.seg_lock:
+            cleared = self.segments
+            self.segments = deque()
+            self.queued_frames = 0
+        self.cancel_segments(cleared)
+        if not self.running and cur_seg is not None:
+            self.cur_seg = None
+            self.done_segs.append(cur_seg)
+
+    def is_busy(self):
+        """ Check if anything is playing or queued
+        """
+        return self.n_queued > self.n_done
+
+    def wait_idle(self, timeout=None):
+        """ Wait till all queued segments are done
+        :timeout: maximum wait in seconds default: no limit
+        :returns: True if idle
+        """
+        with self.count_cond:
+            return self.count_cond.wait_for(
+                lambda: self.n_done >= self.n_queued, timeout=timeout)
+
+    def get_ahead(self):
+        """ Get seconds queued and not yet output, including
+        the rest of the current segment
+        """
+        frames = self.queued_frames
+        cur_seg = self.cur_seg
+        if cur_seg is not None and not cur_seg.cancelled:
+            frames += cur_seg.nframes - cur_seg.pos
+        return frames/self.sample_rate
+
+    def wait_ahead(self, max_ahead, timeout=None):
+        """ Wait till no more than max_ahead seconds are queued,
+        so a feeder can keep its backlog, e.g. by priority, and
+        only a short look ahead in the stream
+        Woken on segment completion, else when, at the output
+        rate, max_ahead should be reached
+        :max_ahead: most seconds ahead
+        :timeout: maximum wait in seconds default: no limit
+        :returns: True if within max_ahead
+        """
+        block_dur = self.blocksize/self.sample_rate
+        t_end = None if timeout is None else time.perf_counter() + timeout
+        with self.count_cond:
+            while self.running:
+                excess = self.get_ahead() - max_ahead
+                if excess <= 0:
+                    break
+
+                wait = max(excess, block_dur)
+                if t_end is not None:
+                    wait = min(wait, t_end - time.perf_counter())
+                    if wait <= 0:
+                        return False
+                self.count_cond.wait(wait)
+        return True
+
+    def fill(self, outdata, frames):
+        """ Fill output block from queued segments
+        Called in audio (or null device) thread - copies only
+        :outdata: float32 ndarray (frames, channels)
+        :frames: number of frames
+        """
+        nfilled = 0
+        while nfilled < frames:
+            seg = self.cur_seg
+            if seg is None:
+                with self.seg_lock:
+                    if len(self.segments) == 0:
+                        break
+
+                    seg = self.segments.popleft()
+                    self.queued_frames -= seg.nframes
+                self.cur_seg = seg
+            if seg.cancelled:
+                self.cur_seg = None
+                self.done_segs.append(seg)
+                self.done_wake.set()
+                continue
+
+            if seg.time_started is None:
+                seg.time_started = time.perf_counter()
+            nout = min(frames-nfilled, seg.nframes-seg.pos)
+            if seg.samples is None:
+                outdata[nfilled:nfilled+nout] = 0
+            else:
+                outdata[nfilled:nfilled+nout] = seg.samples[seg.pos:seg.pos+nout]
+            seg.pos += nout
+            nfilled += nout
+            if seg.pos >= seg.nframes:
+                self.cur_seg = None
+                self.done_segs.append(seg)
+                self.done_wake.set()
+        if nfilled < frames:
+            outdata[nfilled:] = 0
+        self.frames_out += frames
+        return nfilled
+
+    def sd_callback(self, outdata, frames, time_info, status):
+        """ sounddevice.OutputStream callback
+        """
+        if status.output_underflow:
+            self.n_underflows += 1
+        self.fill(outdata, frames)
+
+    def null_proc(self):
+        """ null / file device: consume blocks
+        """
+        outdata = np.zeros((self.blocksize, self.channels), dtype=np.float32)
+        block_dur = self.blocksize/self.sample_rate
+        t_next = time.perf_counter()
+        while self.running:
+            if not self.realtime:
+                if self.cur_seg is None and len(self.segments) == 0:
+                    self.segment_wake.wait()
+                    self.segment_wake.clear()
+                    continue
+            nfilled = self.fill(outdata, self.blocksize)
+            if self.wav_writer is not None and (nfilled > 0 or self.realtime):
+                pcm = (np.clip(outdata, -1., 1.)*32767).astype("<i2")
+                self.wav_writer.writeframes(pcm.tobytes())
+            if self.realtime:
+                t_next += block_dur
+                t_sleep = t_next - time.perf_counter()
+                if t_sleep > 0:
+                    time.sleep(t_sleep)
+                else:
+                    t_next = time.perf_counter()    # Behind, don't catch up
+
+    def completion_proc(self):
+        """ Completion thread: set done events, call on_done
+        """
+        while self.running or len(self.done_segs) > 0:
+            self.done_wake.wait()
+            self.done_wake.clear()
+            while True:
+                try:
+                    seg = self.done_segs.popleft()
+                except IndexError:
+                    break
+
+                seg.time_done = time.perf_counter()
+                if seg.time_started is not None:
+                    seg_latency = seg.time_started - seg.time_queued
+                    self.latency_sum += seg_latency
+                    self.latency_max = max(self.latency_max, seg_latency)
+                    self.n_started += 1
+                with self.count_cond:
+                    self.n_done += 1
+                    if seg.cancelled:
+                        self.n_cancelled += 1
+                    self.count_cond.notify_all()
+                seg.done_event.set()
+                if seg.on_done is not None:
+                    try:
+                        seg.on_done(seg)
+                    except Exception as e:
+                        SlTrace.lg(f"AudioOutputStream on_done error: {e}")
+
+    def get_stats(self):
+        """ Get output statistics
+        :returns: dictionary
+        """
+        latency_avg = (self.latency_sum/self.n_started
+                       if self.n_started > 0 else 0.)
+        return dict(device=self.device, queued=self.n_queued,
+                    done=self.n_done, cancelled=self.n_cancelled,
+                    superseded=self.n_superseded, dropped=self.n_dropped,
+                    frames_out=self.frames_out,
+                    underflows=self.n_underflows,
+                    latency_avg=latency_avg, latency_max=self.latency_max)
+
+
+if __name__ == "__main__":
+    """ Headless check: tones via the null device, gaps and latency
+    """
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--device', dest='device', default="null")
+    parser.add_argument('--file_name', dest='file_name',
+                        default="audio_output_stream_test.wav")
+    parser.add_argument('--ntone', type=int, dest='ntone', default=50)
+    parser.add_argument('--dur', type=float, dest='dur', default=.05)
+    args = parser.parse_args()
+    sample_rate = 44100
+    aos = AudioOutputStream(sample_rate=sample_rate, device=args.device,
+                            file_name=args.file_name)
+    t_beg = time.perf_counter()
+    for i in range(args.ntone):
+        freq_hz = 440 + 20*(i%10)
+        each_sample_number = np.arange(args.dur*sample_rate)
+        aos.play(np.sin(2*np.pi*each_sample_number*freq_hz/sample_rate)*.3)
+    aos.wait_idle()
+    t_dur = time.perf_counter() - t_beg
+    SlTrace.lg(f"{args.ntone} tones of {args.dur} sec"
+               f" played in {t_dur:.3f} sec"
+               f" (expected {args.ntone*args.dur:.3f})")
+    SlTrace.lg(f"stats: {aos.get_stats()}")
+    aos.close()
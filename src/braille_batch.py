@@ -0,0 +1,385 @@
+#braille_batch.py  18Oct2026  crs, Author
+"""
+Batch braille rendering of turtle programs
+
+Each program is run headless (turtle_capture.run_program), across
+worker processes, and its braille text written as AudioDrawWindow
+print_braille output: id title, title (program's title(), else
+id title, as setup_main), braille picture.
+A program drawing no cells, or exiting with non-zero code, fails.
+A program exceeding --timeout has its worker killed, by the
+parent, and replaced; its status is "timeout".
+    out_dir/<program>_braille.txt - braille output
+            programs of the same name, in different directories:
+            <dir>_<program>_braille.txt, dir relative to theirs
+            in common
+    out_dir/manifest.json - per program: output file, status,
+            cells, time, error
+--deterministic omits date, user and times so output and
+manifest can be diffed between runs.
+Usage: python braille_batch.py [program.py|directory ...] [--list FILE]
+            [--out_dir DIR] [--jobs N] [--timeout SEC]
+            [--grid_width N] [--grid_height N] [--deterministic]
+Library:
+    results = render_programs(pgm_files, out_dir=...)
+"""
+from collections import deque
+import contextlib
+import datetime
+import getpass
+import io
+import json
+import multiprocessing as mp
+from multiprocessing.connection import wait as wait_conns
+import os
+import time
+import traceback
+
+from select_trace import SlTrace
+from braille_error import BrailleError
+
+
+def get_id_title(pgm_file, deterministic=False):
+    """ Get identification title, as wx_turtle_braille.setup_main
+    :pgm_file: program file
+    :deterministic: True - file name only default: add date, user
+    """
+    id_title = f"File:{os.path.basename(pgm_file)}"
+    if not deterministic:
+        current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
+        id_title += f"  Date:{current_time}"
+        try:
+            username = getpass.getuser()
+        except Exception:
+            username = None
+        if username:
+            id_title += f"  User:{username}"
+    return id_title.replace(" ", "_")
+
+def get_out_file(pgm_file, out_dir, name=None):
+    """ Get braille output file
+    :pgm_file: program file
+    :out_dir: output directory
+    :name: program name default: pgm_file's base name
+    """
+    if name is None:
+        name = os.path.basename(pgm_file)
+    base_name = os.path.splitext(name)[0]
+    return os.path.join(out_dir, f"{base_name}_braille.txt")
+
+def get_out_files(pgm_files, out_dir):
+    """ Get output files, distinct for programs of the same
+    base name in different directories
+    :pgm_files: list of program files
+    :out_dir: output directory
+    :returns: list of output files, in pgm_files order
+    """
+    by_base = {}
+    for pgm_file in pgm_files:
+        base = os.path.basename(pgm_file)
+        by_base.setdefault(base, set()).add(os.path.abspath(pgm_file))
+    out_files = []
+    for pgm_file in pgm_files:
+        same_name = by_base[os.path.basename(pgm_file)]
+        if len(same_name) == 1:
+            out_files.append(get_out_file(pgm_file, out_dir))
+            continue
+
+        common_dir = os.path.commonpath([os.path.dirname(path)
+                                         for path in same_name])
+        rel_file = os.path.relpath(os.path.abspath(pgm_file), common_dir)
+        name = rel_file.replace(os.sep, "_")
+        if os.altsep is not None:
+            name = name.replace(os.altsep, "_")
+        out_files.append(get_out_file(pgm_file, out_dir, name=name))
+    return out_files
+
+def render_program(pgm_file, out_dir, grid_width=40, grid_height=25,
+                   deterministic=False, out_file=None):
+    """ Render one program's braille text to file
+    No time limit - render_programs kills a worker over its timeout
+    :pgm_file: turtle program
+    :out_dir: output directory
+    :grid_width: braille cells horizontally default: 40
+    :grid_height: braille cells vertically default: 25
+    :deterministic: omit date, user from output default: False
+    :out_file: output file default: get_out_file(pgm_file, out_dir)
+    :returns: result dictionary
+    """
+    from turtle_capture import run_program     # Only in workers
+
+    result = dict(program=pgm_file, out_file=None, status=None,
+                  n_cells=None, time=None, error=None)
+    time_start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):    # Program prints
+            capture = run_program(pgm_file, grid_width=grid_width,
+                                  grid_height=grid_height)
+            cells = capture.get_cells()
+            braille_text = capture.get_braille_text()
+        result["n_cells"] = len(cells)
+        if len(cells) == 0:
+            raise BrailleError("no cells drawn")
+
+        id_title = get_id_title(pgm_file, deterministic=deterministic)
+        title = capture.get_title()
+        if title is None:
+            title = id_title        # As setup_main
+        data = f"\n{id_title}"          # As print_braille
+        data += f"\n{title}\n"
+        data += braille_text
+        if out_file is None:
+            out_file = get_out_file(pgm_file, out_dir)
+        with open(out_file, "w") as fout:
+            fout.write(data)
+        result.update(out_file=out_file, status="success")
+    except BaseException as e:
+        result.update(status="fail",
+                      error=traceback.format_exception_only(type(e), e)[-1]
+                            .strip())
+    result["time"] = time.perf_counter() - time_start
+    return result
+
+def render_worker(conn, out_dir, render_args):
+    """ Worker process: render programs, one at a time, till None
+    :conn: Connection receiving (pgm_file, out_file), sending result
+    :out_dir: output directory
+    :render_args: render_program keyword arguments
+    """
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break           # Parent gone
+
+        if job is None:
+            break
+
+        pgm_file, out_file = job
+        conn.send(render_program(pgm_file, out_dir, out_file=out_file,
+                                 **render_args))
+
+
+class RenderWorker:
+    """ Render worker process, with the program it is rendering
+    """
+
+    def __init__(self, out_dir, render_args):
+        """ Start worker process
+        :out_dir: output directory
+        :render_args: render_program keyword arguments
+        """
+        self.conn, child_conn = mp.Pipe()
+        self.proc = mp.Process(target=render_worker,
+                               args=(child_conn, out_dir, render_args),
+                               daemon=True)
+        self.proc.start()
+        child_conn.close()      # Only worker's end, so its exit is EOF
+        self.index = None       # pgm_files index being rendered
+        self.pgm_file = None
+        self.time_start = None
+        self.deadline = None    # perf_counter time, None - no limit
+
+    def start(self, index, pgm_file, out_file, timeout=None):
+        """ Start rendering program
+        :index: pgm_files index
+        :pgm_file: program
+        :out_file: output file
+        :timeout: maximum seconds default: no limit
+        """
+        self.index = index
+        self.pgm_file = pgm_file
+        self.time_start = time.perf_counter()
+        self.deadline = (None if timeout is None
+                         else self.time_start + timeout)
+        self.conn.send((pgm_file, out_file))
+
+    def get_result(self):
+        """ Get finished program's result
+        :returns: result dictionary, None if worker died
+        """
+        try:
+            return self.conn.recv()
+        except (EOFError, OSError):
+            return None
+
+    def stop(self):
+        """ Stop idle worker
+        """
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass            # Already gone
+        self.proc.join(1.)
+        if self.proc.is_alive():
+            self.kill()
+        self.conn.close()
+
+    def kill(self):
+        """ Kill worker, e.g. over its time
+        """
+        self.proc.kill()
+        self.proc.join()
+        self.conn.close()
+
+
+def find_programs(names):
+    """ Get program files, directories giving their .py files
+    :names: list of files / directories
+    :returns: list of program files
+    """
+    pgm_files = []
+    for name in names:
+        if os.path.isdir(name):
+            pgm_files += [os.path.join(name, file_name)
+                          for file_name in sorted(os.listdir(name))
+                          if file_name.endswith(".py")]
+        else:
+            pgm_files.append(name)
+    return pgm_files
+
+def read_program_list(list_file):
+    """ Read program list file: one program per line, # comments
+    """
+    pgm_files = []
+    with open(list_file) as flist:
+        for line in flist:
+            line = line.split("#")[0].strip()
+            if line:
+                pgm_files.append(line)
+    return pgm_files
+
+def render_programs(pgm_files, out_dir="braille_out", jobs=None,
+                    grid_width=40, grid_height=25, timeout=60,
+                    deterministic=False, manifest_file=None):
+    """ Render programs across worker processes, writing manifest
+    :pgm_files: list of turtle programs
+    :out_dir: output directory default: braille_out
+    :jobs: number of processes default: cpu count
+    :grid_width, grid_height: braille cells default: 40, 25
+    :timeout: maximum seconds per program, its worker is then
+            killed and replaced default: 60 None - no limit
+    :deterministic: omit date, user, times default: False
+    :manifest_file: manifest default: out_dir/manifest.json
+    :returns: list of result dictionaries, in pgm_files order
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    if manifest_file is None:
+        manifest_file = os.path.join(out_dir, "manifest.json")
+    time_start = time.perf_counter()
+    out_files = get_out_files(pgm_files, out_dir)
+    render_args = dict(grid_width=grid_width, grid_height=grid_height,
+                       deterministic=deterministic)
+    n_workers = min(jobs if jobs is not None else os.cpu_count(),
+                    len(pgm_files))
+    pending = deque(enumerate(zip(pgm_files, out_files)))
+    results = [None]*len(pgm_files)
+    idle = [RenderWorker(out_dir, render_args) for _ in range(n_workers)]
+    busy = {}                   # by conn
+    try:
+        while pending or busy:
+            while pending and idle:
+                worker = idle.pop()
+                index, (pgm_file, out_file) = pending.popleft()
+                worker.start(index, pgm_file, out_file, timeout=timeout)
+                busy[worker.conn] = worker
+            deadlines = [worker.deadline for worker in busy.values()
+                         if worker.deadline is not None]
+            wait_time = None
+            if deadlines:
+                wait_time = max(min(deadlines) - time.perf_counter(), 0)
+            for conn in wait_conns(list(busy), timeout=wait_time):
+                worker = busy.pop(conn)
+                result = worker.get_result()
+                if result is None:          # Worker died
+                    worker.kill()
+                    result = dict(program=worker.pgm_file, out_file=None,
+                                  status="fail", n_cells=None,
+                                  time=time.perf_counter()-worker.time_start,
+                                  error="worker exited, code"
+                                        f" {worker.proc.exitcode}")
+                    results[worker.index] = result
+                    worker = RenderWorker(out_dir, render_args)
+                else:
+                    results[worker.index] = result
+                idle.append(worker)
+            time_now = time.perf_counter()
+            for conn, worker in list(busy.items()):
+                if worker.deadline is not None and time_now >= worker.deadline:
+                    del busy[conn]
+                    worker.kill()
+                    results[worker.index] = dict(program=worker.pgm_file,
+                                    out_file=None, status="timeout",
+                                    n_cells=None,
+                                    time=time_now-worker.time_start,
+                                    error=f"exceeded {timeout} sec")
+                    idle.append(RenderWorker(out_dir, render_args))
+    finally:
+        for worker in idle:
+            worker.stop()
+        for worker in busy.values():
+            worker.kill()
+    total_time = time.perf_counter() - time_start
+    manifest_results = results
+    if deterministic:
+        manifest_results = sorted(
+            ({key : value for key, value in result.items() if key != "time"}
+             for result in results), key=lambda result: result["program"])
+    manifest = dict(grid_width=grid_width, grid_height=grid_height,
+                    n_programs=len(results),
+                    n_success=sum(1 for result in results
+                                  if result["status"] == "success"),
+                    results=manifest_results)
+    if not deterministic:
+        manifest["date"] = datetime.datetime.now().isoformat(timespec="seconds")
+        manifest["total_time"] = total_time
+        manifest["jobs"] = jobs if jobs is not None else os.cpu_count()
+    with open(manifest_file, "w") as fman:
+        json.dump(manifest, fman, indent=2, sort_keys=deterministic)
+        fman.write("\n")
+    SlTrace.lg(f"render_programs: {manifest['n_success']} of"
+               f" {len(results)} in {total_time:.2f} sec", "batch")
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('programs', nargs='*',
+                        help="turtle program files or directories")
+    parser.add_argument('--list', dest='list_file', default=None,
+                        help="file listing programs")
+    parser.add_argument('--out_dir', dest='out_dir', default="braille_out")
+    parser.add_argument('--jobs', type=int, dest='jobs', default=None)
+    parser.add_argument('--timeout', type=float, dest='timeout', default=60)
+    parser.add_argument('--grid_width', type=int, dest='grid_width', default=40)
+    parser.add_argument('--grid_height', type=int, dest='grid_height', default=25)
+    parser.add_argument('--deterministic', action='store_true',
+                        dest='deterministic')
+    args = parser.parse_args()
+
+    pgm_files = find_programs(args.programs)
+    if args.list_file is not None:
+        pgm_files += read_program_list(args.list_file)
+    if len(pgm_files) == 0:
+        parser.error("no programs given")
+    time_start = time.perf_counter()
+    results = render_programs(pgm_files, out_dir=args.out_dir,
+                              jobs=args.jobs, grid_width=args.grid_width,
+                              grid_height=args.grid_height,
+                              timeout=args.timeout,
+                              deterministic=args.deterministic)
+    total_time = time.perf_counter() - time_start
+    for result in results:
+        time_str = "" if result["time"] is None else f" {result['time']:.2f} sec"
+        error_str = "" if result["error"] is None else f"  {result['error']}"
+        SlTrace.lg(f"{result['status']:8} {result['program']}{time_str}"
+                   f"{error_str}", to_stdout=True)
+    n_success = sum(1 for result in results if result["status"] == "success")
+    SlTrace.lg(f"{n_success} of {len(results)} rendered"
+               f" in {total_time:.1f} sec"
+               f" ({len(results)/total_time*60:.0f} per minute)"
+               f"  output: {args.out_dir}", to_stdout=True)
+    sys.exit(0 if n_success == len(results) else 1)
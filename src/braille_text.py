@@ -0,0 +1,70 @@
+#braille_text.py  18Oct2026  crs, Author
+"""
+Braille "picture" text of a cell figure, as printed for embossing
+by AudioDrawWindow.print_braille: one line per cell row, top first,
+each cell shown by the first letter of its color.
+No wx - usable by headless (batch) rendering.
+"""
+
+
+def get_print_edges(cells, grid_width, grid_height):
+    """ Get edges of printed region, shifted towards figure,
+    as AudioDrawWindow.find_edges
+    :cells: dictionary by (ix,iy) (iy==0 top row) of color string
+    :grid_width: number of cells horizontally
+    :grid_height: number of cells vertically
+    :returns: left_edge, top_edge, right_edge, bottom_edge
+    """
+    if len(cells) == 0:
+        left_edge, top_edge = 0, 0
+        right_edge, bottom_edge = grid_width-1, grid_height-1
+    else:
+        left_edge = min(ix for ix,_ in cells)
+        right_edge = max(ix for ix,_ in cells)
+        top_edge = min(iy for _,iy in cells)
+        bottom_edge = max(iy for _,iy in cells)
+    if left_edge > 0:           # Give some space
+        left_edge -= 1
+    if left_edge > 0:
+        left_edge -= 1
+    if top_edge > 0:
+        top_edge -= 1
+    if bottom_edge < grid_height-1:
+        bottom_edge += 1
+    return left_edge, top_edge, right_edge, bottom_edge
+
+
+def get_braille_text(cells, grid_width, grid_height,
+                     shift_to_edge=True, edges=None, blank_char=","):
+    """ Get braille text lines
+    :cells: dictionary by (ix,iy) (iy==0 top row) of color string
+    :grid_width: number of cells horizontally
+    :grid_height: number of cells vertically
+    :shift_to_edge: shift figure towards edge to ease finding figure
+                default: True
+    :edges: (left_edge, top_edge, right_edge, bottom_edge) printed
+                default: from get_print_edges if shift_to_edge
+                    else whole grid
+    :blank_char: replacement for non-trailing blanks default: ","
+    :returns: text, each line ending with newline
+    """
+    if edges is None:
+        if shift_to_edge:
+            edges = get_print_edges(cells, grid_width, grid_height)
+        else:
+            edges = (0, 0, grid_width-1, grid_height-1)
+    left_edge, top_edge, right_edge, bottom_edge = edges
+    braille_text = ""
+    for iy in range(top_edge, bottom_edge):
+        line = ""
+        for ix in range(left_edge, right_edge+1):
+            color = cells.get((ix,iy))
+            if color is not None:
+                line += color[0]
+            else:
+                line += " "
+        line = line.rstrip()
+        if blank_char != " ":
+            line = line.replace(" ", blank_char)
+        braille_text += line + "\n"
+    return braille_text
@@ -0,0 +1,732 @@
+# canvas_item_index.py  18Oct2026  crs, Author
+"""
+Python side spatial index of tkinter Canvas items
+
+CanvasGrid.get_canvas_items originally asked tk, via find_overlapping,
+once for each grid cell, then asked again, via itemconfigure, for each
+hit's color.  Here we read the canvas display list once
+(type, coords, fill, outline, width,...), keep it in a uniform grid
+of buckets and answer the overlap questions in Python.
+
+The overlap tests follow tk's item area procedures closely enough
+to reproduce find_overlapping for the items turtle creates:
+    line, oval, polygon, rectangle
+Other item types (text, image, arc, ...) are approximated by their bbox.
+"""
+import math
+import tkinter as tk
+
+from select_trace import SlTrace
+
+
+class CanvasItemSpec:
+    """ Snapshot of one canvas item's drawing information """
+    __slots__ = ("item_id", "type", "coords", "fill", "outline",
+                 "width", "capstyle", "tags", "bbox")
+
+    def __init__(self, item_id, type, coords, fill="", outline="",
+                 width=1., capstyle="butt", tags=(), bbox=None):
+        """ Setup item information
+        :item_id: canvas item id
+        :type: canvas item type e.g. "line"
+        :coords: tuple of coordinates x1,y1,x2,y2,...
+        :fill: fill color '' - none
+        :outline: outline color '' - none
+        :width: line / outline width
+        :capstyle: line cap style "butt", "projecting", "round"
+        :tags: tuple of item tags
+        :bbox: (x1,y1,x2,y2) used for types without
+                specific geometry default: from coords
+        """
+        self.item_id = item_id
+        self.type = type
+        self.coords = tuple(coords)
+        self.fill = fill
+        self.outline = outline
+        self.width = width
+        self.capstyle = capstyle
+        self.tags = tuple(tags)
+        if bbox is None:
+            bbox = coords_bbox(self.coords)
+        self.bbox = bbox
+
+    def get_extent(self):
+        """ Get item extent including line/outline width
+        :returns: (x1,y1,x2,y2)
+        """
+        x1,y1,x2,y2 = self.bbox
+        hw = self.half_width()
+        if self.type == "line":
+            hw = (max(self.width, 1.) + 1.)/2.     # Allow for round caps
+            if self.capstyle == "projecting":
+                hw *= math.sqrt(2.)
+        return (x1-hw, y1-hw, x2+hw, y2+hw)
+
+    def half_width(self):
+        """ Get half the outline width, 0 if no outline drawn
+        """
+        if self.type == "line":
+            return max(self.width, 1.)/2.
+
+        if self.type in ("rectangle", "oval", "polygon"):
+            if self.outline == '':
+                return 0.
+
+            return self.width/2.
+
+        return 0.
+
+    def get_values(self):
+        """ Get drawing values, for comparing specs of an item
+        :returns: tuple of all but item_id
+        """
+        return (self.type, self.coords, self.fill, self.outline,
+                self.width, self.capstyle, self.tags)
+
+    def __str__(self):
+        return (f"{self.item_id}: {self.type} {self.coords}"
+                f" fill:{self.fill} width:{self.width}")
+
+
+def coords_bbox(coords):
+    """ Get bounding box of coordinate list
+    :coords: x1,y1,x2,y2,...
+    :returns: (xmin,ymin,xmax,ymax), (0,0,0,0) if no coordinates
+    """
+    if len(coords) < 2:
+        return (0.,0.,0.,0.)
+
+    xs = coords[0::2]
+    ys = coords[1::2]
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def read_canvas_item(canvas, item_id):
+    """ Read one canvas item's drawing information
+    :canvas: tk.Canvas
+    :item_id: canvas item id
+    :returns: CanvasItemSpec, None if hidden or not showing
+    """
+    if canvas.itemcget(item_id, "state") == "hidden":
+        return None
+
+    item_type = canvas.type(item_id)
+    if item_type is None or item_type == "":
+        return None             # Gone
+    
+    coords = canvas.coords(item_id)
+    tags = canvas.gettags(item_id)
+    fill = outline = ""
+    width = 1.
+    capstyle = "butt"
+    bbox = None
+    if item_type in ("line", "rectangle", "oval", "polygon"):
+        fill = canvas.itemcget(item_id, "fill")
+        width = float(canvas.itemcget(item_id, "width"))
+        if item_type == "line":
+            capstyle = canvas.itemcget(item_id, "capstyle")
+        else:
+            outline = canvas.itemcget(item_id, "outline")
+    else:
+        try:
+            fill = canvas.itemcget(item_id, "fill")
+        except tk.TclError:
+            fill = ""       # e.g. image, window
+        bbox = canvas.bbox(item_id)
+        if bbox is None:
+            return None     # Nothing showing
+
+    return CanvasItemSpec(item_id, item_type, coords,
+                          fill=fill, outline=outline,
+                          width=width, capstyle=capstyle,
+                          tags=tags, bbox=bbox)
+
+
+def read_canvas_items(canvas):
+    """ Read all canvas items' drawing information, in stacking order
+    One pass over the display list, skipping hidden items
+    :canvas: tk.Canvas
+    :returns: list of CanvasItemSpec
+    """
+    item_specs = []
+    for item_id in canvas.find_all():
+        item_spec = read_canvas_item(canvas, item_id)
+        if item_spec is not None:
+            item_specs.append(item_spec)
+    return item_specs
+
+
+class CanvasItemIndex:
+    """ Uniform grid index of canvas item specs
+    Replaces tk.Canvas find_overlapping, itemconfigure(id,"fill")
+    for a static view of the canvas
+    """
+    def __init__(self, item_specs, bucket_size=None, n_buckets=32,
+                 min_bucket_size=4.):
+        """ Setup index
+        :item_specs: list of CanvasItemSpec in stacking order(lowest first)
+        :bucket_size: side of square bucket in canvas coordinates
+                default: extent of all items / n_buckets
+        :n_buckets: number of buckets along larger extent default: 32
+        :min_bucket_size: smallest default bucket size default: 4.
+        """
+        self.spec_by_id = {}
+        self.order_by_id = {}           # Stacking order
+        self.extents = {}               # by item id, extent used for buckets
+        self.buckets = {}               # by (bx,by) set of item ids
+        self.next_order = 0             # Order given to next added item
+        extents = [spec.get_extent() for spec in item_specs]
+        if len(extents) > 0:
+            self.x_min = min(ext[0] for ext in extents)
+            self.y_min = min(ext[1] for ext in extents)
+            x_max = max(ext[2] for ext in extents)
+            y_max = max(ext[3] for ext in extents)
+        else:
+            self.x_min = self.y_min = 0.
+            x_max = y_max = 0.
+        if bucket_size is None:
+            bucket_size = max(x_max-self.x_min, y_max-self.y_min)/n_buckets
+            bucket_size = max(bucket_size, min_bucket_size)
+        self.bucket_size = bucket_size
+        for spec in item_specs:
+            self.add_spec(spec)
+        SlTrace.lg(f"CanvasItemIndex: {len(item_specs)} items"
+                   f" {len(self.buckets)} buckets", "canvas_index")
+
+    def add_spec(self, spec):
+        """ Add/replace item spec, on top if new
+        :spec: CanvasItemSpec
+        """
+        item_id = spec.item_id
+        if item_id in self.spec_by_id:
+            self.remove_spec(item_id, keep_order=True)
+        if item_id not in self.order_by_id:
+            self.order_by_id[item_id] = self.next_order
+            self.next_order += 1
+        self.spec_by_id[item_id] = spec
+        ext = spec.get_extent()
+        self.extents[item_id] = ext
+        for bkey in self.ext_buckets(ext):
+            if bkey not in self.buckets:
+                self.buckets[bkey] = set()
+            self.buckets[bkey].add(item_id)
+
+    def remove_spec(self, item_id, keep_order=False):
+        """ Remove item from index
+        :item_id: canvas item id
+        :keep_order: True - keep stacking order entry default: remove
+        :returns: removed CanvasItemSpec, None if not indexed
+        """
+        spec = self.spec_by_id.pop(item_id, None)
+        if not keep_order:
+            self.order_by_id.pop(item_id, None)
+        if spec is None:
+            return None
+
+        ext = self.extents.pop(item_id)
+        for bkey in self.ext_buckets(ext):
+            bucket = self.buckets.get(bkey)
+            if bucket is not None:
+                bucket.discard(item_id)
+                if len(bucket) == 0:
+                    del self.buckets[bkey]
+        return spec
+
+    def set_order(self, item_ids):
+        """ Set stacking order e.g. after raise/lower
+        :item_ids: all item ids, lowest first, e.g. canvas.find_all()
+        """
+        self.order_by_id = {item_id : order
+                            for order, item_id in enumerate(item_ids)}
+        self.next_order = len(item_ids)
+
+    def ext_buckets(self, ext):
+        """ Generate bucket keys covered by extent
+        :ext: (x1,y1,x2,y2)
+        """
+        bx1,by1 = self.bucket_ixy(ext[0], ext[1])
+        bx2,by2 = self.bucket_ixy(ext[2], ext[3])
+        for bx in range(bx1, bx2+1):
+            for by in range(by1, by2+1):
+                yield (bx,by)
+
+    @classmethod
+    def from_canvas(cls, canvas, **kwargs):
+        """ Create index from current canvas contents
+        :canvas: tk.Canvas
+        :kwargs: CanvasItemIndex args
+        """
+        return cls(read_canvas_items(canvas), **kwargs)
+
+    def bucket_ixy(self, x, y):
+        """ Get bucket index pair for point
+        """
+        return (int((x-self.x_min)//self.bucket_size),
+                int((y-self.y_min)//self.bucket_size))
+
+    def get_spec(self, item_id):
+        """ Get item spec, None if not indexed
+        """
+        return self.spec_by_id.get(item_id)
+
+    def find_overlapping(self, x1, y1, x2, y2):
+        """ Python version of tk.Canvas.find_overlapping
+        :x1,y1,x2,y2: rectangle (canvas coordinates)
+        :returns: tuple of item ids, in stacking order
+        """
+        if x1 > x2:
+            x1,x2 = x2,x1
+        if y1 > y2:
+            y1,y2 = y2,y1
+        rect = (x1,y1,x2,y2)
+        bx1,by1 = self.bucket_ixy(x1, y1)
+        bx2,by2 = self.bucket_ixy(x2, y2)
+        candidates = set()
+        for bx in range(bx1, bx2+1):
+            for by in range(by1, by2+1):
+                bucket = self.buckets.get((bx,by))
+                if bucket is not None:
+                    candidates.update(bucket)
+        found = []
+        for item_id in candidates:
+            ext = self.extents[item_id]
+            if ext[0] > x2 or ext[2] < x1 or ext[1] > y2 or ext[3] < y1:
+                continue
+
+            if item_overlaps_rect(self.spec_by_id[item_id], rect):
+                found.append(item_id)
+        found.sort(key=self.order_by_id.__getitem__)
+        return tuple(found)
+
+    def item_to_color(self, item_ids):
+        """ Get color string given item ids - see CanvasGrid.item_to_color
+            Ignore items with fill ''
+        :item_ids: list of canvas ids, in stacking order
+        :returns: color str or None if no item with valid color
+        """
+        for top_id in reversed(item_ids):
+            color = self.spec_by_id[top_id].fill
+            if color != '':
+                return color
+        return None
+
+
+class CanvasChangeTracker:
+    """ Keep a CanvasItemIndex current by hooking the canvas calls
+    which create, change and delete items.
+    Changed areas are kept in a change log so each
+    cell spec view can catch up with only the cells touched.
+    """
+    CREATE_METHODS = ["create_arc", "create_bitmap", "create_image",
+                      "create_line", "create_oval", "create_polygon",
+                      "create_rectangle", "create_text", "create_window"]
+    CHANGE_METHODS = ["coords", "itemconfigure", "itemconfig",
+                      "move", "moveto", "scale", "dchars", "insert"]
+    ORDER_METHODS = ["tag_raise", "tag_lower", "lift", "lower"]
+    
+    def __init__(self, canvas, max_changes=1000):
+        """ Read canvas and hook its item calls
+        :canvas: tk.Canvas (or turtle's ScrolledCanvas)
+        :max_changes: maximum change log length, after which
+                    views must be rebuilt default: 1000
+        """
+        self.canvas = canvas
+        self.max_changes = max_changes
+        self.item_index = CanvasItemIndex.from_canvas(canvas)
+        self.dirty_ids = set()          # Changed, not yet reread
+        self.order_changed = False      # Set on raise/lower
+        self.change_serial = 0          # Serial number of latest change
+        self.changes = []               # (serial, extent) areas changed
+        self.base_serial = 0            # Oldest serial still in changes
+        self.orig_methods = {}          # Hooked methods, by name
+        self.hook_canvas()
+
+    def hook_canvas(self):
+        """ Wrap canvas item methods, on the instance
+        """
+        for name in self.CREATE_METHODS:
+            self.hook_method(name, self.wrap_create)
+        for name in self.CHANGE_METHODS:
+            self.hook_method(name, self.wrap_change)
+        for name in self.ORDER_METHODS:
+            self.hook_method(name, self.wrap_order)
+        self.hook_method("delete", self.wrap_delete)
+
+    def hook_method(self, name, wrapper):
+        orig = getattr(self.canvas, name, None)
+        if orig is None:
+            return
+
+        self.orig_methods[name] = orig
+        setattr(self.canvas, name, wrapper(orig))
+
+    def unhook_canvas(self):
+        """ Restore canvas's methods
+        """
+        for name in self.orig_methods:
+            try:
+                delattr(self.canvas, name)
+            except AttributeError:
+                pass
+        self.orig_methods = {}
+
+    def wrap_create(self, orig):
+        def create(*args, **kwargs):
+            item_id = orig(*args, **kwargs)
+            self.dirty_ids.add(item_id)
+            return item_id
+        return create
+
+    def wrap_change(self, orig):
+        def change(tag_or_id, *args, **kwargs):
+            if len(args) > 0 or len(kwargs) > 0:
+                if not (len(args) == 1 and isinstance(args[0], str)
+                        and orig.__name__ in ("itemconfigure", "itemconfig")):
+                    self.mark_dirty(tag_or_id)  # Not just a query
+            return orig(tag_or_id, *args, **kwargs)
+        return change
+
+    def wrap_order(self, orig):
+        def order(*args, **kwargs):
+            self.order_changed = True
+            if len(args) > 0:
+                self.mark_dirty(args[0])
+            return orig(*args, **kwargs)
+        return order
+
+    def wrap_delete(self, orig):
+        def delete(*tag_or_ids):
+            for tag_or_id in tag_or_ids:
+                for item_id in self.find_ids(tag_or_id):
+                    self.dirty_ids.discard(item_id)
+                    spec = self.item_index.remove_spec(item_id)
+                    if spec is not None:
+                        self.add_change(spec.get_extent())
+            return orig(*tag_or_ids)
+        return delete
+
+    def find_ids(self, tag_or_id):
+        """ Get item ids for tag or id
+        """
+        if isinstance(tag_or_id, int):
+            return (tag_or_id,)
+        
+        return self.canvas.find_withtag(tag_or_id)
+
+    def mark_dirty(self, tag_or_id):
+        """ Note items to be reread
+        """
+        self.dirty_ids.update(self.find_ids(tag_or_id))
+
+    def add_change(self, extent):
+        """ Log changed area
+        :extent: (x1,y1,x2,y2)
+        """
+        self.change_serial += 1
+        self.changes.append((self.change_serial, extent))
+        if len(self.changes) > self.max_changes:
+            self.base_serial = self.change_serial   # Views must rebuild
+            self.changes = []
+        
+    def update(self):
+        """ Reread changed items, bringing index up to date
+        :returns: current change serial
+        """
+        if len(self.dirty_ids) > 0:
+            dirty_ids = sorted(self.dirty_ids)
+            self.dirty_ids = set()
+            for item_id in dirty_ids:
+                old_spec = self.item_index.remove_spec(item_id,
+                                                       keep_order=True)
+                if old_spec is not None:
+                    self.add_change(old_spec.get_extent())
+                new_spec = read_canvas_item(self.canvas, item_id)
+                if new_spec is None:
+                    self.item_index.order_by_id.pop(item_id, None)
+                    continue
+                
+                self.item_index.add_spec(new_spec)
+                self.add_change(new_spec.get_extent())
+        if self.order_changed:
+            self.order_changed = False
+            self.item_index.set_order(self.canvas.find_all())
+        SlTrace.lg(f"CanvasChangeTracker.update: serial:{self.change_serial}",
+                   "canvas_index")
+        return self.change_serial
+    
+    def prune_changes(self, serial):
+        """ Drop changes already seen by all views
+        :serial: oldest view serial
+        """
+        self.changes = [change for change in self.changes
+                        if change[0] > serial]
+        
+    def get_changes(self, since_serial):
+        """ Get areas changed since serial
+        :since_serial: serial of previous view update
+        :returns: list of changed extents, None if too old - rebuild
+        """
+        if since_serial < self.base_serial:
+            return None
+        
+        return [extent for serial, extent in self.changes
+                if serial > since_serial]
+
+
+"""
+Overlap tests - rect is (x1,y1,x2,y2) with x1<=x2, y1<=y2
+"""
+
+def item_overlaps_rect(spec, rect):
+    """ Check if item overlaps rectangle, as tk's find_overlapping does
+    :spec: CanvasItemSpec
+    :rect: (x1,y1,x2,y2)
+    :returns: True if overlapping
+    """
+    item_type = spec.type
+    if item_type == "line":
+        return line_overlaps_rect(spec.coords, spec.width, spec.capstyle, rect)
+
+    if item_type == "rectangle":
+        return rectangle_overlaps_rect(spec, rect)
+
+    if item_type == "oval":
+        return oval_overlaps_rect(spec, rect)
+
+    if item_type == "polygon":
+        return polygon_overlaps_rect(spec, rect)
+
+    return rects_overlap(spec.bbox, rect)
+
+
+def rects_overlap(r1, r2):
+    return not (r1[0] > r2[2] or r1[2] < r2[0]
+                or r1[1] > r2[3] or r1[3] < r2[1])
+
+
+def point_in_rect(x, y, rect):
+    return rect[0] <= x <= rect[2] and rect[1] <= y <= rect[3]
+
+
+def disc_overlaps_rect(cx, cy, radius, rect):
+    """ Check if disc overlaps rectangle
+    """
+    dx = cx - min(max(cx, rect[0]), rect[2])
+    dy = cy - min(max(cy, rect[1]), rect[3])
+    return dx*dx + dy*dy <= radius*radius
+
+
+def convex_overlaps_rect(pts, rect):
+    """ Separating axis test of convex polygon against rectangle
+    :pts: list of (x,y) convex polygon vertices, in order
+    """
+    xs = [pt[0] for pt in pts]
+    ys = [pt[1] for pt in pts]
+    if (min(xs) > rect[2] or max(xs) < rect[0]
+            or min(ys) > rect[3] or max(ys) < rect[1]):
+        return False
+
+    corners = ((rect[0],rect[1]), (rect[2],rect[1]),
+               (rect[2],rect[3]), (rect[0],rect[3]))
+    npts = len(pts)
+    for i in range(npts):
+        ax,ay = pts[i]
+        bx,by = pts[(i+1)%npts]
+        nx,ny = ay-by, bx-ax        # edge normal
+        if nx == 0 and ny == 0:
+            continue
+
+        pp = [nx*x + ny*y for x,y in pts]
+        rp = [nx*x + ny*y for x,y in corners]
+        if min(pp) > max(rp) or max(pp) < min(rp):
+            return False
+
+    return True
+
+
+def thick_segment_overlaps_rect(x1, y1, x2, y2, half_width, rect,
+                                extend=0.):
+    """ Check if thick segment (butt ends) overlaps rectangle
+    :half_width: half of the line's width
+    :extend: extension past each end (projecting cap)
+    """
+    dx = x2-x1
+    dy = y2-y1
+    seg_len = math.hypot(dx, dy)
+    if seg_len == 0:
+        return False
+
+    ux = dx/seg_len
+    uy = dy/seg_len
+    px = -uy*half_width
+    py = ux*half_width
+    ex = ux*extend
+    ey = uy*extend
+    quad = ((x1-ex+px, y1-ey+py), (x2+ex+px, y2+ey+py),
+            (x2+ex-px, y2+ey-py), (x1-ex-px, y1-ey-py))
+    return convex_overlaps_rect(quad, rect)
+
+
+def line_overlaps_rect(coords, width, capstyle, rect):
+    """ Check if (poly)line overlaps rectangle
+    Joints are taken as round (tk's default joinstyle)
+    """
+    width = max(width, 1.)
+    half_width = width/2.
+    join_radius = (width+1.)/2.
+    pts = list(zip(coords[0::2], coords[1::2]))
+    if len(pts) == 0:
+        return False
+
+    if len(pts) == 1:
+        pts.append(pts[0])
+    npts = len(pts)
+    for i in range(npts-1):
+        (x1,y1),(x2,y2) = pts[i], pts[i+1]
+        extend = 0.
+        if capstyle == "projecting" and (i == 0 or i == npts-2):
+            extend = half_width
+        if thick_segment_overlaps_rect(x1, y1, x2, y2, half_width,
+                                       rect, extend=extend):
+            return True
+
+    for i, (x,y) in enumerate(pts):
+        is_end = i == 0 or i == npts-1
+        if is_end and capstyle != "round":
+            continue
+
+        if disc_overlaps_rect(x, y, join_radius, rect):
+            return True
+
+    return False
+
+
+def rectangle_overlaps_rect(spec, rect):
+    """ Check if rectangle item overlaps rectangle
+    Unfilled rectangles overlap only via their outline
+    """
+    x1,y1,x2,y2 = spec.bbox
+    hw = spec.half_width()
+    outer = (x1-hw, y1-hw, x2+hw, y2+hw)
+    if not rects_overlap(outer, rect):
+        return False
+
+    if spec.fill != '':
+        return True
+
+    if hw == 0:
+        return False
+
+    inner = (x1+hw, y1+hw, x2-hw, y2-hw)
+    if (inner[0] < rect[0] and rect[2] < inner[2]
+            and inner[1] < rect[1] and rect[3] < inner[3]):
+        return False        # Entirely within the hollow
+
+    return True
+
+
+def ellipse_overlaps_rect(cx, cy, rx, ry, rect):
+    """ Check if axis aligned ellipse overlaps rectangle
+    Scale ellipse to unit circle
+    """
+    if rx <= 0 or ry <= 0:
+        return point_in_rect(cx, cy, rect)
+
+    srect = ((rect[0]-cx)/rx, (rect[1]-cy)/ry,
+             (rect[2]-cx)/rx, (rect[3]-cy)/ry)
+    return disc_overlaps_rect(0., 0., 1., srect)
+
+
+def oval_overlaps_rect(spec, rect):
+    """ Check if oval item overlaps rectangle
+    """
+    x1,y1,x2,y2 = spec.bbox
+    hw = spec.half_width()
+    cx = (x1+x2)/2.
+    cy = (y1+y2)/2.
+    rx = (x2-x1)/2.
+    ry = (y2-y1)/2.
+    if not ellipse_overlaps_rect(cx, cy, rx+hw, ry+hw, rect):
+        return False
+
+    if spec.fill != '':
+        return True
+
+    if hw == 0:
+        return False
+
+    irx = rx-hw
+    iry = ry-hw
+    if irx <= 0 or iry <= 0:
+        return True
+
+    for x,y in ((rect[0],rect[1]), (rect[2],rect[1]),
+                (rect[2],rect[3]), (rect[0],rect[3])):
+        if ((x-cx)/irx)**2 + ((y-cy)/iry)**2 >= 1.:
+            return True
+
+    return False            # Entirely within the hollow
+
+
+def point_in_polygon(x, y, pts):
+    """ Even-odd point in polygon test
+    """
+    inside = False
+    npts = len(pts)
+    j = npts-1
+    for i in range(npts):
+        xi,yi = pts[i]
+        xj,yj = pts[j]
+        if (yi > y) != (yj > y):
+            x_cross = xi + (y-yi)*(xj-xi)/(yj-yi)
+            if x < x_cross:
+                inside = not inside
+        j = i
+    return inside
+
+
+def polygon_overlaps_rect(spec, rect):
+    """ Check if polygon item overlaps rectangle
+    """
+    pts = list(zip(spec.coords[0::2], spec.coords[1::2]))
+    if len(pts) == 0:
+        return False
+
+    hw = spec.half_width()
+    if spec.fill != '':
+        for x,y in pts:
+            if point_in_rect(x, y, rect):
+                return True
+
+        if point_in_polygon((rect[0]+rect[2])/2., (rect[1]+rect[3])/2., pts):
+            return True
+
+        edge_hw = hw if hw > 0 else 0.
+    elif hw > 0:
+        edge_hw = hw
+    else:
+        return False
+
+    npts = len(pts)
+    for i in range(npts):
+        x1,y1 = pts[i]
+        x2,y2 = pts[(i+1)%npts]
+        if edge_hw > 0:
+            if thick_segment_overlaps_rect(x1, y1, x2, y2, edge_hw, rect):
+                return True
+
+            if disc_overlaps_rect(x1, y1, edge_hw, rect):
+                return True
+        elif segment_crosses_rect(x1, y1, x2, y2, rect):
+            return True
+
+    return False
+
+
+def segment_crosses_rect(x1, y1, x2, y2, rect):
+    """ Check if zero width segment touches rectangle
+    """
+    if point_in_rect(x1, y1, rect) or point_in_rect(x2, y2, rect):
+        return True
+
+    return convex_overlaps_rect(((x1,y1), (x2,y2)), rect)
@@ -0,0 +1,165 @@
+#cell_distance_transform.py  18Oct2026  crs, Author
+"""
+Distance transform of a cell figure: for each grid square,
+the squared distance (in cells) to, and the location of, the
+nearest cell.  Built once per figure (draw_cells), updated
+incrementally as cells are created or deleted, so distance to
+figure / closest cell queries are a table lookup.
+"""
+import numpy as np
+
+from select_trace import SlTrace
+
+
+class CellDistanceTransform:
+    CHUNK = 256         # cells per vectorized pass, bounding memory
+
+    def __init__(self, grid_width, grid_height):
+        """ Setup empty transform
+        :grid_width: number of cells horizontally
+        :grid_height: number of cells vertically
+        """
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.cells_id = None        # id of cells dictionary transformed
+        self.ncells = None          # number of cells transformed
+        self.n_builds = 0
+        self.n_lookups = 0
+
+    def is_current(self, cells):
+        """ Check if transform is for this cells dictionary
+        :cells: dictionary of cells by (ix,iy)
+        :returns: True if up to date
+        """
+        return id(cells) == self.cells_id and len(cells) == self.ncells
+
+    def invalidate(self):
+        """ Force rebuild on next use
+        """
+        self.cells_id = None
+
+    def build(self, cells):
+        """ Compute transform for all cells
+        The grid covers the display grid plus any cells outside it
+        :cells: dictionary of cells by (ix,iy)
+        """
+        self.n_builds += 1
+        self.cells_id = id(cells)
+        self.ncells = len(cells)
+        cell_ixys = np.array(list(cells), dtype=int).reshape(-1, 2)
+        ix_min,iy_min = 0,0
+        ix_max,iy_max = self.grid_width-1, self.grid_height-1
+        if len(cell_ixys) > 0:
+            ix_min = min(ix_min, int(cell_ixys[:,0].min()))
+            iy_min = min(iy_min, int(cell_ixys[:,1].min()))
+            ix_max = max(ix_max, int(cell_ixys[:,0].max()))
+            iy_max = max(iy_max, int(cell_ixys[:,1].max()))
+        self.ix_min, self.iy_min = ix_min, iy_min
+        self.ix_max, self.iy_max = ix_max, iy_max
+        shape = (iy_max-iy_min+1, ix_max-ix_min+1)
+        self.grid_iy, self.grid_ix = np.indices(shape)
+        self.grid_ix += ix_min
+        self.grid_iy += iy_min
+        self.dist2 = np.full(shape, np.iinfo(np.int64).max, dtype=np.int64)
+        self.near_ix = np.zeros(shape, dtype=int)
+        self.near_iy = np.zeros(shape, dtype=int)
+        self.update_nearest(cell_ixys)
+        SlTrace.lg(f"CellDistanceTransform.build: {len(cell_ixys)} cells"
+                   f" grid: {shape}", "cell_distance")
+
+    def update_nearest(self, cell_ixys, mask=None):
+        """ Lower squares' nearest distance / location with cells
+        Earlier cells win ties, as in a linear search
+        :cell_ixys: ndarray of (ix,iy) rows
+        :mask: boolean array of squares to update
+                default: all squares
+        """
+        if mask is None:
+            grid_ix, grid_iy = self.grid_ix, self.grid_iy
+        else:
+            grid_ix, grid_iy = self.grid_ix[mask], self.grid_iy[mask]
+        dist2 = self.dist2 if mask is None else self.dist2[mask]
+        near_ix = self.near_ix if mask is None else self.near_ix[mask]
+        near_iy = self.near_iy if mask is None else self.near_iy[mask]
+        for i_beg in range(0, len(cell_ixys), self.CHUNK):
+            chunk = cell_ixys[i_beg:i_beg+self.CHUNK]
+            d2 = ((grid_ix[..., np.newaxis] - chunk[:,0])**2
+                  + (grid_iy[..., np.newaxis] - chunk[:,1])**2)
+            i_min = d2.argmin(axis=-1)
+            d2_min = np.take_along_axis(d2, i_min[..., np.newaxis],
+                                        axis=-1)[..., 0]
+            closer = d2_min < dist2
+            dist2[closer] = d2_min[closer]
+            near_ix[closer] = chunk[i_min[closer], 0]
+            near_iy[closer] = chunk[i_min[closer], 1]
+        if mask is not None:
+            self.dist2[mask] = dist2
+            self.near_ix[mask] = near_ix
+            self.near_iy[mask] = near_iy
+
+    def is_in_grid(self, ixy):
+        """ Check if ixy is within transform's grid
+        """
+        ix,iy = ixy
+        return (self.ix_min <= ix <= self.ix_max
+                and self.iy_min <= iy <= self.iy_max)
+
+    def add_cell(self, ixy, cells):
+        """ Update for new cell
+        :ixy: (ix,iy) of cell added
+        :cells: cells dictionary, including new cell
+        """
+        if (self.cells_id != id(cells) or self.ncells is None
+                or len(cells) - self.ncells not in (0,1)
+                or not self.is_in_grid(ixy)):
+            self.invalidate()       # Rebuild on next use
+            return
+
+        self.ncells = len(cells)
+        self.update_nearest(np.array([ixy], dtype=int))
+
+    def remove_cell(self, ixy, cells):
+        """ Update for deleted cell
+        :ixy: (ix,iy) of cell removed
+        :cells: cells dictionary, without removed cell
+        """
+        if (self.cells_id != id(cells) or self.ncells is None
+                or self.ncells - len(cells) != 1):
+            self.invalidate()
+            return
+
+        self.ncells = len(cells)
+        ix,iy = ixy
+        orphans = (self.near_ix == ix) & (self.near_iy == iy)
+        self.dist2[orphans] = np.iinfo(np.int64).max
+        if len(cells) > 0 and orphans.any():
+            cell_ixys = np.array(list(cells), dtype=int).reshape(-1, 2)
+            self.update_nearest(cell_ixys, mask=orphans)
+
+    def nearest(self, ixy, cells):
+        """ Get nearest cell
+        :ixy: (ix,iy) location, may be outside grid
+        :cells: dictionary of cells by (ix,iy)
+        :returns: (distance, x offset, y offset, (ix,iy) of nearest cell)
+                    offsets are cell - ixy
+                  None if no cells
+        """
+        if len(cells) == 0:
+            return None
+
+        if not self.is_current(cells):
+            self.build(cells)
+        self.n_lookups += 1
+        pt_ix,pt_iy = ixy
+        if self.is_in_grid(ixy):
+            gx,gy = pt_ix-self.ix_min, pt_iy-self.iy_min
+            near_ixy = (int(self.near_ix[gy,gx]), int(self.near_iy[gy,gx]))
+            dist2 = int(self.dist2[gy,gx])
+        else:       # Off grid e.g. mouse beyond edge - search cells
+            cell_ixys = np.array(list(cells), dtype=int)
+            d2 = (cell_ixys[:,0]-pt_ix)**2 + (cell_ixys[:,1]-pt_iy)**2
+            i_min = int(d2.argmin())
+            near_ixy = (int(cell_ixys[i_min,0]), int(cell_ixys[i_min,1]))
+            dist2 = int(d2[i_min])
+        return (float(np.sqrt(dist2)), near_ixy[0]-pt_ix, near_ixy[1]-pt_iy,
+                near_ixy)
@@ -0,0 +1,251 @@
+#cell_run_index.py  18Oct2026  crs, Author
+"""
+Run-length index of a cell figure: for each row and each column,
+the sorted runs of adjacent same-color cells.  Directional
+reports ("3 reds to right, then 5 blanks to a green") walk runs
+instead of probing the cells dictionary one location at a time.
+Built once per figure (draw_cells), with only the row and column
+of a created or deleted cell rebuilt (lazily) afterwards.
+"""
+from bisect import bisect_right
+
+from select_trace import SlTrace
+
+
+class CellRun:
+    """ Run of adjacent same-color cells along a row or column
+    """
+    __slots__ = ("beg", "end", "color")
+
+    def __init__(self, beg, end, color):
+        """ Setup run
+        :beg: first index along line (ix for row, iy for column)
+        :end: last index along line, inclusive
+        :color: cell color string
+        """
+        self.beg = beg
+        self.end = end
+        self.color = color
+
+    def __repr__(self):
+        return f"CellRun({self.beg},{self.end},{self.color})"
+
+
+class CellRunIndex:
+
+    def __init__(self, grid_width, grid_height):
+        """ Setup empty index
+        :grid_width: number of cells horizontally
+        :grid_height: number of cells vertically
+        """
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.cells_id = None        # id of cells dictionary indexed
+        self.ncells = None          # number of cells indexed
+        self.row_colors = {}        # by iy: {ix: color string}
+        self.col_colors = {}        # by ix: {iy: color string}
+        self.row_runs = {}          # by iy: [CellRun] sorted by beg
+        self.col_runs = {}          # by ix: [CellRun] sorted by beg
+        self.dirty_rows = set()     # rows whose runs need rebuilding
+        self.dirty_cols = set()
+        self.n_builds = 0
+
+    def is_current(self, cells):
+        """ Check if index is for this cells dictionary
+        :cells: dictionary of cells by (ix,iy)
+        :returns: True if up to date
+        """
+        return id(cells) == self.cells_id and len(cells) == self.ncells
+
+    def invalidate(self):
+        """ Force rebuild on next use
+        """
+        self.cells_id = None
+
+    def build(self, cells):
+        """ Index all cells
+        :cells: dictionary of cells by (ix,iy)
+        """
+        self.n_builds += 1
+        self.cells_id = id(cells)
+        self.ncells = len(cells)
+        self.row_colors = {}
+        self.col_colors = {}
+        for (ix,iy),cell in cells.items():
+            color = cell.color_string()
+            self.row_colors.setdefault(iy, {})[ix] = color
+            self.col_colors.setdefault(ix, {})[iy] = color
+        self.row_runs = {}
+        self.col_runs = {}
+        self.dirty_rows = set(self.row_colors)
+        self.dirty_cols = set(self.col_colors)
+        SlTrace.lg(f"CellRunIndex.build: {len(cells)} cells"
+                   f" rows: {len(self.row_colors)}"
+                   f" cols: {len(self.col_colors)}", "cell_runs")
+
+    @staticmethod
+    def make_runs(line_colors):
+        """ Create runs from a line's cell colors
+        :line_colors: dictionary of color string by index along line
+        :returns: list of CellRun sorted by beg
+        """
+        runs = []
+        run = None
+        for idx in sorted(line_colors):
+            color = line_colors[idx]
+            if run is not None and idx == run.end+1 and color == run.color:
+                run.end = idx
+            else:
+                run = CellRun(idx, idx, color)
+                runs.append(run)
+        return runs
+
+    def get_line_runs(self, ixy, dir):
+        """ Get runs of line through ixy along dir,
+        rebuilding if cells changed
+        :ixy: (ix,iy) on line
+        :dir: (chg_x,chg_y) with one of chg_x, chg_y zero
+        :returns: list of CellRun, index along line of ixy
+        """
+        ix,iy = ixy
+        if dir[1] == 0:
+            if iy in self.dirty_rows:
+                self.dirty_rows.discard(iy)
+                self.row_runs[iy] = self.make_runs(self.row_colors.get(iy, {}))
+            return self.row_runs.get(iy, []), ix
+
+        if ix in self.dirty_cols:
+            self.dirty_cols.discard(ix)
+            self.col_runs[ix] = self.make_runs(self.col_colors.get(ix, {}))
+        return self.col_runs.get(ix, []), iy
+
+    def set_cell_color(self, ixy, color):
+        """ Record cell color change (color None - removed),
+        marking row and column for rebuild
+        """
+        ix,iy = ixy
+        for lines, key, idx in ((self.row_colors, iy, ix),
+                                (self.col_colors, ix, iy)):
+            line_colors = lines.setdefault(key, {})
+            if color is None:
+                line_colors.pop(idx, None)
+            else:
+                line_colors[idx] = color
+        self.dirty_rows.add(iy)
+        self.dirty_cols.add(ix)
+
+    def add_cell(self, ixy, cells):
+        """ Update for new or replaced cell
+        :ixy: (ix,iy) of cell added
+        :cells: cells dictionary, including new cell
+        """
+        if (self.cells_id != id(cells) or self.ncells is None
+                or len(cells) - self.ncells not in (0,1)):
+            self.invalidate()       # Rebuild on next use
+            return
+
+        self.ncells = len(cells)
+        self.set_cell_color(ixy, cells[ixy].color_string())
+
+    def remove_cell(self, ixy, cells):
+        """ Update for deleted cell
+        :ixy: (ix,iy) of cell removed
+        :cells: cells dictionary, without removed cell
+        """
+        if (self.cells_id != id(cells) or self.ncells is None
+                or self.ncells - len(cells) != 1):
+            self.invalidate()
+            return
+
+        self.ncells = len(cells)
+        self.set_cell_color(ixy, None)
+
+    def runs_in_dir(self, ixy, dir, cells, idx_min, idx_max):
+        """ Generate runs of cells and blanks from ixy, not including
+        ixy, in direction dir up to edge
+        :ixy: (ix,iy) starting location
+        :dir: (chg_x,chg_y) horizontal or vertical unit step
+        :cells: dictionary of cells by (ix,iy)
+        :idx_min: minimum index along line e.g. get_ix_min()
+        :idx_max: maximum index along line
+        :returns: generator of (length, color string, (ix,iy) of run's
+                    last location in direction)
+                    color is None for a run of blanks
+        """
+        if not self.is_current(cells):
+            self.build(cells)
+        runs, idx = self.get_line_runs(ixy, dir)
+        step = dir[0] + dir[1]          # +1 or -1 along line
+        ix,iy = ixy
+
+        def to_ixy(line_idx):
+            return (line_idx,iy) if dir[1] == 0 else (ix,line_idx)
+
+        pos = idx + step                 # next location along line
+        i_run = bisect_right([run.beg for run in runs], pos) - 1
+        if step > 0 and (i_run < 0 or runs[i_run].end < pos):
+            i_run += 1                  # pos in blanks before run i_run
+        while idx_min <= pos <= idx_max:
+            if 0 <= i_run < len(runs):
+                run = runs[i_run]
+            else:
+                run = None
+            if run is not None and run.beg <= pos <= run.end:
+                run_last = run.end if step > 0 else run.beg
+                color = run.color
+                i_run += step
+            else:                       # Blanks up to next run or edge
+                if run is None:
+                    run_last = idx_max if step > 0 else idx_min
+                else:
+                    run_last = run.beg-1 if step > 0 else run.end+1
+                color = None
+            run_last = min(max(run_last, idx_min), idx_max)
+            yield abs(run_last-pos)+1, color, to_ixy(run_last)
+            pos = run_last + step
+
+    def span_in_dir(self, ixy, dir, cells, stops=None):
+        """ Get number of adjacent cells, of any color, from ixy,
+        not including ixy, in direction dir
+        :ixy: (ix,iy) starting location
+        :dir: (chg_x,chg_y) horizontal or vertical unit step
+        :cells: dictionary of cells by (ix,iy)
+        :stops: collection of (ix,iy) locations ending span
+                e.g. already traversed cells default: no stops
+        :returns: number of cells
+        """
+        if not self.is_current(cells):
+            self.build(cells)
+        runs, idx = self.get_line_runs(ixy, dir)
+        step = dir[0] + dir[1]
+        pos = idx + step
+        i_run = bisect_right([run.beg for run in runs], pos) - 1
+        if i_run < 0 or runs[i_run].end < pos:
+            return 0                    # Next location is blank
+
+        if step > 0:
+            last = runs[i_run].end
+            while i_run+1 < len(runs) and runs[i_run+1].beg == last+1:
+                i_run += 1
+                last = runs[i_run].end
+        else:
+            last = runs[i_run].beg
+            while i_run > 0 and runs[i_run-1].end == last-1:
+                i_run -= 1
+                last = runs[i_run].beg
+        if stops:
+            ix,iy = ixy
+            for stop_ix,stop_iy in stops:
+                if dir[1] == 0:
+                    if stop_iy != iy:
+                        continue
+                    stop = stop_ix
+                else:
+                    if stop_ix != ix:
+                        continue
+                    stop = stop_iy
+                if step > 0 and pos <= stop <= last:
+                    last = stop - 1
+                elif step < 0 and last <= stop <= pos:
+                    last = stop + 1
+        return abs(last-pos) + 1 if (last-pos)*step >= 0 else 0
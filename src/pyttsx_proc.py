@@ -3,56 +3,209 @@
     Supports
         1. queued requests
         2. clearing pending and current requests
+        3. warm standby processes, with engine already
+           initialized, so speech after a clear
+           does not wait for process start and engine init
 """
 import multiprocessing as mp
+import os
+import threading
 import time
 
 from speech_maker_cmd import SpeechMakerCmd
-import pyttsx3 as pyttsxN    # Can use pyttsx3 instead
+try:
+    import pyttsx3 as pyttsxN    # Can use pyttsx3 instead
+except ImportError:
+    pyttsxN = None          # Only with engine_factory
 
 from select_trace import SlTrace
 
+
+def pyttsx_engine():
+    """ Default speech engine factory
+    """
+    return pyttsxN.init()
+
+
+def speech_worker_proc(cmd_queue, ready, idle, n_sent, n_done,
+                       engine_factory):
+    """ process speech commands
+        speech worker process's processing procedure
+    :cmd_queue: queue of SpeechMakerCmd
+    :ready: Event set when engine is initialized
+    :idle: Event set when all sent commands are done
+    :n_sent: Value number of commands sent
+    :n_done: Value number of commands done
+    :engine_factory: function returning pyttsxN-like engine
+    """
+    SlTrace.clearFlags()    # Clear flags in separate process
+    engine = engine_factory()
+    ready.set()
+
+    while True:
+        cmd = cmd_queue.get()
+        engine_runAndWait(engine, cmd)
+        SlTrace.lg("after engine_runAndWait()", "talk_cmd")
+        with n_sent.get_lock():
+            n_done.value += 1
+            if n_done.value >= n_sent.value:
+                idle.set()
+
+
+def engine_runAndWait(engine, cmd):
+    """ run engine, wait till done
+    :engine: speech engine
+    :cmd: SpeechMakerCmd
+    """
+    if cmd.rate is not None:
+        engine.setProperty('rate', cmd.rate)
+    if cmd.volume is not None:
+        engine.setProperty('volume', cmd.volume)
+    if cmd.file_name is not None:
+        tmp_name = cmd.file_name + ".tmp"   # Seen only when complete
+        engine.save_to_file(cmd.msg, tmp_name)
+        engine.runAndWait()
+        if os.path.exists(tmp_name):
+            os.replace(tmp_name, cmd.file_name)
+        SlTrace.lg(f"After eng.save_to_file({cmd.file_name})", "talk_cmd")
+    elif cmd.msg is not None and cmd.msg != '':
+        engine.say(cmd.msg)
+        SlTrace.lg(f"After eng.say({cmd.msg})", "talk_cmd")
+        engine.runAndWait()
+    SlTrace.lg("after eng.runAndWait()", "talk_cmd")
+
+
+class SpeechWorker:
+    """ One speech process, with its command queue
+    and busy/idle signaling
+    """
+    def __init__(self, qlen=100, engine_factory=None):
+        """ Start speech process
+        :qlen: command queue length
+        :engine_factory: function returning speech engine
+                default: pyttsxN.init
+        """
+        if engine_factory is None:
+            engine_factory = pyttsx_engine
+        self.qlen = qlen
+        self.cmd_queue = mp.Queue(qlen)  # speech queue of SpeechMakerCmd
+        self.ready = mp.Event()         # Set when engine initialized
+        self.idle = mp.Event()          # Set when nothing pending
+        self.idle.set()
+        self.n_sent = mp.Value('i', 0)  # Lock shared with n_done
+        self.n_done = mp.Value('i', 0, lock=False)
+        self.proc = mp.Process(target=speech_worker_proc,
+                               args=(self.cmd_queue, self.ready, self.idle,
+                                     self.n_sent, self.n_done,
+                                     engine_factory),
+                               daemon=True)
+        self.proc.start()
+
+    def is_alive(self):
+        return self.proc.is_alive()
+
+    def is_ready(self):
+        """ Check if engine is initialized
+        """
+        return self.ready.is_set()
+
+    def is_busy(self):
+        """ Check if talking or have pending talk
+        """
+        return not self.idle.is_set()
+
+    def get_pending(self):
+        """ Get number of commands sent but not done
+        """
+        with self.n_sent.get_lock():
+            return self.n_sent.value - self.n_done.value
+
+    def send(self, cmd):
+        """ Queue command
+        :cmd: SpeechMakerCmd
+        :returns: True if queued, False if queue full
+        """
+        if self.get_pending() >= self.qlen:
+            return False
+
+        with self.n_sent.get_lock():
+            self.n_sent.value += 1
+            self.idle.clear()
+        self.cmd_queue.put(cmd)
+        return True
+
+    def wait_idle(self, timeout=None):
+        """ Wait till not busy
+        :timeout: maximum wait, seconds default: no limit
+        :returns: True if idle
+        """
+        return self.idle.wait(timeout)
+
+    def kill(self, wait=False):
+        """ Stop process, dropping current and pending talk
+        :wait: True - wait for process to end
+                default: False - reap in background
+        """
+        self.proc.kill()
+        if wait:
+            self.proc.join()
+        else:
+            threading.Thread(target=self.proc.join, daemon=True).start()
+
+
 class PyttsxProc:
-    def __init__(self, qlen=100):    # 10 USUALY
+    def __init__(self, qlen=100, n_standby=1, engine_factory=None):    # 10 USUALY
         """ Setup for interprocess communication
         :qlen: input/output queue length
                 default: 10
+        :n_standby: number of initialized speech processes
+                kept ready to replace a cleared one
+                default: 1
+        :engine_factory: function, returning speech engine,
+                called in speech process
+                default: pyttsxN.init
         """
         self.qlen = qlen
+        self.n_standby = n_standby
+        self.engine_factory = engine_factory
+        self.pyt_proc = None        # Active SpeechWorker
+        self.standby = []           # Warm SpeechWorkers, oldest first
         self.setup_proc()       # setup incase
                                 # is_busy called
                                 # before talk
-    def pyt_proc_proc(self):
-        """ process speech commands
-            process's processing procedure
-        """    
-        SlTrace.clearFlags()    # Clear flags in separate process
-        self.engine = pyttsxN.init()
-
-        while True:
-            cmd = self.pyt_queue.get()
-            self.do_cmd(cmd)
 
     def setup_proc(self):
         """ Setup procesing process
+        Use a standby process if we have one, preferring
+        one whose engine is ready, and start replacements
+        in the background
         """
-        self.pyt_proc = mp.Process(target=self.pyt_proc_proc)
-        self.pyt_queue = mp.Queue(self.qlen)  # speech queue of SpeakerControlCmd
-        self.pyt_out_queue = mp.Queue(2*self.qlen)
-        self.pyt_engine_busy = False   # Updated with status
-        time.sleep(1) 
-        self.pyt_proc.start()
-        
+        if self.pyt_proc is None:
+            self.standby = [worker for worker in self.standby
+                            if worker.is_alive()]
+            if self.standby:
+                ready = [worker for worker in self.standby
+                         if worker.is_ready()]
+                worker = ready[0] if ready else self.standby[0]
+                self.standby.remove(worker)
+                self.pyt_proc = worker
+            else:
+                self.pyt_proc = SpeechWorker(qlen=self.qlen,
+                                    engine_factory=self.engine_factory)
+        while len(self.standby) < self.n_standby:
+            self.standby.append(SpeechWorker(qlen=self.qlen,
+                                    engine_factory=self.engine_factory))
+
     def clear(self):
         """ Clear current and pending talking
+        Switches to a standby process
         """
         if self.pyt_proc is None:
             return      # clear or unset
         
         self.pyt_proc.kill()
-        self.pyt_proc.join()
-        self.pyt_proc = None    # Forces talk to re-setup
-        
+        self.pyt_proc = None
+        self.setup_proc()
                     
     def is_alive(self):
         """ Check if speech processing is going
@@ -84,41 +237,28 @@ class PyttsxProc:
             self.quit()
             return
         
-        while self.pyt_queue.qsize() >= self.qlen:
+        if not self.pyt_proc.send(cmd):
             SlTrace.lg(f"talk queue size "
-                       f" {self.pyt_queue.qsize()}"
+                       f" {self.pyt_proc.get_pending()}"
                        f" dropping {cmd.msg}")
             return
-        self.pyt_queue.put(cmd)
-        SlTrace.lg(f"make_cmd - queue size: {self.pyt_queue.qsize()}", "talk_cmd")
-            
-    def do_cmd(self, cmd):
-        """ do talking, waiting till done
-        :cmd: SpeechMakerCmd
-        """
-        self.engine_runAndWait(cmd)
-        SlTrace.lg("after engine_runAndWait()", "talk_cmd")
-        SlTrace.lg(f"do_cmd - queue size: {self.pyt_queue.qsize()}", "talk_cmd")
-
-    def engine_runAndWait(self, cmd):
-        """ run engine, wait till done
-        """
-        self.pyt_out_queue.put(True)    # Set as busy
-        if cmd.rate is not None:
-            self.engine.setProperty('rate', cmd.rate)
-        if cmd.volume is not None:
-            self.engine.setProperty('volume', cmd.volume)
-        if cmd.msg is not None and cmd.msg != '':
-            self.engine.say(cmd.msg)
-            SlTrace.lg(f"After eng.say({cmd.msg})", "talk_cmd")
-            self.engine.runAndWait()
-        SlTrace.lg("after eng.runAndWait()", "talk_cmd")
-        self.pyt_out_queue.put(False)
+        SlTrace.lg(f"make_cmd - queue size: {self.pyt_proc.get_pending()}",
+                   "talk_cmd")
         
-    def wait_while_busy(self):
-        while True:
-            if not self.is_busy():
-                break
+    def wait_while_busy(self, timeout=None):
+        """ Wait till talking is done
+        :timeout: maximum wait, seconds default: no limit
+        :returns: True if not busy
+        """
+        t_end = None if timeout is None else time.time() + timeout
+        while self.is_busy():
+            wait = .1       # Recheck process is alive
+            if t_end is not None:
+                wait = min(wait, t_end - time.time())
+                if wait <= 0:
+                    return False
+            self.pyt_proc.wait_idle(wait)
+        return True
 
     def is_busy(self):
         """ Check if busy talking or
@@ -127,15 +267,7 @@ class PyttsxProc:
         if not self.is_alive():
             return False
         
-        if self.pyt_queue.qsize()>0:
-            return True
-        
-        while self.pyt_out_queue.qsize() > 0:
-            if not self.is_alive():
-                return False
-            self.pyt_engine_busy = self.pyt_out_queue.get()
-        return self.pyt_engine_busy
-        
+        return self.pyt_proc.is_busy()
     
     def quit(self, wait=True):
         """ Quit talking
@@ -145,7 +277,12 @@ class PyttsxProc:
         SlTrace.lg("Quitting", "talk_cmd")
         if wait:
             self.wait_while_busy()
-        self.clear()
+        for worker in self.standby:
+            worker.kill()
+        self.standby = []
+        if self.pyt_proc is not None:
+            self.pyt_proc.kill(wait=True)
+            self.pyt_proc = None    # Forces talk to re-setup
         SlTrace.lg("After quit", "talk_cmd")
            
     
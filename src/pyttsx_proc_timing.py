@@ -0,0 +1,69 @@
+# pyttsx_proc_timing.py  18Oct2026  crs, Author
+""" PyttsxProc stop-to-next-utterance latency, with a fake
+speech engine (init and speaking time simulated by sleeping)
+    cold:  n_standby=0 - clear kills process, next talk waits
+            for process start and engine init
+    warm:  n_standby=1 - clear switches to a ready standby process
+Usage: python pyttsx_proc_timing.py [--init_time SEC] [--char_time SEC]
+                        [--repeat N]
+"""
+import argparse
+import time
+from functools import partial
+
+from select_trace import SlTrace
+from pyttsx_proc import PyttsxProc
+
+class FakeEngine:
+    """ Just the pyttsxN engine calls PyttsxProc uses
+    """
+    def __init__(self, init_time, char_time):
+        time.sleep(init_time)   # e.g. pyttsxN.init()
+        self.char_time = char_time
+        self.pending = []
+
+    def setProperty(self, name, value):
+        pass
+
+    def say(self, msg):
+        self.pending.append(msg)
+
+    def runAndWait(self):
+        for msg in self.pending:
+            time.sleep(len(msg)*self.char_time)
+        self.pending = []
+
+def fake_engine(init_time, char_time):
+    return FakeEngine(init_time=init_time, char_time=char_time)
+
+def time_clear(n_standby, init_time, char_time, repeat):
+    """ Time from clear of a long utterance to end of a short one
+    :returns: average seconds, seconds of short utterance alone
+    """
+    engine_factory = partial(fake_engine, init_time, char_time)
+    proc = PyttsxProc(n_standby=n_standby, engine_factory=engine_factory)
+    short_msg = "Stopped"
+    t_total = 0
+    for _ in range(repeat):
+        proc.talk("a long announcement " * 20)
+        time.sleep(max(init_time, .1)*2)   # Engines ready, talking
+        t_beg = time.perf_counter()
+        proc.clear()
+        proc.talk(short_msg)
+        proc.wait_while_busy()
+        t_total += time.perf_counter() - t_beg
+    proc.quit(wait=False)
+    return t_total/repeat, len(short_msg)*char_time
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--init_time', type=float, dest='init_time', default=.5)
+    parser.add_argument('--char_time', type=float, dest='char_time', default=.005)
+    parser.add_argument('--repeat', type=int, dest='repeat', default=5)
+    args = parser.parse_args()
+    for name, n_standby in [("cold", 0), ("warm", 1)]:
+        t_per, t_speak = time_clear(n_standby, args.init_time, args.char_time,
+                                    args.repeat)
+        SlTrace.lg(f"{name:5} n_standby:{n_standby}"
+                   f" clear to end of next utterance msec: {t_per*1000:7.1f}"
+                   f" (speaking: {t_speak*1000:.1f})", to_stdout=True)
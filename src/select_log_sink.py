@@ -0,0 +1,256 @@
+# select_log_sink.py  18Oct2026  crs, Author
+"""
+Queued log output for SlTrace
+
+SlTrace.lg hands each message to a SelectLogSink which returns
+immediately.  A writer thread does the time stamp formatting and
+the file (and optional STDOUT) writing, a batch of lines at a time,
+flushing on size (flush_lines) or time (flush_interval) instead of
+on every line, so heavy tracing does not stall the calling
+(e.g. wx main) thread.
+The caller's cost is one deque append and length check - the
+writer is woken once per flush_lines batch, not per message.
+Time stamps are formatted once per second, as lines are written.
+
+record_format:
+    "text" - log file lines as SlTrace.lg writes them
+    "jsonl" - one JSON object per line:
+            {"ts": time stamp, "time": epoch seconds,
+             "flag": trace flag or null, "msg": message}
+"""
+import json
+import sys
+import time
+from collections import deque
+from datetime import datetime
+from threading import Thread, Event, Condition, Lock
+
+
+def epoch_to_ts(t_epoch, dp=0):
+    """ Time stamp, as SlTrace.getTs, for epoch time
+    :t_epoch: time.time() value
+    :dp: seconds decimal places default: 0
+    """
+    tsfmt = "%Y%m%d_%H%M%S"
+    if dp > 0:
+        tsfmt = "%Y%m%d_%H%M%S_%f"
+    ts = datetime.fromtimestamp(t_epoch).strftime(tsfmt)
+    if dp > 0 and dp < 6:
+        ts = ts[:dp-6]      # remove portion of _[dddddd]
+    return ts
+
+
+class FlushMark:
+    """ flush() position in queue, set when written out
+    """
+    def __init__(self):
+        self.written = Event()
+
+
+class SelectLogSink:
+    RECORD_FORMATS = ["text", "jsonl"]
+
+    def __init__(self, log_writer, record_format="text",
+                 max_queue=10000, flush_lines=500, flush_interval=.5,
+                 drop_when_full=False, full_wait=.1):
+        """ Setup queue and start writer thread
+        :log_writer: open log file
+        :record_format: "text" or "jsonl" default: "text"
+        :max_queue: maximum queued messages default: 10000
+        :flush_lines: write out when this many lines are queued
+                default: 500
+        :flush_interval: write out at least this often, in seconds
+                default: .5
+        :drop_when_full: True - drop messages when queue is full,
+                        counting them in n_dropped
+                        default: False - wait for room
+        :full_wait: longest single wait for room, in seconds, before
+                rechecking for close default: .1
+        """
+        if record_format not in self.RECORD_FORMATS:
+            raise ValueError(f"record_format {record_format}"
+                             f" not one of {self.RECORD_FORMATS}")
+        self.log_writer = log_writer
+        self.record_format = record_format
+        self.max_queue = max_queue
+        self.flush_lines = flush_lines
+        self.flush_interval = flush_interval
+        self.drop_when_full = drop_when_full
+        self.full_wait = full_wait
+        self.log_queue = deque()    # append/popleft are thread safe
+        self.wake = Event()         # Write out now
+        self.written_cond = Condition()     # Signals room in queue
+        self.count_lock = Lock()    # n_dropped from any thread
+        self.ts_sec = None          # Time stamp cache, by epoch second
+        self.ts_sec_str = None
+        self.n_written = 0
+        self.n_dropped = 0
+        self.n_flushes = 0
+        self.closed = False
+        self.writer_thread = Thread(target=self.writer,
+                                    name="SelectLogSink", daemon=True)
+        self.writer_thread.start()
+
+    def write(self, msg, trace_flag=None, dp=0, has_ts=True,
+              stdout_str=None):
+        """ Queue one message
+        :msg: message string
+        :trace_flag: trace flag, if any, used in jsonl records
+        :dp: time stamp seconds decimal places
+        :has_ts: True - text line has time stamp prefix
+        :stdout_str: string to print to STDOUT, None for none
+        """
+        if self.closed:
+            return
+
+        entry = (time.time(), msg, trace_flag, dp, has_ts, stdout_str)
+        log_queue = self.log_queue
+        n_pending = len(log_queue)
+        if n_pending >= self.max_queue:
+            if not self.wait_for_room():
+                with self.count_lock:
+                    self.n_dropped += 1
+                return
+
+        log_queue.append(entry)
+        if n_pending + 1 == self.flush_lines:
+            self.wake.set()         # Once per batch
+
+    def wait_for_room(self):
+        """ Wait for room in full queue, unless drop_when_full
+        :returns: True if room, False to drop message
+        """
+        if self.drop_when_full:
+            return False
+
+        with self.written_cond:
+            while len(self.log_queue) >= self.max_queue:
+                if self.closed or not self.writer_thread.is_alive():
+                    return False
+                self.wake.set()     # Make room
+                self.written_cond.wait(self.full_wait)
+        return True
+
+    def get_ts(self, t_epoch, dp):
+        """ Time stamp, as epoch_to_ts, formatting date and time
+        only when the second changes
+        :t_epoch: time.time() value
+        :dp: seconds decimal places
+        """
+        sec = int(t_epoch)
+        usec = round((t_epoch - sec)*1e6)
+        if usec >= 1000000:
+            return epoch_to_ts(t_epoch, dp)     # Rounds to next second
+        if sec != self.ts_sec:
+            self.ts_sec_str = epoch_to_ts(sec)
+            self.ts_sec = sec
+        if dp <= 0:
+            return self.ts_sec_str
+
+        return f"{self.ts_sec_str}_{usec:06d}"[:dp-6 if dp < 6 else None]
+
+    def format_entry(self, entry):
+        """ Format queued entry as log file line
+        :entry: (time, msg, trace_flag, dp, has_ts, stdout_str)
+        :returns: line string (without newline)
+        """
+        t_epoch, msg, trace_flag, dp, has_ts, _ = entry
+        if self.record_format == "jsonl":
+            return json.dumps({"ts": self.get_ts(t_epoch, dp),
+                               "time": t_epoch,
+                               "flag": trace_flag, "msg": msg})
+
+        if has_ts:
+            return " " + self.get_ts(t_epoch, dp) + msg
+        return msg
+
+    def writer(self):
+        """ Writer thread: write out queued messages
+        when woken or every flush_interval
+        """
+        while True:
+            self.wake.wait(self.flush_interval)
+            self.wake.clear()
+            closed = self.closed        # Set before final write out
+            self.write_queued()
+            if closed:
+                return
+
+    def write_queued(self):
+        """ Write out and flush all queued entries, in writer thread
+        """
+        log_queue = self.log_queue
+        if len(log_queue) == 0:
+            return
+
+        lines = []
+        stdout_lines = []
+        marks = []
+        for _ in range(len(log_queue)):     # Those queued so far
+            entry = log_queue.popleft()
+            if isinstance(entry, FlushMark):
+                marks.append(entry)
+                continue
+
+            lines.append(self.format_entry(entry))
+            if entry[-1] is not None:
+                stdout_lines.append(entry[-1])
+        try:
+            if len(stdout_lines) > 0:
+                print("\n".join(stdout_lines))
+                sys.stdout.flush()
+            if len(lines) > 0:
+                print("\n".join(lines), file=self.log_writer)
+                self.log_writer.flush()
+        except Exception as e:
+            print(f"SelectLogSink write error: {e}")
+        self.n_written += len(lines)
+        self.n_flushes += 1
+        for mark in marks:
+            mark.written.set()
+        with self.written_cond:
+            self.written_cond.notify_all()
+
+    def flush(self, timeout=None):
+        """ Wait till all messages queued so far are written
+        :timeout: maximum wait, in seconds default: no limit
+        :returns: True if all were written
+        """
+        mark = FlushMark()
+        self.log_queue.append(mark)
+        self.wake.set()
+        t_end = None if timeout is None else time.time() + timeout
+        while not mark.written.is_set():
+            if not self.writer_thread.is_alive():
+                return all(isinstance(entry, FlushMark)
+                           for entry in list(self.log_queue))
+            wait = self.full_wait
+            if t_end is not None:
+                wait = min(wait, t_end - time.time())
+                if wait <= 0:
+                    return False
+            mark.written.wait(wait)
+        return True
+
+    def close(self, timeout=5.):
+        """ Write out all queued messages, stop writer thread
+        Leaves log_writer open - owned by caller
+        :timeout: maximum wait, in seconds default: 5
+        """
+        if self.closed:
+            return
+
+        self.closed = True
+        self.wake.set()
+        self.writer_thread.join(timeout)
+
+    def get_stats(self):
+        """ Get counts
+        :returns: dictionary of counts
+        """
+        n_written = self.n_written
+        n_pending = sum(1 for entry in list(self.log_queue)
+                        if not isinstance(entry, FlushMark))
+        return dict(queued=n_written + n_pending, written=n_written,
+                    dropped=self.n_dropped, flushes=self.n_flushes,
+                    pending=n_pending)
@@ -19,6 +19,7 @@ from crs_funs import str2bool, str2val
 from select_error import SelectError
 from select_report import SelectReport
 from java_properties import JavaProperties
+from select_log_sink import SelectLogSink
 
 """
 Facilitate execution tracing / logging of execution.
@@ -45,6 +46,8 @@ class SlTrace:
     started = False     # Set True when logging is started
     closed = False      # Set True when log file is closed
     logWriter = None
+    logSink = None      # SelectLogSink if queued (background) log writing
+    logSinkArgs = None  # SelectLogSink args, set by setLogSink
     logToScreen = True # true - log, additionally to STDOUT
     stdOutHasTs = False # true - timestamp prefix on STDOUT
     lgsString = "" # Staging area for lgs, lgln
@@ -62,6 +65,7 @@ class SlTrace:
     mw = None                       # Master window widget, if one
     mw_standalone = False           # Set True if we're responsible for cleanup
     all_quiet = False               # Eliminate all trace flagged output
+    flag_names = {}                 # Parsed trace_flag strings, see enabled
     start_time = datetime.now()     # Starting time
     
     @classmethod
@@ -311,6 +315,8 @@ class SlTrace:
             abs_logName = os.path.abspath(cls.logName)
             fw = open(abs_logName, "w", encoding="utf-8")
             cls.logWriter = fw
+            if cls.logSinkArgs is not None:
+                cls.logSink = SelectLogSink(fw, **cls.logSinkArgs)
         except IOError as e:
             print("Can't open logWriter %s - %s" % (abs_logName, e))
             sys.exit(1)
@@ -321,6 +327,55 @@ class SlTrace:
 
         return fw
 
+    @classmethod
+    def setLogSink(cls, queued=True, record_format="text",
+                   max_queue=10000, flush_lines=500, flush_interval=.5,
+                   drop_when_full=False):
+        """ Setup queued (background thread) log writing
+        instead of writing and flushing each lg line.
+        Queued lines are written out by flushLog and onexit.
+        :queued: True - use queued writing
+                False - stop queued writing, back to direct writing
+        :record_format: "text" - usual log lines
+                "jsonl" - JSON record per line, see select_log_sink
+                        log file extension is "jsonl" if log not yet
+                        started
+        :max_queue, flush_lines, flush_interval, drop_when_full:
+                see SelectLogSink
+        """
+        if cls.logSink is not None:
+            cls.logSink.close()
+            cls.logSink = None
+        if not queued:
+            cls.logSinkArgs = None
+            return
+        
+        cls.logSinkArgs = dict(record_format=record_format,
+                               max_queue=max_queue, flush_lines=flush_lines,
+                               flush_interval=flush_interval,
+                               drop_when_full=drop_when_full)
+        if not cls.started:
+            if record_format == "jsonl":
+                cls.logExt = "jsonl"
+            cls.setupLogging()      # Starts logSink
+            return
+        
+        if cls.logWriter is None or cls.closed:
+            return
+        
+        cls.logSink = SelectLogSink(cls.logWriter, **cls.logSinkArgs)
+
+    @classmethod
+    def flushLog(cls, timeout=None):
+        """ Write out any queued log lines
+        :timeout: maximum wait, in seconds default: no limit
+        :returns: True if all were written
+        """
+        if cls.logSink is not None:
+            return cls.logSink.flush(timeout=timeout)
+        
+        return True
+
     @classmethod
     def set_mw(cls, mw):
         """ Set tk to support gui
@@ -374,13 +429,20 @@ class SlTrace:
                         default: ???, None: no replacement
         @throws IOException
        
-        @throws IOException
+        msg may be a callable, returning the message, so that
+        expensive formatting is only done if trace_flag is enabled e.g.
+            SlTrace.lg(lambda: f"cells: {cells}", "cell_specs")
         """
-        if cls.all_quiet and trace_flag is not None:
-            return
-        
-        if not SlTrace.trace(trace_flag, level):
-            return
+        if trace_flag is not None:
+            if level == 1:
+                if not cls.enabled(trace_flag):
+                    return
+            
+            elif cls.all_quiet or not SlTrace.trace(trace_flag, level):
+                return
+
+        if callable(msg):
+            msg = msg()
 
         try:
             cls.setupLogging()
@@ -388,23 +450,31 @@ class SlTrace:
             print("IOException in lg setupLogging")
             return
         if dp is None:
-            if SlTrace.trace("decpl"):
+            if cls.enabled("decpl"):
                 dp = 3          # Set loging ts decimal places
             else:
                 dp = cls.decpl 
-        ts = cls.getTs(dp=dp)
+        ts = None                   # Formatted when needed
+        if cls.logSink is None:     # logSink formats its own
+            ts = cls.getTs(dp=dp)
         if to_stdout is None:
             to_stdout = cls.logToScreen
+        stdout_str = None           # Set if queued for logSink
         if to_stdout:
             prefix = ""
-            if cls.stdOutHasTs or SlTrace.trace("stdOutHasTs"):
+            if cls.stdOutHasTs or cls.enabled("stdOutHasTs"):
+                if ts is None:
+                    ts = cls.getTs(dp=dp)
                 prefix += " " + ts
             try:
                 msg_str = prefix + " " + str(msg)
-                if replace_non_ascii is not None:
+                if replace_non_ascii is not None and not msg_str.isascii():
                     msg_str = cls.remove_non_ascii(msg_str, replace_non_ascii)
-                print(msg_str)
-                sys.stdout.flush()   # Force output
+                if cls.logSink is not None:
+                    stdout_str = msg_str    # Printed by writer thread
+                else:
+                    print(msg_str)
+                    sys.stdout.flush()   # Force output
             except:
                 try:
                     print("Unexpected error in", str(msg_str))
@@ -422,16 +492,26 @@ class SlTrace:
         if cls.closed:
             return
         
+        if cls.logSink is not None:
+            msg = str(msg)
+            if (cls.logSink.record_format == "text"
+                    and replace_non_ascii is not None and not msg.isascii()):
+                msg = cls.remove_non_ascii(msg, replace_non_ascii)
+            cls.logSink.write(msg, trace_flag=trace_flag, dp=dp,
+                              has_ts=not cls.enabled("no_ts"),
+                              stdout_str=stdout_str)
+            return
+        
         if cls.logWriter is None:
             print("Can't write to log file")
             return
 
         try:
             out_str = ""
-            if not cls.trace("no_ts"):
+            if not cls.enabled("no_ts"):
                 out_str += " "+ts
             out_str += msg
-            if replace_non_ascii is not None:
+            if replace_non_ascii is not None and not out_str.isascii():
                 out_str = cls.remove_non_ascii(out_str, replace_non_ascii)
             print(out_str, file=cls.logWriter)
             cls.logWriter.flush()    # Force output
@@ -638,6 +718,9 @@ class SlTrace:
                 abs_logName = os.path.abspath(cls.logName)
                 cls.lg("Closing log file %s"
                     % abs_logName)
+                if cls.logSink is not None:
+                    cls.logSink.close()     # Write out queued lines
+                    cls.logSink = None
                 cls.logWriter.close()
                 cls.closed = True
                 cls.logWriter = None        # Flag as not available
@@ -1036,6 +1119,52 @@ class SlTrace:
 
         return fv
 
+    @classmethod
+    def enabled(cls, flag=None):
+        """ Fast check if trace flag is on, for use before
+        building expensive trace output e.g.
+            if SlTrace.enabled("canvas_items"):
+                SlTrace.lg(f"...")
+        :flag: trace flag string, may be comma separated
+                e.g. "cell_specs,rpc" - True if any is on
+                default: pass (return True)
+        :returns: True if flag is on (non-zero value)
+        """
+        if flag is None:
+            return True
+        
+        if cls.all_quiet:
+            return False
+        
+        names = cls.flag_names.get(flag)
+        if names is None:
+            names = cls.parse_flag(flag)
+        trace_flags = cls.traceFlags
+        for name in names:
+            if trace_flags.get(name):
+                return True
+            
+        return False
+
+    @classmethod
+    def parse_flag(cls, flag):
+        """ Parse, record and cache trace flag string
+        Done once per flag string, so enabled need
+        not recordTraceFlag on each check
+        :flag: trace flag string e.g. "rpc" or "cell_specs,rpc"
+        :returns: tuple of flag names to check
+        """
+        whole = flag.lower()
+        parts = [part.strip() for part in whole.split(",")]
+        parts = [part for part in parts if part != ""]
+        for part in parts:
+            cls.recordTraceFlag(part)
+            if part not in cls.traceFlags:
+                cls.traceFlags[part] = False
+        names = tuple(dict.fromkeys([whole] + parts))   # whole, as before
+        cls.flag_names[flag] = names
+        return names
+
     @classmethod
     def traceButton(cls, flag, command):
         """ Setup method to be called when button works
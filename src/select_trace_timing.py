@@ -0,0 +1,121 @@
+# select_trace_timing.py  18Oct2026  crs, Author
+""" Overhead of disabled trace points, nanoseconds per call:
+    before: eager f-string + SlTrace.trace check (previous lg)
+    after:  lg with eager f-string, lg with lambda message,
+            SlTrace.enabled guard, comma separated flags
+Overhead of enabled trace points, log file only and with STDOUT
+echo (to os.devnull):
+    direct (write + flush each line) vs queued (SlTrace.setLogSink)
+Checks that queued is cheaper, for the caller, than direct.
+Usage: python select_trace_timing.py [--ncalls N] [--record_format text|jsonl]
+"""
+import argparse
+import contextlib
+import os
+import sys
+import time
+
+from select_trace import SlTrace
+
+def time_loop(fun, ncalls):
+    """ Time fun(i) over ncalls
+    :returns: nanoseconds per call
+    """
+    t_beg = time.perf_counter()
+    for i in range(ncalls):
+        fun(i)
+    return (time.perf_counter() - t_beg)*1e9/ncalls
+
+def lg_before(msg, trace_flag):
+    """ Previous lg's disabled trace check
+    """
+    if SlTrace.all_quiet and trace_flag is not None:
+        return
+
+    if not SlTrace.trace(trace_flag, 1):
+        return
+
+cells = [(ix, iy) for ix in range(4) for iy in range(3)]
+def noop(i):
+    pass
+
+def eager_before(i):
+    lg_before(f"    {i}: cells: {cells}", "timing_flag")
+
+def eager_lg(i):
+    SlTrace.lg(f"    {i}: cells: {cells}", "timing_flag")
+
+def lazy_lg(i):
+    SlTrace.lg(lambda: f"    {i}: cells: {cells}", "timing_flag")
+
+def enabled_guard(i):
+    if SlTrace.enabled("timing_flag"):
+        SlTrace.lg(f"    {i}: cells: {cells}")
+
+def multi_flag_lg(i):
+    SlTrace.lg(lambda: f"    {i}: cells: {cells}", "timing_flag,timing_flag2")
+
+def enabled_lg(i):
+    SlTrace.lg(f"    {i}: cells: {cells}", "timing_on", to_stdout=False)
+
+def enabled_echo_lg(i):
+    SlTrace.lg(f"    {i}: cells: {cells}", "timing_on", to_stdout=True)
+
+def time_enabled(fun, ncalls, record_format):
+    """ Time enabled trace point, direct then queued
+    :returns: (direct, queued, queued till written) nsec per call
+    """
+    SlTrace.setLogSink(queued=False)
+    nsec_direct = time_loop(fun, ncalls)
+    SlTrace.setLogSink(record_format=record_format)
+    t_beg = time.perf_counter()
+    nsec_queued = time_loop(fun, ncalls)
+    SlTrace.flushLog()
+    nsec_written = (time.perf_counter() - t_beg)*1e9/ncalls
+    SlTrace.setLogSink(queued=False)
+    return nsec_direct, nsec_queued, nsec_written
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--ncalls', type=int, dest='ncalls', default=200000)
+    parser.add_argument('--record_format', dest='record_format', default="text")
+    args = parser.parse_args()
+    SlTrace.clearFlags()
+    SlTrace.setLevel("timing_flag", False)
+    SlTrace.setLevel("timing_flag2", False)
+
+    timings = [("empty function",               noop),
+               ("before, eager f-string",       eager_before),
+               ("lg, eager f-string",           eager_lg),
+               ("lg, lambda message",           lazy_lg),
+               ("enabled guard",                enabled_guard),
+               ("lg, lambda, two flags",        multi_flag_lg),
+               ]
+    SlTrace.lg(f"disabled trace point, nsec per call ({args.ncalls} calls)",
+               to_stdout=True)
+    for desc, fun in timings:
+        nsec = time_loop(fun, args.ncalls)
+        SlTrace.lg(f"    {desc:24} {nsec:8.0f}", to_stdout=True)
+
+    SlTrace.setLevel("timing_on", True)
+    n_enabled = args.ncalls//10
+    failed = False
+    for desc, fun in [("log file", enabled_lg),
+                      ("log file + STDOUT", enabled_echo_lg)]:
+        with open(os.devnull, "w") as devnull:
+            with contextlib.redirect_stdout(devnull):
+                nsec_direct, nsec_queued, nsec_written = time_enabled(
+                                    fun, n_enabled, args.record_format)
+        SlTrace.lg(f"enabled trace point, {desc}, nsec per call"
+                   f" ({n_enabled} calls)", to_stdout=True)
+        SlTrace.lg(f"    {'direct':24} {nsec_direct:8.0f}", to_stdout=True)
+        SlTrace.lg(f"    {'queued':24} {nsec_queued:8.0f}", to_stdout=True)
+        SlTrace.lg(f"    {'queued, till written':24} {nsec_written:8.0f}",
+                   to_stdout=True)
+        if nsec_queued >= nsec_direct:
+            SlTrace.lg(f"    {desc}: queued not cheaper than direct",
+                       to_stdout=True)
+            failed = True
+    SlTrace.lg("check " + ("FAILED" if failed else "passed"), to_stdout=True)
+    SlTrace.onexit()
+    sys.exit(1 if failed else 0)
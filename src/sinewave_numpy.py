@@ -3,16 +3,116 @@
     Not a direct substitute but for lower level operations
 """
 import time
-import copy
+from collections import OrderedDict
+from threading import Lock
 import numpy as np
 import sounddevice as sd
 from pysinewave import utilities
 
 from select_trace import SlTrace
 
+
+class ToneWaveformCache:
+    """ LRU cache of base (mono, unattenuated) sine waveforms
+    keyed by (pitch, duration, sample_rate).  Pitches come from a
+    small color palette and durations from a few settings, so
+    most tones are repeats.
+    Cached arrays are read-only - shared by all users.
+    """
+    def __init__(self, max_entries=256, max_bytes=64*2**20):
+        """ Setup cache
+        :max_entries: maximum number of waveforms default: 256
+        :max_bytes: maximum total waveform bytes default: 64MB
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.waveforms = OrderedDict()  # by key, most recent last
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = Lock()
+
+    def get_base(self, pitch, duration, sample_rate):
+        """ Get base waveform, calculating if not cached
+        :pitch: user tone level
+        :duration: seconds
+        :sample_rate: samples per second
+        :returns: read-only 1-D ndarray of samples
+        """
+        key = (pitch, duration, sample_rate)
+        with self.lock:
+            base_waveform = self.waveforms.get(key)
+            if base_waveform is not None:
+                self.waveforms.move_to_end(key)
+                self.hits += 1
+                return base_waveform
+            
+            self.misses += 1
+        freq_hz = utilities.pitch_to_frequency(pitch)
+        # NumpPy magic to calculate the waveform
+        each_sample_number = np.arange(duration * sample_rate)
+        base_waveform = np.sin(2 * np.pi * each_sample_number * freq_hz / sample_rate)
+        base_waveform.flags.writeable = False
+        if base_waveform.nbytes > self.max_bytes:
+            return base_waveform        # Too big to keep
+        
+        with self.lock:
+            if key not in self.waveforms:
+                self.waveforms[key] = base_waveform
+                self.nbytes += base_waveform.nbytes
+            while (len(self.waveforms) > self.max_entries
+                    or self.nbytes > self.max_bytes):
+                _, old_waveform = self.waveforms.popitem(last=False)
+                self.nbytes -= old_waveform.nbytes
+                self.evictions += 1
+        return base_waveform
+
+    def set_limits(self, max_entries=None, max_bytes=None):
+        """ Change cache limits, evicting as needed
+        :max_entries: maximum number of waveforms default: no change
+        :max_bytes: maximum total bytes default: no change
+        """
+        with self.lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            while (len(self.waveforms) > self.max_entries
+                    or self.nbytes > self.max_bytes):
+                _, old_waveform = self.waveforms.popitem(last=False)
+                self.nbytes -= old_waveform.nbytes
+                self.evictions += 1
+
+    def clear(self):
+        """ Remove all cached waveforms, keeping stats
+        """
+        with self.lock:
+            self.waveforms.clear()
+            self.nbytes = 0
+
+    def get_stats(self):
+        """ Get cache statistics
+        :returns: dictionary of entries, bytes, hits, misses, evictions
+        """
+        with self.lock:
+            return dict(entries=len(self.waveforms), nbytes=self.nbytes,
+                        hits=self.hits, misses=self.misses,
+                        evictions=self.evictions)
+
+
 class SineWaveNumPy:
     """ Gathers and plays stereo sine wave
     """
+    waveform_cache = ToneWaveformCache()    # Shared base waveforms
+    
+    @classmethod
+    def get_cache_stats(cls):
+        """ Get base waveform cache statistics
+        :returns: dictionary - see ToneWaveformCache.get_stats
+        """
+        return cls.waveform_cache.get_stats()
+    
     @classmethod
     def concatinate(cls, sinewave_nps):
         """ Concatinate a list of SineWaveNumPy wave forms
@@ -26,7 +126,82 @@ class SineWaveNumPy:
         swnp = SineWaveNumPy(wf_ndarr=wfc_ndarr, sample_rate=sample_rate,
                            duration=duration)
         return swnp
-        
+
+    @classmethod
+    def synthesize_path(cls, pitches, durations,
+                        decibels_left, decibels_right,
+                        sample_rate=44100, crossfade=.002):
+        """ Create one stereo waveform for a sequence of tones
+        (e.g. a scan path) in a single NumPy pass.
+        Phase is continuous across tone boundaries and the
+        left/right amplitudes ramp over crossfade seconds,
+        avoiding the clicks of concatenated separate tones.
+        Samples are float32, half the memory of separate tones.
+        :pitches: tone pitches, one per tone
+        :durations: tone durations (seconds), one per tone
+        :decibels_left: left volumes (decibels), one per tone
+        :decibels_right: right volumes (decibels), one per tone
+        :sample_rate: samples per second default: 44100
+        :crossfade: amplitude ramp (seconds) between tones
+                default: .002, 0: no ramp
+        :returns: SineWaveNumPy waveform
+        """
+        durations = np.asarray(durations, dtype=float)
+        duration = float(durations.sum())
+        # Same per tone length as individual tones: len(arange(dur*rate))
+        counts = np.ceil(durations*sample_rate).astype(int)
+        playing = counts > 0
+        counts = counts[playing]
+        if len(counts) == 0:
+            return SineWaveNumPy(wf_ndarr=np.zeros((0,2)),
+                                 sample_rate=sample_rate, duration=duration)
+
+        freqs_hz = utilities.pitch_to_frequency(
+                                np.asarray(pitches, dtype=float)[playing])
+        omegas = 2 * np.pi * freqs_hz / sample_rate     # radians per sample
+        attens = np.column_stack((
+            utilities.decibels_to_amplitude_ratio(
+                        np.asarray(decibels_left, dtype=float)[playing]),
+            utilities.decibels_to_amplitude_ratio(
+                        np.asarray(decibels_right, dtype=float)[playing])))
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        n_sample = int(counts.sum())
+        # Each tone starts at the phase the previous tone ended with
+        phase_ends = np.cumsum(omegas*counts) % (2*np.pi)
+        start_phases = np.concatenate(([0.], phase_ends[:-1]))
+
+        # sin(phase+omega*n) = sin(phase)*cos(omega*n) + cos(phase)*sin(omega*n)
+        # so tones of the same pitch and length share one sin, cos table
+        base_waveform = np.empty(n_sample, dtype=np.float32)
+        tone_keys, key_index = np.unique(np.column_stack((omegas, counts)),
+                                         axis=0, return_inverse=True)
+        key_index = key_index.ravel()
+        for ik, (omega, count) in enumerate(tone_keys):
+            tone_ixs = np.nonzero(key_index == ik)[0]
+            each_sample_number = np.arange(int(count))
+            sin_table = np.sin(omega * each_sample_number).astype(np.float32)
+            cos_table = np.cos(omega * each_sample_number).astype(np.float32)
+            tone_phases = start_phases[tone_ixs][:, np.newaxis].astype(np.float32)
+            sample_ixs = starts[tone_ixs][:, np.newaxis] + each_sample_number
+            base_waveform[sample_ixs] = (np.sin(tone_phases)*cos_table
+                                         + np.cos(tone_phases)*sin_table)
+
+        sample_attens = np.repeat(attens.astype(np.float32), counts, axis=0)
+        # Linear left/right amplitude ramps across volume changes
+        n_fade = min(int(crossfade*sample_rate), int(counts.min()))
+        changes = np.nonzero(np.any(attens[1:] != attens[:-1], axis=1))[0] + 1
+        if n_fade > 1 and len(changes) > 0:
+            fade_offsets = np.arange(n_fade) - n_fade//2
+            fade_fracs = ((np.arange(n_fade) + .5)/n_fade)[np.newaxis, :, np.newaxis]
+            fade_ixs = starts[changes][:, np.newaxis] + fade_offsets
+            atten_prev = attens[changes-1][:, np.newaxis, :]
+            atten_next = attens[changes][:, np.newaxis, :]
+            sample_attens[fade_ixs] = atten_prev + (atten_next-atten_prev)*fade_fracs
+        wf_ndarr = sample_attens
+        wf_ndarr *= base_waveform[:, np.newaxis]     # In place, stereo
+        return SineWaveNumPy(wf_ndarr=wf_ndarr, sample_rate=sample_rate,
+                             duration=duration)
+
     def __init__(self, pitch=0, decibels_left=0, decibels_right=0,
                 sample_rate=44100, duration=None, delay=None,
                 wf_ndarr=None):
@@ -45,7 +220,6 @@ class SineWaveNumPy:
             self.delay = delay
             
         else:
-            freq_hz = utilities.pitch_to_frequency(pitch)
             atten_left = utilities.decibels_to_amplitude_ratio(decibels_left) 
             atten_right = utilities.decibels_to_amplitude_ratio(decibels_right) 
             self.sample_rate = sample_rate
@@ -54,13 +228,11 @@ class SineWaveNumPy:
                 duration = .1
             self.duration = duration
             self.delay = delay
-            # NumpPy magic to calculate the waveform
-            each_sample_number = np.arange(duration * sample_rate)
-            base_waveform = np.sin(2 * np.pi * each_sample_number * freq_hz / sample_rate)
-            left_waveform = base_waveform.reshape(-1,1)*atten_left
-            right_waveform = base_waveform.reshape(-1,1)*atten_right
-            wf_ndarr = np.hstack((left_waveform, right_waveform))
-            self.wf_ndarr = copy.deepcopy(wf_ndarr)
+            base_waveform = self.waveform_cache.get_base(pitch=pitch,
+                                    duration=duration, sample_rate=sample_rate)
+            # Broadcast to (nsample, 2) left, right - a new array
+            self.wf_ndarr = base_waveform[:, np.newaxis] * np.array(
+                                                    [atten_left, atten_right])
         
     def play(self):
         """ Start playing tone
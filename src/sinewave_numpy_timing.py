@@ -0,0 +1,84 @@
+# sinewave_numpy_timing.py  18Oct2026  crs, Author
+""" Combined scan waveform creation time, full area scan
+    before: SineWaveNumPy per cell + SineWaveNumPy.concatinate
+            (base waveform cache disabled, as before the cache)
+    cached: same, with base waveform cache
+    after:  SineWaveNumPy.synthesize_path - one pass
+Usage: python sinewave_numpy_timing.py [--ncols N] [--nrows N] [--repeat N]
+"""
+import argparse
+import math
+import random
+import time
+
+from select_trace import SlTrace
+from sinewave_numpy import SineWaveNumPy
+
+def make_scan_path(ncols, nrows, cell_time=.1, space_time=.1):
+    """ Scan path like AdwScanner: alternating rows,
+    ~1/3 cells drawn with a small color pitch palette
+    :returns: pitches, durations, vols_left, vols_right lists
+    """
+    palette = [-4, -2, 0, 2, 4, 6, 8]       # Drawn colors
+    space_pitch = -10
+    random.seed(1)
+    pitches, durations, vols_left, vols_right = [], [], [], []
+    for iy in range(nrows):
+        ixs = range(ncols) if iy%2 == 0 else range(ncols-1, -1, -1)
+        for ix in ixs:
+            if random.random() < .33:
+                pitches.append(random.choice(palette))
+                durations.append(cell_time)
+            else:
+                pitches.append(space_pitch)
+                durations.append(space_time)
+            dist = math.sqrt((ix-ncols/2)**2 + (iy-nrows)**2)
+            vol = 2*(10-dist*.5)
+            vols_left.append(vol*(ncols-ix)/ncols - 100*ix/ncols)
+            vols_right.append(vol*ix/ncols - 100*(ncols-ix)/ncols)
+    return pitches, durations, vols_left, vols_right
+
+def per_cell_wave(path):
+    swnps = [SineWaveNumPy(pitch=pitch, duration=dur,
+                           decibels_left=vol_l, decibels_right=vol_r)
+             for pitch, dur, vol_l, vol_r in zip(*path)]
+    return SineWaveNumPy.concatinate(swnps)
+
+def uncached_wave(path):
+    cache = SineWaveNumPy.waveform_cache
+    max_entries = cache.max_entries
+    cache.set_limits(max_entries=0)     # Recalculate each tone
+    swnp = per_cell_wave(path)
+    cache.set_limits(max_entries=max_entries)
+    return swnp
+
+def path_wave(path):
+    pitches, durations, vols_left, vols_right = path
+    return SineWaveNumPy.synthesize_path(pitches=pitches, durations=durations,
+                                         decibels_left=vols_left,
+                                         decibels_right=vols_right)
+
+def time_wave(fun, path, repeat):
+    """ :returns: (seconds per call, SineWaveNumPy)
+    """
+    t_beg = time.perf_counter()
+    for _ in range(repeat):
+        swnp = fun(path)
+    return (time.perf_counter()-t_beg)/repeat, swnp
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--ncols', type=int, dest='ncols', default=40)
+    parser.add_argument('--nrows', type=int, dest='nrows', default=25)
+    parser.add_argument('--repeat', type=int, dest='repeat', default=5)
+    args = parser.parse_args()
+    path = make_scan_path(args.ncols, args.nrows)
+    SlTrace.lg(f"{args.ncols}x{args.nrows} scan, {len(path[0])} cells,"
+               f" msec per waveform", to_stdout=True)
+    for desc, fun in [("before, per cell", uncached_wave),
+                      ("per cell, cached", per_cell_wave),
+                      ("synthesize_path", path_wave)]:
+        t_per, swnp = time_wave(fun, path, args.repeat)
+        SlTrace.lg(f"    {desc:20} {t_per*1000:8.1f}"
+                   f"  samples: {swnp.wf_ndarr.shape[0]}", to_stdout=True)
+    SlTrace.lg(f"cache: {SineWaveNumPy.get_cache_stats()}", to_stdout=True)
@@ -0,0 +1,173 @@
+#speaker_cmd_queue.py  18Oct2026  crs, Author
+"""
+Thread safe speaker command queue with supersede and priority
+
+Commands (e.g. SpeakerControlCmd) may have:
+    key: commands with the same key replace one another -
+        putting a command removes queued commands with its key,
+        except those of the same group
+    group: commands of one group (e.g. the tones of one position
+        report) do not replace one another
+        default: each command is its own group
+    priority: higher priority commands are got first, FIFO within
+        a priority default: 0
+
+Queue wait time (put to get) is recorded per command class,
+so responsiveness can be measured.
+"""
+from collections import deque
+import threading
+import time
+
+
+class SpeakerCmdQueue:
+
+    def __init__(self, maxsize=0, use_priority=True, on_drop=None,
+                 cmd_class=None):
+        """ Setup empty queue
+        :maxsize: maximum entries, when full the oldest of the lowest
+                priority entries is dropped 0 - no limit default: 0
+        :use_priority: True - get by priority, else FIFO default: True
+        :on_drop: function(cmd, reason) called for superseded or
+                dropped command default: no call
+        :cmd_class: function(cmd) returning class name for stats
+                default: cmd.cmd_type
+        """
+        self.maxsize = maxsize
+        self.use_priority = use_priority
+        self.on_drop = on_drop
+        if cmd_class is None:
+            cmd_class = lambda cmd: getattr(cmd, "cmd_type", None)
+        self.cmd_class = cmd_class
+        self.queues = {}            # deque of (put time, cmd) by priority
+        self.n_entries = 0
+        self.cond = threading.Condition()
+        self.stats = {}             # by class: dict of counts, wait times
+
+    @staticmethod
+    def get_cmd_priority(cmd):
+        priority = getattr(cmd, "priority", None)
+        return 0 if priority is None else priority
+
+    def qsize(self):
+        return self.n_entries
+
+    def put(self, cmd):
+        """ Queue command, superseding queued commands with its key
+        :cmd: command
+        """
+        dropped = []
+        with self.cond:
+            key = getattr(cmd, "key", None)
+            if key is not None:
+                dropped += [(old, "superseded")
+                            for old in self.remove_key(key,
+                                            getattr(cmd, "group", None))]
+            priority = self.get_cmd_priority(cmd) if self.use_priority else 0
+            self.queues.setdefault(priority, deque()).append(
+                                                    (time.time(), cmd))
+            self.n_entries += 1
+            while self.maxsize > 0 and self.n_entries > self.maxsize:
+                dropped.append((self.pop_entry(lowest=True)[1], "dropped"))
+            for old, reason in dropped:
+                self.get_class_stats(old)["n_" + reason] += 1
+            self.cond.notify()
+        if self.on_drop is not None:
+            for old, reason in dropped:
+                self.on_drop(old, reason)
+
+    def remove_key(self, key, group=None):
+        """ Remove queued commands with key, not in group
+        Caller holds self.cond
+        :returns: list of removed commands
+        """
+        removed = []
+        for queue in self.queues.values():
+            keep = deque()
+            for entry in queue:
+                cmd = entry[1]
+                if (getattr(cmd, "key", None) == key
+                        and (group is None
+                             or getattr(cmd, "group", None) != group)):
+                    removed.append(cmd)
+                else:
+                    keep.append(entry)
+            if len(keep) != len(queue):
+                queue.clear()
+                queue.extend(keep)
+        self.n_entries -= len(removed)
+        return removed
+
+    def pop_entry(self, lowest=False):
+        """ Remove next entry, caller holds self.cond
+        :lowest: True - oldest of lowest priority
+                default: oldest of highest priority
+        :returns: (put time, cmd)
+        """
+        for priority in sorted(self.queues, reverse=not lowest):
+            queue = self.queues[priority]
+            if queue:
+                self.n_entries -= 1
+                return queue.popleft()
+
+        raise IndexError("pop from empty SpeakerCmdQueue")
+
+    def get(self, block=True, timeout=None):
+        """ Get next command, waiting if empty
+        :block: wait if empty default: True
+        :timeout: maximum wait if blocking default: no limit
+        :returns: command
+        :raises: IndexError if empty and not waiting
+        """
+        with self.cond:
+            if block:
+                if not self.cond.wait_for(lambda: self.n_entries > 0,
+                                          timeout=timeout):
+                    raise IndexError("SpeakerCmdQueue get timeout")
+            put_time, cmd = self.pop_entry()
+            self.count_wait(cmd, time.time() - put_time)
+        return cmd
+
+    def clear(self):
+        """ Remove all entries
+        :returns: list of removed commands, in get order
+        """
+        removed = []
+        with self.cond:
+            while self.n_entries > 0:
+                removed.append(self.pop_entry()[1])
+        return removed
+
+    def get_class_stats(self, cmd):
+        cls = self.cmd_class(cmd)
+        stats = self.stats.get(cls)
+        if stats is None:
+            stats = self.stats[cls] = dict(n_got=0, wait_total=0.,
+                                           wait_max=0., n_superseded=0,
+                                           n_dropped=0)
+        return stats
+
+    def count_wait(self, cmd, wait):
+        stats = self.get_class_stats(cmd)
+        stats["n_got"] += 1
+        stats["wait_total"] += wait
+        stats["wait_max"] = max(stats["wait_max"], wait)
+
+    def get_stats(self):
+        """ Get queue statistics by command class
+        :returns: dictionary by class of dictionary:
+                    n_got, wait_avg, wait_max (seconds),
+                    n_superseded, n_dropped
+        """
+        stats = {}
+        with self.cond:
+            class_stats = [(cls, dict(cls_stats))
+                           for cls, cls_stats in self.stats.items()]
+        for cls, cls_stats in class_stats:
+            n_got = cls_stats["n_got"]
+            stats[cls] = dict(n_got=n_got,
+                    wait_avg=cls_stats["wait_total"]/n_got if n_got else 0.,
+                    wait_max=cls_stats["wait_max"],
+                    n_superseded=cls_stats["n_superseded"],
+                    n_dropped=cls_stats["n_dropped"])
+        return stats
@@ -0,0 +1,205 @@
+#speech_clip_cache.py  18Oct2026  crs, Author
+"""
+Rendered speech clips for repeated announcements
+
+Position reports repeat a small vocabulary: row/column numbers,
+color names, "blank"...  Each word (phrase) is rendered once, by
+a speech engine's save_to_file in a background SpeechWorker, to
+a wav file in the cache directory.  Clips are kept in memory
+(LRU) as float32 stereo samples ready for AudioOutputStream.play.
+
+A message is available when all its words are rendered; the clips
+are concatenated, with a short gap.  Otherwise None is returned,
+the caller speaks the message as before, and the missing words
+are rendered for next time.
+"""
+from collections import OrderedDict
+import hashlib
+import os
+import re
+import tempfile
+import wave
+
+import numpy as np
+
+from select_trace import SlTrace
+from speech_maker_cmd import SpeechMakerCmd
+from pyttsx_proc import SpeechWorker
+
+
+class SpeechClipCache:
+    GAP = .06           # Silence between phrases, seconds
+    TRIM_LEVEL = .01    # Leading/trailing samples below are trimmed
+
+    def __init__(self, cache_dir=None, sample_rate=44100,
+                 max_entries=256, engine_factory=None):
+        """ Setup cache
+        :cache_dir: directory for rendered wav files
+                default: speech_clip_cache in temp directory
+        :sample_rate: clip sample rate, e.g. AudioOutputStream's
+                default: 44100
+        :max_entries: maximum number of clips in memory
+                default: 256
+        :engine_factory: speech engine factory for SpeechWorker
+                default: pyttsxN.init
+        """
+        if cache_dir is None:
+            cache_dir = os.path.join(tempfile.gettempdir(),
+                                     "speech_clip_cache")
+        os.makedirs(cache_dir, exist_ok=True)
+        self.cache_dir = cache_dir
+        self.sample_rate = sample_rate
+        self.max_entries = max_entries
+        self.engine_factory = engine_factory
+        self.clips = OrderedDict()      # by key, most recent last
+        self.pending = set()            # keys being rendered
+        self.failed = set()             # keys which can't be loaded
+        self.worker = None              # Rendering SpeechWorker
+        self.hits = 0
+        self.misses = 0
+        self.n_renders = 0
+
+    @staticmethod
+    def split_phrases(msg):
+        """ Split message into phrases
+        :msg: message text
+        :returns: list of phrases (words, lower case)
+        """
+        return re.findall(r"[\w'&]+", msg.lower())
+
+    def clip_file(self, key):
+        """ Get wav file name for clip
+        """
+        phrase, rate = key
+        digest = hashlib.md5(f"{phrase}|{rate}".encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.wav")
+
+    def get_waveform(self, msg, rate=None, volume=None):
+        """ Get message samples, if all phrases are rendered
+        :msg: message text
+        :rate: speech rate default: SpeechMakerCmd default
+        :volume: volume (0-1) default: SpeechMakerCmd default
+        :returns: ndarray (nframes, 2) float32 or None
+                if not available (missing phrases are requested)
+        """
+        default_cmd = SpeechMakerCmd(rate=rate, volume=volume)
+        phrases = self.split_phrases(msg)
+        if len(phrases) == 0:
+            return None
+
+        clips = []
+        missing = []
+        for phrase in phrases:
+            key = (phrase, default_cmd.rate)
+            clip = self.get_clip(key)
+            if clip is None:
+                missing.append(key)
+            else:
+                clips.append(clip)
+        if missing:
+            self.misses += 1
+            for key in missing:
+                self.request_render(key)
+            return None
+
+        self.hits += 1
+        gap = np.zeros((int(self.GAP*self.sample_rate), 2), dtype=np.float32)
+        parts = []
+        for clip in clips:
+            if parts:
+                parts.append(gap)
+            parts.append(clip)
+        return np.concatenate(parts)*np.float32(default_cmd.volume)
+
+    def get_clip(self, key):
+        """ Get clip from memory, else disk
+        :key: clip key (phrase, rate)
+        :returns: ndarray, None if not rendered
+        """
+        clip = self.clips.get(key)
+        if clip is not None:
+            self.clips.move_to_end(key)
+            return clip
+
+        if key in self.failed:
+            return None
+
+        file_name = self.clip_file(key)
+        if not os.path.exists(file_name):
+            return None
+
+        self.pending.discard(key)
+        try:
+            clip = self.load_wav(file_name)
+        except Exception as e:
+            SlTrace.lg(f"SpeechClipCache: can't load {key} {file_name}: {e}")
+            self.failed.add(key)
+            return None
+
+        self.clips[key] = clip
+        while len(self.clips) > self.max_entries:
+            self.clips.popitem(last=False)
+        return clip
+
+    def load_wav(self, file_name):
+        """ Load wav file as trimmed stereo float32 at our sample rate
+        :file_name: wav file
+        :returns: ndarray (nframes, 2)
+        """
+        with wave.open(file_name, "rb") as wf:
+            n_channels = wf.getnchannels()
+            samp_width = wf.getsampwidth()
+            file_rate = wf.getframerate()
+            frames = wf.readframes(wf.getnframes())
+        if samp_width == 1:
+            samples = (np.frombuffer(frames, dtype=np.uint8)
+                       .astype(np.float32) - 128)/128
+        elif samp_width == 2:
+            samples = np.frombuffer(frames, dtype="<i2").astype(np.float32)/32768
+        elif samp_width == 4:
+            samples = (np.frombuffer(frames, dtype="<i4")
+                       .astype(np.float32)/2147483648)
+        else:
+            raise ValueError(f"unsupported sample width {samp_width}")
+        samples = samples.reshape(-1, n_channels).mean(axis=1)
+        loud = np.nonzero(np.abs(samples) >= self.TRIM_LEVEL)[0]
+        if len(loud) > 0:
+            samples = samples[loud[0]:loud[-1]+1]
+        if file_rate != self.sample_rate and len(samples) > 0:
+            n_out = int(round(len(samples)*self.sample_rate/file_rate))
+            samples = np.interp(np.arange(n_out)*file_rate/self.sample_rate,
+                                np.arange(len(samples)),
+                                samples).astype(np.float32)
+        return np.repeat(samples[:, np.newaxis], 2, axis=1)
+
+    def request_render(self, key):
+        """ Render clip in background, if not already requested
+        :key: clip key
+        """
+        if key in self.pending or key in self.failed:
+            return
+
+        if self.worker is None or not self.worker.is_alive():
+            self.worker = SpeechWorker(engine_factory=self.engine_factory)
+        phrase, rate = key
+        cmd = SpeechMakerCmd(msg=phrase, rate=rate, volume=1.0,
+                             file_name=self.clip_file(key))
+        if self.worker.send(cmd):
+            self.pending.add(key)
+            self.n_renders += 1
+            SlTrace.lg(f"SpeechClipCache render: {key}", "speech_cache")
+
+    def close(self):
+        """ Stop rendering
+        """
+        if self.worker is not None:
+            self.worker.kill()
+            self.worker = None
+
+    def get_stats(self):
+        """ Get cache statistics
+        :returns: dictionary of entries, hits, misses, renders, failed
+        """
+        return dict(entries=len(self.clips), hits=self.hits,
+                    misses=self.misses, renders=self.n_renders,
+                    failed=len(self.failed))
@@ -9,7 +9,7 @@ class SpeechMakerCmd:
     """
 
     def __init__(self, cmd_type=None, msg=None, msg_type=None,
-                 rate=None, volume=None):
+                 rate=None, volume=None, file_name=None):
         """ Setup command
         :cmd_type: command to execute
                 "MSG" - speak message
@@ -23,6 +23,8 @@ class SpeechMakerCmd:
             default: REPORT
         :rate: speech rate default: 240
         :volume: speech volume default: .9
+        :file_name: save speech to this (wav) file instead
+                of speaking default: speak
         """
         self.cmd_type = cmd_type
         self.msg = msg
@@ -33,6 +35,7 @@ class SpeechMakerCmd:
         if volume is None:
             volume = .9
         self.volume = volume
+        self.file_name = file_name
 
     def __str__(self):
         ret = f"SpeechMakerCmd {self.cmd_type}"
@@ -40,4 +43,6 @@ class SpeechMakerCmd:
             ret += f" {self.msg}"
         if self.msg_type is not None:
             ret += f" {self.msg_type}"
+        if self.file_name is not None:
+            ret += f" to {self.file_name}"
         return ret
@@ -0,0 +1,614 @@
+#turtle_capture.py  18Oct2026  crs, Author
+"""
+Headless turtle - a drop-in replacement for the turtle module,
+producing braille cells without tk or a display.
+
+Turtle drawing (forward, goto, circle, dot, begin_fill/end_fill,
+width, color, ...) is recorded as a display list of CanvasItemSpec,
+in canvas coordinates, as turtle would create tk canvas items:
+    line - each pen down move, round ends
+    oval - dot
+    polygon - fill, created at begin_fill, so beneath the lines
+            drawn while filling
+The display list is rasterized (CellRaster) directly to
+(ix,iy,color) cells, iy==0 at top, the top most item's
+color showing, as CanvasGrid.get_cell_specs gives.
+
+Usage:
+    from turtle_capture import *     # in place of from turtle import *
+        done() prints the braille text
+  or, for an unchanged turtle program:
+    capture = run_program("spokes.py")
+    capture.get_cell_specs()
+    capture.get_braille_text()
+"""
+import math
+import os
+import runpy
+import sys
+
+from select_trace import SlTrace
+from braille_error import BrailleError
+from canvas_item_index import CanvasItemSpec
+from cell_raster import CellRaster
+from braille_text import get_braille_text
+
+
+class CaptureDone(Exception):
+    """ Raised by done()/mainloop() to end a program in run_program
+    """
+
+
+class TurtleCapture:
+    """ Screen replacement: display list and cell output
+    """
+    stop_at_done = False        # True - done() raises CaptureDone
+
+    def __init__(self, width=800, height=800,
+                 grid_width=40, grid_height=25):
+        """ Setup empty drawing
+        :width: canvas width in pixels default: 800
+        :height: canvas height in pixels default: 800
+        :grid_width: braille cells horizontally default: 40
+        :grid_height: braille cells vertically default: 25
+        """
+        self.width = width
+        self.height = height
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.items = []             # CanvasItemSpec, in stacking order
+        self.next_item_id = 1
+        self.turtles = []
+        self.snapshots = []         # (title, cell specs) from snapshot()
+        self._colormode = 1.0
+        self._bgcolor = "white"
+        self._title = None          # from title(), if called
+        self.n_done = 0             # done()/mainloop() calls
+
+    def setup(self, width=None, height=None, startx=None, starty=None):
+        """ Set canvas size, pixel values only (fractions of the
+        screen have no meaning here)
+        """
+        if isinstance(width, int):
+            self.width = width
+        if isinstance(height, int):
+            self.height = height
+
+    def screensize(self, canvwidth=None, canvheight=None, bg=None):
+        if canvwidth is None and canvheight is None and bg is None:
+            return self.width, self.height
+
+        self.setup(width=canvwidth, height=canvheight)
+        if bg is not None:
+            self.bgcolor(bg)
+
+    def colormode(self, cmode=None):
+        if cmode is None:
+            return self._colormode
+
+        if cmode not in (1.0, 255):
+            raise BrailleError(f"colormode {cmode} is not 1.0 or 255")
+        self._colormode = cmode
+
+    def bgcolor(self, *args):
+        if len(args) == 0:
+            return self._bgcolor
+
+        self._bgcolor = self.color_str(*args)
+
+    def color_str(self, *args):
+        """ Convert turtle color arg(s) to tk color string
+        :args: color string, (r,g,b) or r,g,b in colormode units
+        :returns: color string e.g. "red", "#ff0000"
+        """
+        if len(args) == 1:
+            args = args[0]
+        if isinstance(args, str):
+            return args
+
+        if len(args) != 3:
+            raise BrailleError(f"bad color arguments: {args}")
+        if self._colormode == 1.0:
+            args = [x*255 for x in args]
+        r,g,b = [int(round(x)) for x in args]
+        return f"#{r:02x}{g:02x}{b:02x}"
+
+    def add_item(self, type, coords, fill="", outline="", width=1.,
+                 capstyle="round"):
+        """ Add display list item, on top
+        :returns: CanvasItemSpec
+        """
+        spec = CanvasItemSpec(self.next_item_id, type, coords, fill=fill,
+                              outline=outline, width=width,
+                              capstyle=capstyle)
+        self.next_item_id += 1
+        self.items.append(spec)
+        return spec
+
+    def replace_item(self, spec):
+        """ Replace item, keeping its stacking order
+        :spec: CanvasItemSpec with item_id of replaced item
+        """
+        for i, item in enumerate(self.items):
+            if item.item_id == spec.item_id:
+                self.items[i] = spec
+                return
+
+        self.items.append(spec)
+
+    def clear(self):
+        """ Remove all drawing
+        """
+        self.items = []
+        for turtle in self.turtles:
+            turtle.fill_item = None
+
+    def get_raster(self):
+        """ Get rasterizer for canvas coordinates (y down)
+        """
+        return CellRaster(x_min=-self.width/2, y_min=-self.height/2,
+                          cell_width=self.width/self.grid_width,
+                          cell_height=self.height/self.grid_height,
+                          grid_width=self.grid_width,
+                          grid_height=self.grid_height)
+
+    def get_cells(self):
+        """ Rasterize display list
+        :returns: dictionary by (ix,iy) of color string
+        """
+        raster = self.get_raster()
+        cells = {}
+        for spec in self.items:
+            if spec.fill == "":
+                continue            # Shows no color
+
+            coords = spec.coords
+            if spec.type == "line":
+                item_cells = []
+                for i in range(0, len(coords)-3, 2):
+                    item_cells += raster.line_cells(coords[i:i+2],
+                                                    coords[i+2:i+4],
+                                                    width=spec.width)
+            elif spec.type == "oval":
+                x1,y1,x2,y2 = coords
+                item_cells = raster.dot_cells(((x1+x2)/2, (y1+y2)/2),
+                                              size=x2-x1)
+            elif spec.type == "polygon":
+                item_cells = raster.polygon_cells(
+                                list(zip(coords[0::2], coords[1::2])))
+            else:
+                continue
+
+            for ixy in item_cells:
+                cells[ixy] = spec.fill      # Upper item shows
+        SlTrace.lg(f"TurtleCapture.get_cells: {len(self.items)} items"
+                   f" {len(cells)} cells", "capture")
+        return cells
+
+    def get_cell_specs(self):
+        """ Get cells as CanvasGrid.get_cell_specs
+        :returns: list of (ix,iy,color)
+        """
+        cells = self.get_cells()
+        return [(ix, iy, cells[(ix,iy)]) for ix,iy in sorted(cells)]
+
+    def get_braille_text(self, shift_to_edge=True, blank_char=","):
+        """ Get braille text, as AudioDrawWindow.print_braille
+        :shift_to_edge: shift figure towards edge default: True
+        :blank_char: replacement for non-trailing blanks default: ","
+        """
+        return get_braille_text(self.get_cells(),
+                                grid_width=self.grid_width,
+                                grid_height=self.grid_height,
+                                shift_to_edge=shift_to_edge,
+                                blank_char=blank_char)
+
+    def snapshot(self, title=None, port=None):
+        """ Record current cells, as wx_turtle_braille.snapshot
+        """
+        self.snapshots.append((title, self.get_cell_specs()))
+
+    def done(self, *args, **kwargs):
+        """ End of drawing: stop program (run_program)
+        else print braille text
+        """
+        self.n_done += 1
+        if self.stop_at_done:
+            raise CaptureDone()
+
+        print(self.get_braille_text(), end="")
+
+    def mainloop(self, *args, **kwargs):
+        return self.done()
+
+    def exitonclick(self):
+        return self.done()
+
+    def bye(self):
+        return self.done()
+
+    def turtles_list(self):
+        return list(self.turtles)
+
+    def title(self, titlestring):
+        self._title = titlestring
+
+    def get_title(self):
+        """ Get window title, set by program's title()
+        :returns: title, None if not set
+        """
+        return self._title
+
+    def noop(self, *args, **kwargs):
+        """ Display only operations - nothing to capture
+        """
+        return None
+
+    (tracer, update, delay, listen, onkey, onkeypress,
+     onkeyrelease, onclick, onscreenclick, ontimer, register_shape,
+     addshape, mode, getcanvas, textinput, numinput) = (noop,)*16
+
+
+class CaptureTurtle:
+    """ Turtle replacement, recording drawing into a TurtleCapture
+    """
+    def __init__(self, screen=None):
+        """ Setup turtle at home, pen down
+        :screen: TurtleCapture default: Screen()
+        """
+        if screen is None:
+            screen = Screen()
+        self.screen = screen
+        screen.turtles.append(self)
+        self.x = self.y = 0.
+        self._heading = 0.          # degrees, counterclockwise from east
+        self._pendown = True
+        self._pensize = 1
+        self._pencolor = "black"
+        self._fillcolor = "black"
+        self.fill_item = None       # fill polygon spec while filling
+        self.fill_path = []         # turtle coordinates
+        self._visible = True
+
+    """ Movement """
+    def forward(self, distance):
+        rangle = math.radians(self._heading)
+        self.goto(self.x + distance*math.cos(rangle),
+                  self.y + distance*math.sin(rangle))
+    fd = forward
+
+    def backward(self, distance):
+        self.forward(-distance)
+    bk = back = backward
+
+    def goto(self, x, y=None):
+        """ Move to x,y drawing line if pen is down
+        :x: x or (x,y)
+        :y: y default: x is pair
+        """
+        if y is None:
+            x,y = x
+        if self._pendown:
+            self.screen.add_item("line", (self.x, -self.y, x, -y),
+                                 fill=self._pencolor, width=self._pensize)
+        self.x, self.y = x, y
+        if self.fill_item is not None:
+            self.fill_path.append((x,y))
+    setpos = setposition = goto
+
+    def setx(self, x):
+        self.goto(x, self.y)
+
+    def sety(self, y):
+        self.goto(self.x, y)
+
+    def home(self):
+        self.goto(0, 0)
+        self.setheading(0)
+
+    def left(self, angle):
+        self._heading = (self._heading + angle) % 360
+    lt = left
+
+    def right(self, angle):
+        self.left(-angle)
+    rt = right
+
+    def setheading(self, to_angle):
+        self._heading = to_angle % 360
+    seth = setheading
+
+    def heading(self):
+        return self._heading
+
+    def position(self):
+        return (self.x, self.y)
+    pos = position
+
+    def xcor(self):
+        return self.x
+
+    def ycor(self):
+        return self.y
+
+    def towards(self, x, y=None):
+        if y is None:
+            x,y = x
+        return math.degrees(math.atan2(y-self.y, x-self.x)) % 360
+
+    def distance(self, x, y=None):
+        if y is None:
+            x,y = x
+        return math.hypot(x-self.x, y-self.y)
+
+    def circle(self, radius, extent=None, steps=None):
+        """ Draw circle (polygon) as turtle.circle does
+        """
+        if extent is None:
+            extent = 360
+        if steps is None:
+            frac = abs(extent)/360
+            steps = 1+int(min(11+abs(radius)/6.0, 59.0)*frac)
+        w = 1.0*extent/steps
+        w2 = 0.5*w
+        l = 2.0*radius*math.sin(math.radians(w2))
+        if radius < 0:
+            l, w, w2 = -l, -w, -w2
+        self.left(w2)
+        for _ in range(steps):
+            self.forward(l)
+            self.left(w)
+        self.left(-w2)
+
+    def dot(self, size=None, *color):
+        """ Draw dot at current position, args as turtle.dot
+        :size: diameter default: max(pensize+4, 2*pensize)
+                a color string or tuple, with no color: that color,
+                default size
+        :color: color args default: pen color
+        """
+        default_size = max(self._pensize+4, 2*self._pensize)
+        if len(color) > 0:
+            fill = self.screen.color_str(*color)
+            if size is None:
+                size = default_size
+        elif isinstance(size, (str, tuple)):
+            fill = self.screen.color_str(size)      # e.g. dot("red")
+            size = default_size
+        else:
+            fill = self._pencolor
+            if not size:
+                size = default_size
+        r = size/2
+        self.screen.add_item("oval", (self.x-r, -self.y-r,
+                                      self.x+r, -self.y+r),
+                             fill=fill, outline=fill, width=0)
+
+    """ Pen """
+    def pendown(self):
+        self._pendown = True
+    pd = down = pendown
+
+    def penup(self):
+        self._pendown = False
+    pu = up = penup
+
+    def isdown(self):
+        return self._pendown
+
+    def pensize(self, width=None):
+        if width is None:
+            return self._pensize
+
+        self._pensize = width
+    width = pensize
+
+    def pencolor(self, *args):
+        if len(args) == 0:
+            return self._pencolor
+
+        self._pencolor = self.screen.color_str(*args)
+
+    def fillcolor(self, *args):
+        if len(args) == 0:
+            return self._fillcolor
+
+        self._fillcolor = self.screen.color_str(*args)
+
+    def color(self, *args):
+        """ color() - (pencolor, fillcolor)
+            color(c), color((r,g,b)), color(r,g,b) - both
+            color(c1, c2) - pen, fill
+        """
+        if len(args) == 0:
+            return self._pencolor, self._fillcolor
+
+        if len(args) == 2:
+            self.pencolor(args[0])
+            self.fillcolor(args[1])
+        else:
+            self.pencolor(*args)
+            self.fillcolor(*args)
+
+    def filling(self):
+        return self.fill_item is not None
+
+    def begin_fill(self):
+        """ Start fill, fill polygon beneath lines to come
+        """
+        self.fill_item = self.screen.add_item("polygon", ())
+        self.fill_path = [(self.x,self.y)]
+
+    def end_fill(self):
+        if self.fill_item is None:
+            return
+
+        if len(self.fill_path) > 2:
+            coords = []
+            for x,y in self.fill_path:
+                coords += [x, -y]
+            self.screen.replace_item(CanvasItemSpec(
+                            self.fill_item.item_id, "polygon", coords,
+                            fill=self._fillcolor, width=0))
+        self.fill_item = None
+        self.fill_path = []
+
+    def showturtle(self):
+        self._visible = True
+    st = showturtle
+
+    def hideturtle(self):
+        self._visible = False
+    ht = hideturtle
+
+    def isvisible(self):
+        return self._visible
+
+    def clear(self):
+        self.screen.clear()
+
+    def reset(self):
+        self.screen.clear()
+        self.__init__(self.screen)
+        self.screen.turtles.remove(self)    # Added again by __init__
+
+    def getscreen(self):
+        return self.screen
+
+    def noop(self, *args, **kwargs):
+        """ Display only operations - nothing to capture
+        """
+        return None
+
+    (speed, shape, shapesize, turtlesize, stamp, write, tilt,
+     settiltangle, resizemode, onclick, ondrag, onrelease) = (noop,)*12
+
+
+Turtle = RawTurtle = Pen = CaptureTurtle
+
+_screen = None          # Default screen, turtle
+_turtle = None
+
+def Screen():
+    """ Get default screen (TurtleCapture)
+    """
+    global _screen
+    if _screen is None:
+        _screen = TurtleCapture()
+    return _screen
+
+def getturtle():
+    """ Get default turtle
+    """
+    global _turtle
+    if _turtle is None:
+        _turtle = CaptureTurtle(Screen())
+    return _turtle
+getpen = getturtle
+
+def reset_capture(**kwargs):
+    """ Start new default screen, turtle
+    :kwargs: TurtleCapture args
+    :returns: TurtleCapture
+    """
+    global _screen, _turtle
+    _screen = TurtleCapture(**kwargs)
+    _turtle = None
+    return _screen
+
+"""
+Module functions - calls to default turtle, screen,
+as turtle's _make_global_funcs
+"""
+TURTLE_FUNCS = ["forward", "fd", "backward", "bk", "back", "goto",
+                "setpos", "setposition", "setx", "sety", "home",
+                "left", "lt", "right", "rt", "setheading", "seth",
+                "heading", "position", "pos", "xcor", "ycor",
+                "towards", "distance", "circle", "dot",
+                "pendown", "pd", "down", "penup", "pu", "up", "isdown",
+                "pensize", "width", "pencolor", "fillcolor", "color",
+                "filling", "begin_fill", "end_fill",
+                "showturtle", "st", "hideturtle", "ht", "isvisible",
+                "clear", "reset", "speed", "shape", "shapesize",
+                "turtlesize", "stamp", "write", "tilt", "settiltangle",
+                "resizemode", "onclick", "ondrag", "onrelease"]
+SCREEN_FUNCS = ["setup", "screensize", "colormode", "bgcolor",
+                "snapshot", "done", "mainloop", "exitonclick", "bye",
+                "title", "tracer", "update", "delay", "listen", "onkey",
+                "onkeypress", "onkeyrelease", "onscreenclick", "ontimer",
+                "register_shape", "addshape", "mode", "getcanvas",
+                "textinput", "numinput"]
+
+def _make_global_func(name, get_obj):
+    def func(*args, **kwargs):
+        return getattr(get_obj(), name)(*args, **kwargs)
+    func.__name__ = name
+    return func
+
+for _name in TURTLE_FUNCS:
+    globals()[_name] = _make_global_func(_name, getturtle)
+for _name in SCREEN_FUNCS:
+    globals()[_name] = _make_global_func(_name, Screen)
+globals()["turtles"] = _make_global_func("turtles_list", Screen)
+
+__all__ = (TURTLE_FUNCS + SCREEN_FUNCS
+           + ["turtles", "Turtle", "RawTurtle", "Pen", "Screen",
+              "getturtle", "getpen"])
+
+
+"""
+Running unchanged turtle programs
+"""
+TURTLE_MODULES = ["turtle", "wx_turtle_braille", "turtle_braille",
+                  "turtle_braille_link", "turtle_little"]
+
+def run_program(pgm_file, **kwargs):
+    """ Run turtle program, capturing its drawing
+    The program's turtle imports (TURTLE_MODULES) get this module.
+    The program is stopped at done()/mainloop()
+    :pgm_file: python turtle program
+    :kwargs: TurtleCapture args e.g. grid_width
+    :returns: TurtleCapture
+    :raises: BrailleError if program exits (sys.exit) with
+            non-zero code
+    """
+    capture = reset_capture(**kwargs)
+    this_module = sys.modules[__name__]
+    saved_modules = {name : sys.modules.get(name) for name in TURTLE_MODULES}
+    stop_at_done = TurtleCapture.stop_at_done
+    TurtleCapture.stop_at_done = True
+    pgm_dir = os.path.dirname(os.path.abspath(pgm_file))
+    sys.path.insert(0, pgm_dir)     # As when run directly
+    try:
+        for name in TURTLE_MODULES:
+            sys.modules[name] = this_module
+        runpy.run_path(pgm_file, run_name="__main__")
+    except CaptureDone:
+        pass
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            raise BrailleError(f"{pgm_file} exited with code {e.code}")
+    finally:
+        TurtleCapture.stop_at_done = stop_at_done
+        sys.path.remove(pgm_dir)
+        for name, module in saved_modules.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+    return capture
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('pgm_files', nargs='+')
+    parser.add_argument('--grid_width', type=int, dest='grid_width', default=40)
+    parser.add_argument('--grid_height', type=int, dest='grid_height', default=25)
+    args = parser.parse_args()
+    for pgm_file in args.pgm_files:
+        capture = run_program(pgm_file, grid_width=args.grid_width,
+                              grid_height=args.grid_height)
+        print(pgm_file)
+        print(capture.get_braille_text(), end="")
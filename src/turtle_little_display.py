@@ -9,6 +9,7 @@ Supports text "picture" output
 from math import sin, cos, pi, atan, sqrt
 
 from select_trace import SlTrace
+from cell_raster import CellRaster
 
 def pl(point_list):
     """ display routine for point list
@@ -107,7 +108,8 @@ class TurtleLittleDisplay:
                  color_bg = None,
                  color_fill = None,
                  point_resolution=None,
-                 blank_char=" "):
+                 blank_char=" ",
+                 use_raster=True):
         """ Setup display
         :title: display screen title
         :win_width: display window width in pixels
@@ -138,6 +140,10 @@ class TurtleLittleDisplay:
                     computation
         :blank_char: replacement for non-trailing blanks
                     default " " for standard "picture",
+        :use_raster: True - lines, dots, fills are mapped directly
+                    to cells via CellRaster
+                    False - via generated sample points
+                    default: True
         """
         if title is None:
             title = "Character Display"
@@ -171,6 +177,13 @@ class TurtleLittleDisplay:
         self.cmds = []      # Commands to support redo
         self.cells = {}     # BrailleCell hash by (ix,iy)
         self.set_cell_lims()
+        self.raster = None
+        if use_raster:
+            self.raster = CellRaster(x_min=self.x_min, y_min=self.y_min,
+                                     cell_width=self.cell_width,
+                                     cell_height=self.cell_height,
+                                     grid_width=self.grid_width,
+                                     grid_height=self.grid_height)
         self.lfun_horz = False 
         self.lfun_vert = False 
         self.x = self.y = 0
@@ -210,6 +223,10 @@ class TurtleLittleDisplay:
         pt = (self.x,self.y)
         if len(color)==0:
             color = self._color
+        if self.raster is not None:
+            cells = self.raster.dot_cells(pt, size=size)
+            self.populate_cells(cells, color=color)
+            return
             
         points = self.get_dot_points(pt=pt, size=size)
         self.populate_cells_from_points(points, color=color)
@@ -235,7 +252,10 @@ class TurtleLittleDisplay:
             width = self.line_width
         if color is None:
             color = self._color
-        if self.is_pendown:
+        if self.is_pendown and self.raster is not None:
+            cells = self.raster.line_cells(p1, p2, width=width)
+            self.populate_cells(cells, color=color)
+        elif self.is_pendown:
             points = self.get_drawn_line_points(p1, p2, width)
             self.populate_cells_from_points(points, color=color)
         self.x, self.y = p2
@@ -533,6 +553,11 @@ class TurtleLittleDisplay:
     def do_fill(self):
         """ Fill, using fill perimiter points
         """
+        if self.raster is not None:
+            cells = self.raster.polygon_cells(self._fill_perimiter_points)
+            self.populate_cells(cells, color=self._color_fill)
+            return
+        
         fill_points = self.fill_points(
                         self._fill_perimiter_points)
         self.populate_cells_from_points(
@@ -837,6 +862,17 @@ class TurtleLittleDisplay:
             self.update_cell(pt=point, color=color)
         SlTrace.lg(f"populate_cells: cells after: {len(self.cells)}", "xpoint")
 
+    def populate_cells(self, cells, color=None):
+        """ Populate display cells, given cell indexes, color
+        :cells: list of (ix,iy)
+        :color: cell color
+                default: self._color
+        """
+        SlTrace.lg(f"populate_cells: add: {len(cells)} cells before:"
+                   f" {len(self.cells)}", "point")
+        for ix,iy in cells:
+            self.update_cell(ix=ix, iy=iy, color=color)
+
     def color_str(self, color):
         """ convert turtle colors arg(s) to color string
         :color: turtle color arg
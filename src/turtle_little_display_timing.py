@@ -0,0 +1,128 @@
+# turtle_little_display_timing.py  18Oct2026  crs, Author
+""" TurtleLittleDisplay drawing to cells time:
+    raster - CellRaster (use_raster=True)
+    points - generated sample points (use_raster=False)
+Drawings:
+    starry_night - tul_starry_night.py spokes
+    stars - filled five point stars (concave, even-odd
+            fill leaves the center pentagon empty)
+Compares the two cell dictionaries (see cell_raster.py for the
+divergence):
+    raster only - cells a line clips without a sample point
+    points only - cells the points version has, raster does not
+    recolored - cells a later line now reaches
+Lines only drawings (starry_night) fail the check if any cell
+is points only.
+Usage: python turtle_little_display_timing.py [--repeat N] [--print]
+"""
+import argparse
+import sys
+import time
+
+from select_trace import SlTrace
+from turtle_little_display import TurtleLittleDisplay
+
+def draw_starry_night(tld):
+    """ tul_starry_night.py spokes
+    """
+    colors_rainbow = ["red","orange", "yellow"
+                      "green", "blue", "indigo",
+                      "violet"]
+    n_colors = len(colors_rainbow)
+    n_spokes = n_colors*4
+    spoke_length_min = 200
+    spoke_length_max = 400
+    spoke_length_inc = (spoke_length_max-spoke_length_min)/n_spokes
+    spoke_width_min = 2
+    spoke_width_max = 4
+    spoke_width_inc = (spoke_width_max-spoke_width_min)/n_spokes
+    angle_inc = 2.5*360/n_spokes
+    for i in range(n_spokes):
+        tld.color(colors_rainbow[i % n_colors])
+        tld.right(angle_inc)
+        tld.width(spoke_width_min + i*spoke_width_inc)
+        spoke_length = spoke_length_min + i*spoke_length_inc
+        tld.forward(spoke_length)
+        tld.backward(spoke_length)
+
+def draw_stars(tld):
+    """ Filled stars, of increasing size, around the center
+    """
+    for i, color in enumerate(["red", "green", "blue", "orange"]):
+        size = 150 + 50*i
+        tld.penup()
+        tld.goto(-size/2, size/5)
+        tld.pendown()
+        tld.color(color)
+        tld.fillcolor(color)
+        tld.width(1+i)
+        tld.begin_fill()
+        for _ in range(5):
+            tld.forward(size)
+            tld.right(144)
+        tld.end_fill()
+    tld.penup()
+    tld.goto(0, 0)
+    tld.pendown()
+    for size in (10, 40, 120):
+        tld.dot(size, "violet")
+
+def time_drawing(draw, use_raster, repeat):
+    """ Time drawing
+    :returns: (average seconds, display)
+    """
+    t_beg = time.perf_counter()
+    for _ in range(repeat):
+        tld = TurtleLittleDisplay(use_raster=use_raster)
+        draw(tld)
+    return (time.perf_counter()-t_beg)/repeat, tld
+
+def in_grid(tld):
+    """ Get cells within the display grid
+    """
+    return {ixy : cell.color_str() for ixy, cell in tld.cells.items()
+            if 0 <= ixy[0] < tld.grid_width and 0 <= ixy[1] < tld.grid_height}
+
+def compare_cells(cells_points, cells_raster):
+    """ Compare points and raster cell dictionaries
+    :returns: (raster only, points only, recolored) sets of (ix,iy)
+    """
+    raster_only = set(cells_raster) - set(cells_points)
+    points_only = set(cells_points) - set(cells_raster)
+    recolored = {ixy for ixy in set(cells_points) & set(cells_raster)
+                 if cells_points[ixy] != cells_raster[ixy]}
+    return raster_only, points_only, recolored
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, dest='repeat', default=5)
+    parser.add_argument('--print', action='store_true', dest='print_grid')
+    args = parser.parse_args()
+    failed = False
+    for name, draw, lines_only in [("starry_night", draw_starry_night, True),
+                                   ("stars", draw_stars, False)]:
+        t_points, tld_points = time_drawing(draw, False, args.repeat)
+        t_raster, tld_raster = time_drawing(draw, True, args.repeat)
+        cells_points = in_grid(tld_points)
+        cells_raster = in_grid(tld_raster)
+        n_diff = len(set(cells_points.items()) ^ set(cells_raster.items()))
+        SlTrace.lg(f"{name:13} points: {t_points*1000:8.2f} msec"
+                   f" raster: {t_raster*1000:7.2f} msec"
+                   f" speedup: {t_points/t_raster:6.1f}"
+                   f"  cells points: {len(cells_points)}"
+                   f" raster: {len(cells_raster)} differing: {n_diff}",
+                   to_stdout=True)
+        raster_only, points_only, recolored = compare_cells(cells_points,
+                                                            cells_raster)
+        SlTrace.lg(f"{'':13} raster only: {len(raster_only)}"
+                   f" points only: {len(points_only)}"
+                   f" recolored: {len(recolored)}", to_stdout=True)
+        if lines_only and points_only:
+            SlTrace.lg(f"{name}: points only cells: {sorted(points_only)}",
+                       to_stdout=True)
+            failed = True
+        if args.print_grid:
+            tld_points.print_grid(f"{name} points")
+            tld_raster.print_grid(f"{name} raster")
+    SlTrace.lg("check " + ("FAILED" if failed else "passed"), to_stdout=True)
+    sys.exit(1 if failed else 0)
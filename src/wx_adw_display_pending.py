@@ -17,8 +17,16 @@ by calling set_display_fun(<user's item display function>)
 """
             
 class AdwDisplayPending:
+    BIN_SIZE = 64       # spatial index bin size, in pixels
+    
     def __init__(self, canv_pan):
         """ pending display items
+        Items are kept as a retained scene: each item once,
+        in z order (order of last add), with a spatial index
+        (BIN_SIZE square bins) of item bounds so a paint draws
+        only items intersecting the update region.
+        Adding, moving or removing a static (non overlay) item
+        invalidates its bounds in the canvas panel's backing store.
         :canv_pan: canvas panel (CanvPanel)
         """
         self.canv_pan = canv_pan
@@ -28,13 +36,22 @@ class AdwDisplayPending:
     def clear(self):
         """ Clear/initialize pending
         """
-        self.items = []         # one-time list for update
         self.perm_items = {}    # permanent dictionary, by id, for redrawing
+        self.z_order = {}       # z order, by id, higher drawn later
+        self.z_next = 0
+        self.bins = {}          # item ids, by (bin x, bin y)
+        self.item_bins = {}     # bins, by item id
+        self.item_bounds = {}   # (x0,y0,x1,y1), None - unbounded, by item id
+        self.unbounded = set()  # ids of items drawn on every paint
+        self.composites = {}    # number of points indexed, by composite id
+                                # parts may be added after add_item
         self.prev_npending = None   # Track changes
+        self.n_drawn = 0        # items drawn in last paint
                 
     
     def add_item(self, item):
-        """ Add display item
+        """ Add display item, or if present, reindex it
+        and raise it to the top
         :item: item/id (CanvasPanelItem)
         """
         if type(item) == int:
@@ -43,17 +60,161 @@ class AdwDisplayPending:
             itm = item
         if type(itm) == int:
             SlTrace.lg("item: {item}")
-        self.items.append(itm)
         self.add_perm_item(itm)
         ##self.canv_pan.refresh_item(itm)
         
     def add_perm_item(self, item):
         """ Add permanent item to support redrawing
-        TBD handling item changes, overlay etc.
-        
         :item: item to be added for redrawing
         """
-        self.perm_items[item.canv_id] = item
+        item_id = item.canv_id
+        if item_id in self.perm_items:
+            self.unindex_item(item_id)
+        self.perm_items[item_id] = item
+        self.z_order[item_id] = self.z_next
+        self.z_next += 1
+        self.index_item(item)
+
+    def remove_item(self, item):
+        """ Remove item, e.g. deleted, from scene
+        :item: item/id (CanvasPanelItem)
+        """
+        item_id = item if type(item) == int else item.canv_id
+        if item_id not in self.perm_items:
+            return
+        
+        self.unindex_item(item_id)
+        del self.perm_items[item_id]
+        del self.z_order[item_id]
+
+    def get_bounds(self, item):
+        """ Get item's drawing bounds, covering all parts
+        and line widths
+        :item: CanvasPanelItem
+        :returns: (x0,y0,x1,y1), None if unbounded (e.g. text)
+        """
+        x0 = y0 = x1 = y1 = None
+        for part in item.get_parts():
+            if part.canv_type == "create_text":
+                return None         # extent unknown - always draw
+            
+            pad = 2
+            if "width" in part.kwargs:
+                pad += int(part.kwargs["width"])
+            for pt in part.points:
+                if x0 is None:
+                    x0,x1 = pt.x-pad, pt.x+pad
+                    y0,y1 = pt.y-pad, pt.y+pad
+                else:
+                    x0,x1 = min(x0,pt.x-pad), max(x1,pt.x+pad)
+                    y0,y1 = min(y0,pt.y-pad), max(y1,pt.y+pad)
+        if x0 is None:
+            return (0,0,0,0)        # Empty
+        
+        return (x0,y0,x1,y1)
+
+    def rect_bins(self, x0,y0,x1,y1):
+        """ Get bin keys covering rectangle
+        :returns: list of (bin x, bin y)
+        """
+        bs = self.BIN_SIZE
+        return [(bx,by) for bx in range(int(x0)//bs, int(x1)//bs+1)
+                            for by in range(int(y0)//bs, int(y1)//bs+1)]
+        
+    def index_item(self, item):
+        """ Add item to spatial index
+        :item: CanvasPanelItem
+        """
+        item_id = item.canv_id
+        bounds = self.get_bounds(item)
+        self.item_bounds[item_id] = bounds
+        if not item.is_overlay():
+            self.canv_pan.invalidate_backing(bounds)
+        if item.canv_type == "create_composite":
+            self.composites[item_id] = len(item.points)
+        if bounds is None:
+            self.unbounded.add(item_id)
+            self.item_bins[item_id] = []
+            return
+        
+        bin_keys = self.rect_bins(*bounds)
+        self.item_bins[item_id] = bin_keys
+        for bin_key in bin_keys:
+            if bin_key not in self.bins:
+                self.bins[bin_key] = set()
+            self.bins[bin_key].add(item_id)
+
+    def unindex_item(self, item_id):
+        """ Remove item from spatial index
+        :item_id: item's canv_id
+        """
+        item = self.perm_items.get(item_id)
+        if item is not None and not item.is_overlay() and item_id in self.item_bounds:
+            self.canv_pan.invalidate_backing(self.item_bounds[item_id])
+        for bin_key in self.item_bins.pop(item_id, []):
+            bin_ids = self.bins.get(bin_key)
+            if bin_ids is not None:
+                bin_ids.discard(item_id)
+                if len(bin_ids) == 0:
+                    del self.bins[bin_key]
+        self.item_bounds.pop(item_id, None)
+        self.unbounded.discard(item_id)
+        self.composites.pop(item_id, None)
+
+    def reindex_item(self, item):
+        """ Reindex item, if displayed, keeping its z order
+        :item: CanvasPanelItem
+        """
+        item_id = item.canv_id
+        if item_id not in self.perm_items:
+            return      # Indexed when added
+        
+        self.unindex_item(item_id)
+        self.index_item(item)
+
+    def reindex_composites(self):
+        """ Reindex composites whose parts changed since indexed
+        """
+        changed = [item_id for item_id, npoints in self.composites.items()
+                   if len(self.perm_items[item_id].points) != npoints]
+        for item_id in changed:
+            self.unindex_item(item_id)
+            self.index_item(self.perm_items[item_id])
+
+    def get_items_in_rects(self, rects=None, overlay=None):
+        """ Get displayed items intersecting rectangles
+        in z order (bottom first), compacting out deleted items
+        :rects: list of wx.Rect default: all items
+        :overlay: True - only overlay items, False - only static
+                items default: None - all items
+        :returns: list of CanvasPanelItem
+        """
+        self.reindex_composites()
+        if rects is None:
+            item_ids = set(self.perm_items)
+        else:
+            item_ids = set(self.unbounded)
+            for rect in rects:
+                rx0,ry0 = rect.GetLeft(), rect.GetTop()
+                rx1,ry1 = rect.GetRight(), rect.GetBottom()
+                for bin_key in self.rect_bins(rx0,ry0,rx1,ry1):
+                    for item_id in self.bins.get(bin_key, ()):
+                        if item_id in item_ids:
+                            continue
+                        x0,y0,x1,y1 = self.item_bounds[item_id]
+                        if x0 <= rx1 and rx0 <= x1 and y0 <= ry1 and ry0 <= y1:
+                            item_ids.add(item_id)
+        items = []
+        for item_id in item_ids:
+            item = self.perm_items[item_id]
+            if item.deleted:
+                self.remove_item(item_id)
+                continue
+            if overlay is not None and item.is_overlay() != overlay:
+                continue
+            items.append(item)
+        items.sort(key=lambda itm: self.z_order[itm.canv_id])
+        return items
         
     def add_cell(self, di_item):
         """ Add cell to be displayed
@@ -94,12 +255,18 @@ class AdwDisplayPending:
         """
         self.clear()    
         
-    def display_pending(self, dc):
-        """ Display list and clear it
-        :dc: wx.PaintDC(self)
+    def display_pending(self, dc, rects=None, overlay=None):
+        """ Display items intersecting update rectangles
+        :dc: wx.PaintDC(self) or backing store wx.MemoryDC
+        :rects: list of update region wx.Rect
+                default: display all items
+        :overlay: True - only overlay items, False - only static
+                items default: None - all items
         """
-        if len(self.items) > 0:
-            self.npending = len(self.items)
+        items = self.get_items_in_rects(rects, overlay=overlay)
+        self.n_drawn = len(items)
+        if len(items) > 0:
+            self.npending = len(self.perm_items)
             
             color = self.canv_pan.color
             #dc = wx.PaintDC(self.canv_pan.grid_panel)
@@ -110,34 +277,44 @@ class AdwDisplayPending:
                 SlTrace.lg(f"{self.npending} display_pending prev = {self.prev_npending}",
                            "display_pending")
                 self.prev_npending = self.npending
+            SlTrace.lg(lambda: f"display_pending: {len(items)} of"
+                               f" {self.npending} items", "display_pending")
+            clip_rect = None
+            if rects is not None and len(rects) > 0:
+                clip_rect = wx.Rect(rects[0])
+                for rect in rects[1:]:
+                    clip_rect = clip_rect.Union(rect)
             create_cursor = None
             create_mag_select = None
-            for diitem in self.items:
+            for diitem in items:
                 if diitem.canv_type == "create_cursor":
                     SlTrace.lg(f"diitem:{diitem}", "display_pending")
                     create_cursor = diitem
                 elif diitem.canv_type == "create_mag_select":
                     create_mag_select = diitem
                 else:    
-                    self.display_item(diitem)
+                    self.display_item(diitem, rect=clip_rect, dc=dc)
             if create_cursor is not None:
-                self.display_item(create_cursor)
-            #self.items = []     # Clear list
+                self.display_item(create_cursor, rect=clip_rect, dc=dc)
     
-    def display_item(self, item):
+    def display_item(self, item, rect=None, dc=None):
         """ Display item
         :diitem: DisplayListItem item to display
+        :rect: limit drawing to this rectangle default: no limit
+        :dc: device context default: grid panel wx.PaintDC
         """
         if self.disp_fun:
             self.disp_fun(item)
             return
-        self.draw_item(item)
+        self.draw_item(item, rect=rect, dc=dc)
 
-    def draw_item(self, item):
+    def draw_item(self, item, rect=None, dc=None):
         """ Draw item
         :item: CanvasPanalItem/canv_id item to draw
+        :rect: limit drawing to this rectangle default: no limit
+        :dc: device context default: grid panel wx.PaintDC
         """
-        self.canv_pan.draw_item(item)
+        self.canv_pan.draw_item(item, rect=rect, dc=dc)
             
     def set_display_item_fun(self, disp_fun):
         """ Set display item function
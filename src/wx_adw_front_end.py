@@ -6,7 +6,6 @@ Created in an attempt to pare down audio_draw_window.py size
 """
 import wx
 import sys
-from math import sqrt
 from datetime import datetime
 import time 
 
@@ -99,6 +98,8 @@ class AdwFrontEnd:
         self.pos_rep_ix_prev = None    # previous report location 
         self.pos_rep_iy_prev = None
         self.pos_rep_str_prev = None    # previous position report
+        self.pos_rep_seq = 0            # position report number, groups
+                                        # a report's tones in sound queue
         self.pos_check_interval = pos_check_interval
         self.goto_travel_list_index = 0
         self._echo_input = True     # True -> speak input
@@ -130,13 +131,21 @@ class AdwFrontEnd:
         :ixy: ix,iy tuple
         """
         self.goto_cell_list.append(ixy)
+        self.goto_cell_set.add(ixy)
 
     def clear_goto_cell_list(self):
         self.goto_cell_list = []
+        self.goto_cell_set = set()  # For membership tests
 
     def get_goto_cell_list(self):
         return self.goto_cell_list
 
+    def is_goto_cell(self, ixy):
+        """ Check if cell is in goto history
+        :ixy: ix,iy tuple
+        """
+        return ixy in self.goto_cell_set
+
     def set_initial_location(self):
         """ Set/Reset initial location of cursor
         """
@@ -1037,6 +1046,38 @@ class AdwFrontEnd:
         """
         return self._color
 
+    def get_runs_in_dir(self, ixy, dir):
+        """ Get runs of cells/blanks from cell in given direction
+        :ixy: ixy cell tuple
+        :dir: direction (change-x, change-y) tuple
+        :returns: iterable of (length, color, end_ixy) where
+                    color: color string of same-color cells
+                            None for blanks
+                    end_ixy: ix,iy of last location in run
+                Runs stop at edge
+        """
+        chg_x, chg_y = dir
+        if (chg_x == 0) != (chg_y == 0) and abs(chg_x + chg_y) == 1:
+            if chg_y == 0:
+                idx_min, idx_max = self.get_ix_min(), self.get_ix_max()
+            else:
+                idx_min, idx_max = self.get_iy_min(), self.get_iy_max()
+            return self.adw.cell_runs.runs_in_dir(ixy, dir, self.get_cells(),
+                                                  idx_min, idx_max)
+
+        runs = []           # Other directions - group locations
+        for loc in self.get_cells_in_dir(ixy=ixy, dir=dir):
+            if isinstance(loc, BrailleCell):
+                color = loc.color_string()
+                loc = (loc.ix,loc.iy)
+            else:
+                color = None
+            if runs and runs[-1][1] == color:
+                runs[-1] = (runs[-1][0]+1, color, loc)
+            else:
+                runs.append((1, color, loc))
+        return runs
+
     def loc_list_target(self, pos_ixy, name, dir):
         """ Create target (msg, ixy) of search
         msg: text description of range
@@ -1053,77 +1094,54 @@ class AdwFrontEnd:
         :returns: (msg_text, target_ixy)
         """
         cell = self.get_cell_at_ixy(pos_ixy)
-        loc_list = self.get_cells_in_dir(ixy=pos_ixy, dir=dir)
+        runs = iter(self.get_runs_in_dir(ixy=pos_ixy, dir=dir))
         msg = ""
         target_ixy = pos_ixy
+        ncell = 0               # Cells in string
+        colors = {}
+        nblank = 0              # Blanks in string
+        cell_end = None         # Color of cell terminating blanks
+        for run_len, color, end_ixy in runs:
+            if color is None:
+                if ncell > 0:
+                    break       # End of string of cells
+                nblank = run_len
+                target_ixy = end_ixy    # move along blanks
+                next_run = next(runs, None)
+                if next_run is not None:    # Cell after blanks
+                    cell_end = next_run[1]
+                    target_ixy = (end_ixy[0]+dir[0], end_ixy[1]+dir[1])
+                break
+            ncell += run_len
+            colors[color] = 1
+            target_ixy = end_ixy    # move as string grows
 
         if cell is not None:
-            colors = {}         # Inside figure
-            ncell = 0
-            ntblank = 0         # Count trailing blanks if at edge
-            cell_end = None     # Set if terminating cell
-            for lcell in loc_list:
-                if isinstance(lcell, BrailleCell):
-                    ncell += 1
-                    colors[lcell.color_string()] = 1
-                    target_ixy = (lcell.ix, lcell.iy)   # move as string grows
-                else:
-                    if ncell == 0:
-                        for ltblank in loc_list:
-                            if not isinstance(ltblank, tuple):
-                                cell_end = ltblank   # Set if we have a cell at end
-                                target_ixy = (cell_end.ix, cell_end.iy)
-                                break
-                            ntblank += 1
-                            target_ixy = ltblank
-
-
-                    break
-            if ncell > 0:
+            if ncell > 0:               # Inside figure
                 plr = "s" if ncell > 1 else ""      # part of string
                 msg += f"{ncell} "
                 msg +=  '&'.join(sorted(colors.keys()))
                 msg += plr
                 msg += f" to {name}"
             else:
-                if ntblank > 0:                 # Single cell
-                    plr = "s" if ntblank  > 1  else ""
-                    msg += f"{ntblank} "
+                if nblank > 0:                 # Single cell
+                    plr = "s" if nblank  > 1  else ""
+                    msg += f"{nblank} "
                     msg += f"blank{plr}"
                     if cell_end is not None:
-                        msg += f" to a {cell_end.color_string()}"
+                        msg += f" to a {cell_end}"
                     msg += f" at {name}"
         else:
-            nblank = 0      # Outside figure
-            ntcell = 0      # Number of trailing cells
-            cell_end = None         # Set if we have a cell at end
-            tcell_colors = {}
-            for loc_or_cell in loc_list:
-                if isinstance(loc_or_cell, tuple):
-                    nblank += 1
-                    target_ixy = loc_or_cell    # move along blanks
-                else:
-                    cell_end = loc_or_cell    # Cell after end
-                    target_ixy = (cell_end.ix,cell_end.iy)
-                    if nblank == 0:
-                        for ltcell in loc_list[nblank:]:
-                            if not isinstance(ltcell, BrailleCell):
-                                break
-                            ntcell += 1
-                            tcell_colors[ltcell.color_string()] = 1
-                            target_ixy = (ltcell.ix, ltcell.iy)
-
-                    break
             if nblank > 0:      # Are there a string of blanks
                 plr = "s" if nblank  > 1  else ""
                 msg = f"{nblank} blank{plr} to {name}"
                 if cell_end is not None:
-                    msg += f" to a {cell_end.color_string()}"
+                    msg += f" to a {cell_end}"
             else:
-                if ntcell > 0:
-                    msg += f"{ntcell} "
-                    msg +=  '&'.join(sorted(tcell_colors.keys()))
-                    plr = "s" if ntcell  > 1  else ""
+                if ncell > 0:
+                    msg += f"{ncell} "
+                    msg +=  '&'.join(sorted(colors.keys()))
+                    plr = "s" if ncell  > 1  else ""
                     msg += plr
                 msg += f" to {name}"
         return (msg,target_ixy)
@@ -1318,19 +1336,10 @@ class AdwFrontEnd:
             return 0,0,0, cell        # On drawing
 
         pt_ixy = self.get_ixy_at((x,y))
-        cell_closest = None         # Set if found
-        min_dist = None
-        min_dist_x = 0      # x,y offset at min dist
-        min_dist_y = 0
-        pt_ix, pt_iy = pt_ixy
-        for cell_ixy in self.get_cells():
-            cell_ix, cell_iy = cell_ixy
-            dist = sqrt((cell_ix-pt_ix)**2 + (cell_iy-pt_iy)**2)
-            if min_dist is None or dist < min_dist:
-                min_dist = dist
-                min_dist_x = cell_ix - pt_ix
-                min_dist_y = cell_iy - pt_iy
-                cell_closest = self.get_cells()[cell_ixy]    # Closest so far
+        # Table lookup in distance transform, maintained with cells
+        min_dist, min_dist_x, min_dist_y, closest_ixy = (
+                    self.adw.cell_distances.nearest(pt_ixy, cells))
+        cell_closest = cells[closest_ixy]
         if min_dist <= 0:
             min_dist = .001     # Saving 0 for in display element
         return min_dist, min_dist_x, min_dist_y, cell_closest
@@ -1434,15 +1443,19 @@ class AdwFrontEnd:
             ix,iy = self.get_ixy_at()
             SlTrace.lg(f"from get_ixy_at(): ix:{ix} iy:{iy}",
                        "pos_tracking")
+            self.pos_rep_seq += 1       # Newer reports replace queued older
             if self.is_using_audio_beep() and not with_voice:
                 audio_beep = self.get_audio_beep()
-                audio_beep.announce_pcell((ix,iy), dly=0)
+                audio_beep.announce_pcell((ix,iy), dly=0, key="pos_tone",
+                                          group=self.pos_rep_seq)
                 ###self.update()
                 grid_path = self.get_grid_path()
                 if grid_path is not None:
                     pcells = grid_path.get_next_positions(max_len=self.get_look_dist())
                     ###self.update()
-                    audio_beep.announce_next_pcells(pc_ixys=pcells)
+                    audio_beep.announce_next_pcells(pc_ixys=pcells,
+                                                    key="pos_tone",
+                                                    group=self.pos_rep_seq)
             else:
                 if self.rept_at_loc or with_voice:
                     rep_str += f" at row {iy+1} column {ix+1}"
@@ -1450,7 +1463,7 @@ class AdwFrontEnd:
                         or ix != self.pos_rep_ix_prev    # Avoid repeats
                         or iy != self.pos_rep_iy_prev):
                     self.win_print(rep_str, end= "\n")
-                    self.speak_text(rep_str)
+                    self.speak_text(rep_str, key="pos_report")
                     self.pos_rep_time = datetime.now()  # Time of last report
                     self.pos_rep_ix_prev = ix
                     self.pos_rep_iy_prev = iy
@@ -1545,6 +1558,8 @@ class AdwFrontEnd:
         self.erase_cell(cell)
         cells = self.get_cells()
         del cells[(cell.ix,cell.iy)]
+        self.adw.cell_distances.remove_cell((cell.ix,cell.iy), cells)
+        self.adw.cell_runs.remove_cell((cell.ix,cell.iy), cells)
 
 
     def key_mark(self, val=True):
@@ -2097,7 +2112,7 @@ class AdwFrontEnd:
 
     def speak_text(self, msg, dup_stdout=True,
                    msg_type=None,
-                   rate=None, volume=None):
+                   rate=None, volume=None, key=None):
         """ Speak text, if possible else write to stdout
         :msg: text message, iff speech
         :dup_stdout: duplicate to stdout default: True
@@ -2108,10 +2123,11 @@ class AdwFrontEnd:
         :rate: speech rate words per minute
                 default: 240
         :volume: volume default: .9            
+        :key: replace queued messages with this key default: none
         """
         self.adw.speak_text(msg=msg, msg_type=msg_type,
                             dup_stdout=dup_stdout,
-                            rate=rate, volume=volume)
+                            rate=rate, volume=volume, key=key)
 
     def mainloop(self):
         self.adw.mainloop()
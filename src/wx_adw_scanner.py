@@ -10,6 +10,7 @@ import time
 import copy
 import cProfile, pstats, io         # profiling support
 import wx
+import numpy as np
 
 from wx_stuff import wx_Point
 from sinewave_numpy import SineWaveNumPy
@@ -255,6 +256,7 @@ class AdwScanner:
         scan_items = []         # Populated with used scan items
 
         run_color = None                            # color in run
+        trace_scanning = SlTrace.enabled("scanning")
         while len(items_raw_left) > 0:              # Loop over raw items
             n_skip = 0                              # avoid too long a skip
             while len(items_raw_left) > 0:          # In skipping loop
@@ -291,13 +293,15 @@ class AdwScanner:
                         break
                 else:
                     break
-                SlTrace.lg(f"skipping {item}", "scanning")
-            SlTrace.lg(f"scanning {item}", "scanning")
+                if trace_scanning:
+                    SlTrace.lg(f"skipping {item}")
+            if trace_scanning:
+                SlTrace.lg(f"scanning {item}")
             if item.cell is None:
                 SlTrace.lg(f"None: scanning {item}")
 
             scan_items.append(item)
-        if SlTrace.trace("scanning"):
+        if trace_scanning:
             SlTrace.lg(f"get_scan_items returns:")
             for si in scan_items:
                 SlTrace.lg(f"  {si}")
@@ -360,6 +364,7 @@ class AdwScanner:
         :cells: cells dictionary by ix,iy default: self.cells
         :nitem; number of items to return
         :use_sinewave_numpy: if present add sinewave_numpy entry to each item
+                combine_wave uses pitch, dur, vol - see make_combine_wave
         :returns: list of ScanPathItem in the order to scan at most
                     nitem per call
                     Last return len < nitem
@@ -372,22 +377,21 @@ class AdwScanner:
             self.pr = cProfile.Profile()
             self.pr.enable()
         begin_time = time.time()
-        next_items = []
+        next_items = self.scan_items[self.scan_items_index:
+                                     min(self.scan_items_index+nitem,
+                                         self.scan_items_end)]
+        self.scan_items_index += len(next_items)
         vol_adj = self.get_vol_adj()
         SlTrace.lg(f"Scanning vol_adj: {vol_adj}")
-        for _ in range(nitem):
-            if self.scan_items_index >= self.scan_items_end:
-                return next_items
-            sp_ent = self.scan_items[self.scan_items_index]
-            next_items.append(sp_ent)
-            self.scan_items_index += 1
+        vols_left, vols_right = self.get_vols(
+                                    ixs=[sp_ent.ix for sp_ent in next_items],
+                                    iys=[sp_ent.iy for sp_ent in next_items])
+        if abs(vol_adj) > 1.e-10:  # Only if non-trivial
+            vols_left += vol_adj
+            vols_right += vol_adj
+        for i, sp_ent in enumerate(next_items):
             ix,iy = sp_ent.ix,sp_ent.iy
-            volume = self.get_vol(ix=ix, iy=iy)
-            vol_left, vol_right = volume
-            vol_adj = self.get_vol_adj()
-            if abs(vol_adj) > 1.e-10:  # Only if non-trivial
-                vol_left += vol_adj
-                vol_right += vol_adj
+            vol_left, vol_right = float(vols_left[i]), float(vols_right[i])
             if sp_ent.cell is None:
                 pitch = self.space_pitch
                 item_time = self.space_time
@@ -397,7 +401,8 @@ class AdwScanner:
             sp_ent.pitch = pitch
             sp_ent.dur = item_time
             sp_ent.vol = (vol_left, vol_right)
-            if not self.scan_use_tone or use_sinewave_numpy:
+            if use_sinewave_numpy or (not self.scan_use_tone
+                                      and not self.combine_wave):
                 sinewave_numpy = SineWaveNumPy(pitch = pitch,
                                                duration=item_time,
                                                decibels_left=vol_left,
@@ -470,6 +475,37 @@ class AdwScanner:
                    "sound_volume")
         return vol_l,vol_r
 
+    def get_vols(self, ixs, iys, eye_ixy_l=None, eye_ixy_r=None):
+        """ Get tone volumes for many cells at once, as get_vol
+        :ixs: cell ix values
+        :iys: cell iy values
+        :eye_xy_l: left eye/ear at x,y default: self.eye_xy_l
+        :eye_xy_r: right eye/ear at x,y  default: self.eye_xy_r
+        :returns: (left volumes, right volumes) ndarrays in decibel
+        """
+        if eye_ixy_l is None:
+            eye_ixy_l = self.eye_ixy_l
+        if eye_ixy_r is None:
+            eye_ixy_r = self.eye_ixy_r
+        eye_ix_l, eye_iy_l = eye_ixy_l
+        eye_ix_r, eye_iy_r = eye_ixy_r
+        eye_ix = (eye_ix_l+eye_ix_r)/2
+        eye_iy = (eye_iy_l+eye_iy_r)/2
+        ixs = np.asarray(ixs, dtype=float)
+        iys = np.asarray(iys, dtype=float)
+        dist = np.hypot(ixs-eye_ix, iys-eye_iy)   # average dist
+        k1 = 2
+        k2 = 10
+        kd = .5
+        vol = k1*(k2-dist*kd)
+        SILENT = -100
+        width = abs(self.view_right - self.view_left)
+        vol_l = (vol*np.abs(self.view_right-ixs)/width
+                 + SILENT*np.abs(self.view_left-ixs)/width)
+        vol_r = (vol*np.abs(self.view_left-ixs)/width
+                 + SILENT*np.abs(self.view_right-ixs)/width)
+        return vol_l,vol_r
+
 
     def start_scan(self):
         """ Start actualscanning, which continues until stop_scan
@@ -589,12 +625,11 @@ class AdwScanner:
                 wx.CallAfter(self.scan_loop_checking)
                 self.scan_loop_checking = None
             self.forward_path = self.get_more_scan_path(nitem=
-                                                        len(self.scan_items),
-                                                        use_sinewave_numpy=True)
+                                                        len(self.scan_items))
             self.forward_paths = self.divide_path(self.forward_path,
                                                   n_section=self.n_combine_wave)
             if self.add_tone_preamble:
-                self.forward_path[0] = self.add_preamble(self.forward_path[0])
+                self.forward_paths[0] = self.add_preamble(self.forward_paths[0])
             self.forward_waves = []
             for path in self.forward_paths:
                 wave = self.make_combine_wave(path)
@@ -648,11 +683,7 @@ class AdwScanner:
         else:
             item_model = copy.copy(items[0])
         ix_start,iy_start = item_model.ix,item_model.iy
-        sinewave_numpy = item_model.sinewave_numpy
-        if sinewave_numpy is None:
-            sample_rate = self.sample_rate
-        else:
-            sample_rate =  sinewave_numpy.sample_rate
+        sample_rate = self.sample_rate
         nitem = 5
         cpsp = SineWaveBeep.cpsp        # Pitch spacing
         pitch_start = SineWaveBeep.color2pitch("SPACE") + 15*cpsp
@@ -675,7 +706,9 @@ class AdwScanner:
                                            decibels_right=vol_right,
                                            sample_rate=sample_rate)
             preamble_item = ScanPathItem(ix=ix, iy=iy,
-                                         sinewave_numpy=sinewave_numpy)
+                                         sinewave_numpy=sinewave_numpy,
+                                         pitch=pitch, dur=duration)
+            preamble_item.vol = (vol_left, vol_right)
             preamble_items.append(preamble_item)
         items_new[:0] = preamble_items[:]
         return items_new
@@ -705,13 +738,17 @@ class AdwScanner:
 
     def make_combine_wave(self, item_path):
         """ Create a SinewaveNumpy.sinewave_numpy ndarray of the items components
-        :itempath: list of ScanPathItem s with  sinewave_numpy   field set 
-                        Note that get_scan_items_raw needs self.
-        :returns: SpeakerWaveform of combined item waveforms
+        :itempath: list of ScanPathItem s with pitch, dur, vol set
+                    (see get_more_scan_path)
+        :returns: SineWaveNumPy of combined item waveforms
         """
         SlTrace.lg(f"make_combine_wave: {len(item_path)} items")
-        swnps = [sp_ent.sinewave_numpy for sp_ent in item_path]
-        cw_swnp = SineWaveNumPy.concatinate(swnps)
+        cw_swnp = SineWaveNumPy.synthesize_path(
+                    pitches=[sp_ent.pitch for sp_ent in item_path],
+                    durations=[sp_ent.dur for sp_ent in item_path],
+                    decibels_left=[sp_ent.vol[0] for sp_ent in item_path],
+                    decibels_right=[sp_ent.vol[1] for sp_ent in item_path],
+                    sample_rate=self.sample_rate)
         return cw_swnp
 
     def color2pitch(self, color):
@@ -3,7 +3,10 @@
 """ 
 Audio Support for audio_window using wxPython
 """
-import winsound
+try:
+    import winsound
+except ImportError:
+    winsound = None     # Not Windows - sinewave only
 from select_trace import SlTrace
 from wx_sinewave_beep import SineWaveBeep
 
@@ -85,14 +88,17 @@ class AudioBeep:
                 self.announce_pcell(pc_ixy, dur)
                 dur //= 2
         
-    def announce_next_pcells(self, pc_ixys, dur=None):
+    def announce_next_pcells(self, pc_ixys, dur=None, key=None, group=None):
         """ Announce what we're up against
         200 ms first cell, 100 ms second cell 50 ms
         :pc_ixys: list of possible cells ixy
         :dur: max duration of beep default: 200 
+        :key: replace queued tones with this key default: none
+        :group: don't replace tones of this key, group default: replace
         """
         if self.has_sinewave:
-            self.sinewave_beep.announce_next_pcells(pc_ixys, dur)
+            self.sinewave_beep.announce_next_pcells(pc_ixys, dur=dur,
+                                                    key=key, group=group)
         else:
             if dur is None:
                 dur = self.beep_dur
@@ -110,17 +116,20 @@ class AudioBeep:
             self.announce_pcell(pc_ixy=pc_ixy,
                                  dur=int(self.beep_dur*.5))
         
-    def announce_pcell(self, pc_ixy, dur=None, dly=None):
+    def announce_pcell(self, pc_ixy, dur=None, dly=None, key=None, group=None):
         """ Announce cell
         :pc_ixy: ix,iy indexes
         :dur: duration default: pass on down
         :dly: delay before the sound default: pass on down
+        :key: replace queued tones with this key default: none
+        :group: don't replace tones of this key, group default: replace
         """
         if self.silence():
             return
         
         if self.has_sinewave:
-            self.sinewave_beep.announce_pcell(pc_ixy, dur=dur, dly=dly)
+            self.sinewave_beep.announce_pcell(pc_ixy, dur=dur, dly=dly,
+                                              key=key, group=group)
         else:
             if dur is None:
                 dur = self.beep_dur
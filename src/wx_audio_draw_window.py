@@ -31,6 +31,10 @@ from wx_canvas_panel import CanvasPanel
 from wx_braille_cell_list import BrailleCellList
 from wx_tk_rpc_user import TkRPCUser
 from wx_canvas_panel_item import CanvasPanelItem
+from wx_braille_cell_atlas import BrailleCellAtlas
+from cell_distance_transform import CellDistanceTransform
+from cell_run_index import CellRunIndex
+from braille_text import get_braille_text
 
 class AudioDrawWindow(wx.Frame):
     def __init__(self,
@@ -231,6 +235,9 @@ class AudioDrawWindow(wx.Frame):
         self.grid_width = grid_width
         self.grid_height = grid_height
         self.canv_pan = CanvasPanel(self)
+        self.cell_atlas = BrailleCellAtlas()    # Pre-rendered cell bitmaps
+        self.cell_distances = CellDistanceTransform(grid_width, grid_height)
+        self.cell_runs = CellRunIndex(grid_width, grid_height)
         if shift_to_edge is None:
             shift_to_edge = True
         self.shift_to_edge = shift_to_edge
@@ -336,12 +343,15 @@ class AudioDrawWindow(wx.Frame):
 
     def exit(self, rc=None):
         """ Main exit if creating magnifications
+        :returns: True if pgmExit handled exit, process continuing
+                e.g. display server session closing
         """
         if rc is None:
             rc = 0
         if self.pgmExit is not None:
-            self.pgmExit()      # Use supplied pgmExit
-            
+            if self.pgmExit():      # Use supplied pgmExit
+                return True
+
         SlTrace.lg("AudoDrawWindow.exit", "adw")
         SlTrace.onexit()    # Force logging quit
         os._exit(0)
@@ -359,7 +369,7 @@ class AudioDrawWindow(wx.Frame):
 
     def speak_text(self, msg, dup_stdout=True,
                    msg_type=None,
-                   rate=None, volume=None):
+                   rate=None, volume=None, key=None):
         """ Speak text, if possible else write to stdout
         :msg: text message, iff speech
         :dup_stdout: duplicate to stdout default: True
@@ -370,6 +380,7 @@ class AudioDrawWindow(wx.Frame):
         :rate: speech rate words per minute
                 default: 240
         :volume: volume default: .9            
+        :key: replace queued messages with this key default: none
         """
         self.win_print(msg)
         if self.is_silent():
@@ -379,7 +390,7 @@ class AudioDrawWindow(wx.Frame):
         
         self.speaker_control.speak_text(msg=msg, msg_type=msg_type,
                              dup_stdout=dup_stdout,
-                             rate=rate, volume=volume)
+                             rate=rate, volume=volume, key=key)
 
     def stop_speak_text(self):
         """ Stop ongoing speach, flushing queue
@@ -391,7 +402,7 @@ class AudioDrawWindow(wx.Frame):
         This is the number of steps from cell(ix,iy) in 
         direction (dir_x,dir_y) while still in self.cells[]
         traversal is stopped at traversed cells - in
-        self.goto_cell_list
+        the front end's goto cells
         :ix: cell x-index
         :iy: cell y_index
         :dir_x: x change each step
@@ -406,6 +417,15 @@ class AudioDrawWindow(wx.Frame):
         if dir_x == 0 and dir_y == 0:
             return 0,0
         
+        goto_cells = self.fte.goto_cell_set
+        if (dir_x == 0) != (dir_y == 0) and abs(dir_x + dir_y) == 1:
+            # Horizontal/vertical - use row/column runs
+            tlen_forward = self.cell_runs.span_in_dir(
+                (ix,iy), (dir_x,dir_y), self.cells, stops=goto_cells)
+            tlen_backward = self.cell_runs.span_in_dir(
+                (ix,iy), (-dir_x,-dir_y), self.cells, stops=goto_cells)
+            return tlen_forward,tlen_backward
+            
         tlen_forward = 0
         ix_f = ix
         iy_f = iy
@@ -414,7 +434,7 @@ class AudioDrawWindow(wx.Frame):
             iy_f += dir_y
             if (ix_f,iy_f) not in self.cells:
                 break
-            if (ix_f,iy_f) in self.get_goto_cell_list():
+            if (ix_f,iy_f) in goto_cells:
                 break
             tlen_forward += 1   # traversal extended
 
@@ -428,7 +448,7 @@ class AudioDrawWindow(wx.Frame):
             iy_b -= dir_y
             if (ix_b,iy_b) not in self.cells:
                 break
-            if (ix_b,iy_b) in self.get_goto_cell_list():
+            if (ix_b,iy_b) in goto_cells:
                 break
             tlen_backward += 1   # traversal extended
         return tlen_forward,tlen_backward
@@ -459,6 +479,8 @@ class AudioDrawWindow(wx.Frame):
                     cs[(bcell.ix,bcell.iy)] = bcell
                 cells = cs
             self.cells = cells      # Copy
+        self.cell_distances.invalidate()    # New figure
+        self.cell_runs.invalidate()
         min_x, max_y, max_x,min_y = self.bounding_box(cells=cells)
         if min_x is not None:
             SlTrace.lg(f"Drawn cells bounding box", "draw_cells")            
@@ -507,22 +529,14 @@ class AudioDrawWindow(wx.Frame):
             right_edge = self.grid_width-1
             bottom_edge = self.grid_height-1
 
-        braille_text = ""
-        for iy in range(top_edge, bottom_edge):
-            line = ""
-            for ix in range(left_edge, right_edge+1):
-                cell_ixy = (ix,iy)
-                if cell_ixy in self.cells:
-                    cell = self.cells[cell_ixy]
-                    color = cell.color_string()
-                    line += color[0]
-                else:
-                    line += " "
-            line = line.rstrip()
-            if self.blank_char != " ":
-                line = line.replace(" ", self.blank_char)
-            ###print(f"{iy:2}", end=":")
-            braille_text += line + "\n"
+        cell_colors = {ixy : cell.color_string()
+                       for ixy, cell in self.cells.items()}
+        braille_text = get_braille_text(cell_colors,
+                            grid_width=self.grid_width,
+                            grid_height=self.grid_height,
+                            edges=(left_edge, top_edge,
+                                   right_edge, bottom_edge),
+                            blank_char=self.blank_char)
         data = f"\n{id_title}"
         data += f"\n{title}\n"
         data += braille_text
@@ -538,15 +552,17 @@ class AudioDrawWindow(wx.Frame):
         """
         if title is not None:
             print(title)
-        for ix in range(self.grid_width):
-            for iy in range(self.grid_height):
-                cell_ixy = (ix,iy)
-                if cell_ixy in self.cells:
-                    cell = self.cells[cell_ixy]
-                    SlTrace.lg(f"ix:{ix} iy:{iy} {cell_ixy}"
-                               f" {cell._color}"
-                          f" rect: {self.get_cell_rect_tur(ix,iy)}"
-                          f"  win rect: {self.get_cell_rect_win(ix,iy)}")
+        cell_ixys = [(ix,iy) for ix in range(self.grid_width)
+                     for iy in range(self.grid_height)
+                     if (ix,iy) in self.cells]
+        cell_rects = self.get_cell_rect_turs(cell_ixys)
+        for cell_ixy, cell_rect in zip(cell_ixys, cell_rects):
+            ix,iy = cell_ixy
+            cell = self.cells[cell_ixy]
+            SlTrace.lg(f"ix:{ix} iy:{iy} {cell_ixy}"
+                       f" {cell._color}"
+                  f" rect: {cell_rect}"
+                  f"  win rect: {self.get_cell_rect_win(ix,iy)}")
         SlTrace.lg("")
 
     def find_edges(self):
@@ -689,8 +705,10 @@ class AudioDrawWindow(wx.Frame):
         if min_ix is None:
             return None,None,None,None      # No figure
         
-        min_x, max_y, _, _ = self.get_cell_rect_tur(min_ix,min_iy)
-        _, _, max_x, min_y = self.get_cell_rect_tur(max_ix,max_iy)
+        min_rect, max_rect = self.get_cell_rect_turs([(min_ix,min_iy),
+                                                      (max_ix,max_iy)])
+        min_x, max_y, _, _ = min_rect
+        _, _, max_x, min_y = max_rect
         SlTrace.lg(f"bounding_box: min_x,max_y, max_x, min_y {min_x,max_y, max_x, min_y}",
                    "bounding_box")
         return min_x,max_y, max_x, min_y
@@ -753,8 +771,8 @@ class AudioDrawWindow(wx.Frame):
             bd_iy_min = self.get_iy_min()
             if ext_iy_max < bd_iy_min: ext_ix_max = bd_iy_min
             iy_max = min(ext_iy_max, self.get_iy_max())
-        SlTrace.lg(f"bounding_box_ci: ix_min,iy_min, ix_max,iy_max: {ix_min,iy_min, ix_max,iy_max}",
-                   "adw")    
+        SlTrace.lg(lambda: f"bounding_box_ci: ix_min,iy_min, ix_max,iy_max:"
+                           f" {ix_min,iy_min, ix_max,iy_max}", "adw")
         return ix_min,iy_min, ix_max,iy_max
             
 
@@ -859,6 +877,10 @@ class AudioDrawWindow(wx.Frame):
             self.erase_cell(cell)
             return              # Nothing to show
         
+        if not show_points:
+            self.display_cell_sprite(cell)
+            return
+
         ix = cell.ix
         iy = cell.iy
         comp_id = self.canv_pan.create_composite(disp_type=CanvasPanelItem.DT_CELL,
@@ -880,60 +902,70 @@ class AudioDrawWindow(wx.Frame):
                                     outline="dark gray")
         comp_item.add(canv_id)
         
-        color = self.color_str(cell._color)
-        if len(color) < 1 or color[0] not in BrailleCell.color_for_character:
-            color = "black"
-        if show_points:
-            dot_size = 1            # Display cell points
-            dot_radius = dot_size//2
-            if dot_radius < 1:
-                dot_radius = 1
-                dot_size = 2
-            for pt in cell.points:
-                dx,dy = self.get_point_win(pt)
-                x0 = dx-dot_radius
-                y0 = dy+dot_size 
-                x1 = dx+dot_radius 
-                y1 = dy
-                canv_id = self.canv_pan.create_oval(x0,y0,x1,y1,
-                                                fill=color)
-                cell.canv_items.append(canv_id)
-                SlTrace.lg(f"canv_pan.create_oval({x0},{y0},{x1},{y1}, fill={color})", "aud_create")
-        else:            
-            dots = cell.dots
-            cell_width = cx2-cx1
-            cell_height = cy2-cy1       # y increases down
-            # Fractional offsets from lower left corner
-            # of cell rectangle
-            ll_x = cx1      # Lower left corner
-            ll_y = cy1
-            ox1 = ox2 = ox3 = .3 
-            ox4 = ox5 = ox6 = .7
-            oy1 = oy4 = .15
-            oy2 = oy5 = .45
-            oy3 = oy6 = .73
-            dot_size = .25*cell_width   # dot size fraction
-            dot_radius = dot_size//2
-            dot_offset = {1: (ox1,oy1), 4: (ox4,oy4),
-                        2: (ox2,oy2), 5: (ox5,oy5),
-                        3: (ox3,oy3), 6: (ox6,oy6),
-                        }
-            for dot in dots:
-                offsets = dot_offset[dot]
-                off_x_f, off_y_f = offsets
-                dx = ll_x + off_x_f*cell_width
-                dy = ll_y + off_y_f*cell_height
-                x0 = dx-dot_radius
-                y0 = dy+dot_size 
-                x1 = dx+dot_radius 
-                y1 = dy
-                canv_id = self.canv_pan.create_oval(x0,y0,x1,y1,
-                                                fill=color)
-                comp_item.add(canv_id) 
-                SlTrace.lg(f"canv_pan.create_oval({x0},{y0},{x1},{y1}, fill={color})", "aud_create")
+        color = self.cell_dot_color(cell)
+        dot_size = 1            # Display cell points
+        dot_radius = dot_size//2
+        if dot_radius < 1:
+            dot_radius = 1
+            dot_size = 2
+        for pt in cell.points:
+            dx,dy = self.get_point_win(pt)
+            x0 = dx-dot_radius
+            y0 = dy+dot_size 
+            x1 = dx+dot_radius 
+            y1 = dy
+            canv_id = self.canv_pan.create_oval(x0,y0,x1,y1,
+                                            fill=color)
+            cell.canv_items.append(canv_id)
+            SlTrace.lg(f"canv_pan.create_oval({x0},{y0},{x1},{y1}, fill={color})", "aud_create")
         self.refresh_cell(cell) 
         self.cursor_update()
         
+    def display_cell_sprite(self, cell):
+        """ Display cell's braille as one pre-rendered bitmap
+        from cell_atlas.  A cell already displayed has its
+        bitmap (sprite) replaced in place, so redisplay, e.g.
+        mark_cell on each cursor visit, adds no canvas items.
+        :cell: BrailleCell
+        """
+        ix = cell.ix
+        iy = cell.iy
+        cx1,cy1,cx2,cy2 = self.get_win_ullr_at_ixy_canvas((ix,iy))
+        SlTrace.lg(f"{ix},{iy}: {cell} :{cx1},{cy1}, {cx2},{cy2} ", "display_cell")
+        self.cell_atlas.set_geometry((self.draw_width(), self.draw_height(),
+                                      self.grid_width, self.grid_height))
+        bitmap = self.cell_atlas.get_bitmap(dots=cell.dots,
+                                            color=self.cell_dot_color(cell),
+                                            mtype=cell.mtype,
+                                            width=cx2-cx1, height=cy2-cy1)
+        sprite = cell.comp_item
+        if (sprite is not None and not sprite.deleted
+                and sprite.canv_type == "create_bitmap"
+                and self.canv_pan.items_by_id.get(sprite.canv_id) is sprite):
+            sprite.coords(cx1,cy1,cx2,cy2)
+            sprite.update(bitmap=bitmap)
+            sprite.desc = str(cell)
+        else:
+            sprite_id = self.canv_pan.create_bitmap(cx1,cy1,cx2,cy2,
+                                    bitmap=bitmap, desc=str(cell))
+            cell.canv_items.append(sprite_id)
+            sprite = self.canv_pan.id_to_item(sprite_id)
+            sprite.disp_type = CanvasPanelItem.DT_CELL
+            cell.comp_item = sprite
+        self.canv_pan.add_cell(sprite)      # Added, or reindexed on top
+        self.refresh_cell(cell) 
+        self.cursor_update()
+
+    def cell_dot_color(self, cell):
+        """ Get cell's dot display color
+        :cell: BrailleCell
+        :returns: color string, "black" if not a braille color
+        """
+        color = self.color_str(cell._color)
+        if len(color) < 1 or color[0] not in BrailleCell.color_for_character:
+            color = "black"
+        return color
+
     def display_cell_end(self, cell):
         """ Complete cell display
         :cell: BrailleCell to display
@@ -1380,6 +1412,8 @@ class AudioDrawWindow(wx.Frame):
         self.draw_cells(cells=self.cells)
         del self.cells
         self.cells = {}
+        self.cell_distances.invalidate()
+        self.cell_runs.invalidate()
         self.clear()
         self.key_pendown(False) # Raise pen off paper
         
@@ -1403,6 +1437,8 @@ class AudioDrawWindow(wx.Frame):
         if cell_ixy in self.cells:
             del self.cells[cell_ixy]
         self.cells[cell_ixy] = bc
+        self.cell_distances.add_cell(cell_ixy, self.cells)
+        self.cell_runs.add_cell(cell_ixy, self.cells)
         if show:
             self.display_cell(bc)
         return bc
@@ -1419,6 +1455,8 @@ class AudioDrawWindow(wx.Frame):
         dots = self.braille_for_color(color)
         bc = BrailleCell(ix=cell[0],iy=cell[1], dots=dots, color=color)
         self.cells[cell] = bc
+        self.cell_distances.add_cell(cell, self.cells)
+        self.cell_runs.add_cell(cell, self.cells)
         return bc
 
     def update(self, x1=None, y1=None, x2=None, y2=None, full=False):
@@ -1700,6 +1738,13 @@ class AudioDrawWindow(wx.Frame):
         """
         return self.tkr.get_cell_rect_tur(ix=ix, iy=iy)
 
+    def get_cell_rect_turs(self, ixys):
+        """ Get several cells' turtle rectangles, in one request
+        :ixys: list of (ix,iy) cell indexes
+        :returns: list of (min_x,max_y, max_x,min_y)
+        """
+        return self.tkr.get_cell_rect_turs(ixys)
+
     """
     Links to canvas panel - most are direct
     """
@@ -4,15 +4,16 @@
 
 """ Support for rpc in tkinter environment
     Execute calls using calls from main thread
+    Uses the framed protocol of wx_rpc (wx_rpc_frame.py)
 """
 
-import json
 import socket
 import inspect
 import traceback
-from threading import Thread
+from threading import Thread, Lock
 from select_trace import SlTrace
-SIZE = 2**16
+from wx_rpc_frame import send_frame, recv_frame, BATCH_CALL
+from wx_rpc import RPCClient    # Client for our framed protocol
 
 
 class RPCServer:
@@ -23,8 +24,10 @@ class RPCServer:
         self.bg = bg
         self.address = (host, port)
         self._methods = {}
-        cell_specs = bg.canvas_grid.get_cell_specs()
-        SlTrace.lg(f"\nRPCServer: bg.canvas_grid: {cell_specs}", "cell_specs,rpc")
+        self._blocking = set()      # Names of methods which may wait
+        if SlTrace.trace("cell_specs"):   # Avoid extra canvas scan
+            cell_specs = bg.canvas_grid.get_cell_specs()
+            SlTrace.lg(f"\nRPCServer: bg.canvas_grid: {cell_specs}", "cell_specs,rpc")
 
     def help(self) -> None:
         SlTrace.lg('REGISTERED METHODS:')
@@ -37,11 +40,17 @@ class RPCServer:
             Arguments:
             instance -> a class object
     '''
-    def registerMethod(self, function) -> None:
+    def registerMethod(self, function, blocking=False) -> None:
+        """ :blocking: True - method may wait (e.g. long poll)
+                    so is run in its own thread, not holding up
+                    the client's other requests  default: False
+        """
         try:
             self._methods.update({function.__name__ : function})
         except:
             raise Exception('A non method object has been passed into RPCServer.registerMethod(self, function)')
+        if blocking:
+            self._blocking.add(function.__name__)
 
     '''
         registerInstance: pass a instance of a class to register all its methods and attributes so they can be used by the client via rpcs
@@ -64,47 +73,73 @@ class RPCServer:
     '''
     def __handle__(self, client:socket.socket, address:tuple):
         SlTrace.lg(f'Managing requests from {address}.', "rpc")
+        send_lock = Lock()      # Blocking calls reply from own threads
         while True:
             try:
-                functionName, args, kwargs = json.loads(client.recv(SIZE).decode())
+                req_id, functionName, args, kwargs = recv_frame(client)
             except: 
                 SlTrace.lg(f'! Client {address} disconnected.')
                 break
             # Showing request Type
-            SlTrace.lg(f'> {address} : {functionName}({args})', "server,rpc")
+            SlTrace.lg(f'> {address} : [{req_id}] {functionName}({args})', "server,rpc")
             
-            try:
-                if "TK_EXECUTE_IN_MAIN_THREAD" in kwargs:
-                    SlTrace.lg(f"RPCServer.__handle__: TK_EXECUTE_IN_MAIN_THREAD:{functionName}",
-                               "server,rpc")
-                    del(kwargs["TK_EXECUTE_IN_MAIN_THREAD"])
-                    call_num = self.bg.set_call(self._methods[functionName],
-                                            *args, **kwargs)
-                    SlTrace.lg(f"RPCServer.__handle__: TK_EXECUTE_IN_MAIN_THREAD call_num:{call_num}",
-                               "server,rpc")
-                    ret = call_num
-                else:
-                    SlTrace.lg(f"direct call: {self._methods[functionName]}, {args}, {kwargs}", "direct_call,rpc")
-                    ret = self._methods[functionName](
-                                            *args, **kwargs)
-                    if ret is not None:
-                        SlTrace.lg(f"{functionName} ret: {ret}", "rpc")
-            except Exception as e:
-                estr = "Exception:" + str(e)
-                tbstk = traceback.extract_stack()
-                tbstk_lst = traceback.format_list(tbstk)
-                tbstr = "\n".join(tbstk_lst)
-                SlTrace.lg(f"RPCServer Exception: {estr}")
-                SlTrace.lg(f"__handle__({functionName}, {args}, {kwargs})")
-                SlTrace.lg(f"{tbstr}\n")
-                # Send back exeption if function called by client is not registred 
-                client.sendall(json.dumps(estr).encode())
+            if functionName in self._blocking:
+                Thread(target=self.call_reply,
+                       args=[client, send_lock, req_id,
+                             functionName, args, kwargs]).start()
             else:
-                client.sendall(json.dumps(ret).encode())
-
+                self.call_reply(client, send_lock, req_id,
+                                functionName, args, kwargs)
 
         SlTrace.lg(f'Completed request from {address}.',"rpc")
         client.close()
+
+    def call_reply(self, client, send_lock, req_id, functionName, args, kwargs):
+        """ Call method(s) and send reply frame
+        """
+        if functionName == BATCH_CALL:
+            ret = [self.call_method(*call) for call in args[0]]
+        else:
+            ret = self.call_method(functionName, args, kwargs)
+        try:
+            with send_lock:
+                send_frame(client, (req_id, True, ret))
+        except OSError as e:
+            SlTrace.lg(f"RPCServer reply [{req_id}] {functionName} failed: {e}")
+
+    def call_method(self, functionName, args, kwargs):
+        """ Call registered method, or queue it for the tkinter main thread
+        :returns: method's return, or call_num if queued,
+                "Exception:..." string if it failed
+        """
+        try:
+            if "TK_EXECUTE_IN_MAIN_THREAD" in kwargs:
+                SlTrace.lg(f"RPCServer.__handle__: TK_EXECUTE_IN_MAIN_THREAD:{functionName}",
+                           "server,rpc")
+                del(kwargs["TK_EXECUTE_IN_MAIN_THREAD"])
+                call_num = self.bg.set_call(self._methods[functionName],
+                                        *args, **kwargs)
+                SlTrace.lg(f"RPCServer.__handle__: TK_EXECUTE_IN_MAIN_THREAD call_num:{call_num}",
+                           "server,rpc")
+                ret = call_num
+            else:
+                SlTrace.lg(f"direct call: {self._methods[functionName]}, {args}, {kwargs}", "direct_call,rpc")
+                ret = self._methods[functionName](
+                                        *args, **kwargs)
+                if ret is not None:
+                    SlTrace.lg(f"{functionName} ret: {ret}", "rpc")
+        except Exception as e:
+            estr = "Exception:" + str(e)
+            tbstk = traceback.extract_stack()
+            tbstk_lst = traceback.format_list(tbstk)
+            tbstr = "\n".join(tbstk_lst)
+            SlTrace.lg(f"RPCServer Exception: {estr}")
+            SlTrace.lg(f"__handle__({functionName}, {args}, {kwargs})")
+            SlTrace.lg(f"{tbstr}\n")
+            # Send back exeption if function called by client is not registred 
+            return estr
+        
+        return ret
     
     def run(self) -> None:
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
@@ -115,60 +150,10 @@ class RPCServer:
             while True:
                 try:
                     client, address = sock.accept()
+                    client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
 
                     Thread(target=self.__handle__, args=[client, address]).start()
 
                 except KeyboardInterrupt:
                     SlTrace.lg(f'- Server {self.address} interrupted')
                     break
-
-
-
-class RPCClient:
-    def __init__(self, host:str='localhost', port:int=8080) -> None:
-        self.__sock = None
-        self.__address = (host, port)
-
-
-    def isConnected(self):
-        try:
-            self.__sock.sendall(b'test')
-            self.__sock.recv(SIZE)
-            return True
-
-        except:
-            return False
-
-
-    def connect(self):
-        try:
-            self.__sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            SlTrace.lg(f"connect({self.__address})")
-            self.__sock.connect(self.__address)
-        except EOFError as e:
-            SlTrace.lg(e)
-            SlTrace.lg(f"connect({self.__address})")
-            raise Exception('Client was not able to connect.')
-    
-    def disconnect(self):
-        try:
-            self.__sock.close()
-        except:
-            pass
-
-
-    def __getattr__(self, __name: str):
-        def excecute(*args, **kwargs):
-            self.__sock.sendall(json.dumps((__name, args, kwargs)).encode())
-
-            response = json.loads(self.__sock.recv(SIZE).decode())
-   
-            return response
-        
-        return excecute
-
-    def __del__(self):
-        try:
-            self.__sock.close()
-        except:
-            pass
\ No newline at end of file
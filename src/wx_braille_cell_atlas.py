@@ -0,0 +1,117 @@
+#wx_braille_cell_atlas.py  18Oct2026  crs, Author
+"""
+Pre-rendered braille cell images (glyph atlas) for AudioDrawWindow
+
+A braille cell display is a background rectangle plus up to six
+dots.  Instead of a rectangle and six oval canvas items per cell,
+each distinct (dots, color, mark type, cell size) is drawn once
+into a wx.Bitmap and reused, so a cell is displayed as one
+bitmap blit.  The atlas is cleared when the cell geometry
+changes (e.g. window resize).
+"""
+from collections import OrderedDict
+
+import wx
+
+from select_trace import SlTrace
+from braille_cell import BrailleCell
+
+
+class BrailleCellAtlas:
+    # Fractional dot centers from upper left of cell rectangle
+    DOT_OFFSET = {1: (.3,.15), 4: (.7,.15),
+                  2: (.3,.45), 5: (.7,.45),
+                  3: (.3,.73), 6: (.7,.73),
+                  }
+    DOT_SIZE = .25          # dot size fraction of cell width
+
+    def __init__(self, max_entries=512):
+        """ Setup empty atlas
+        :max_entries: maximum number of bitmaps kept, least
+                recently used dropped default: 512
+        """
+        self.max_entries = max_entries
+        self.bitmaps = OrderedDict()    # by key, most recent last
+        self.geometry = None            # geometry of current bitmaps
+        self.hits = 0
+        self.misses = 0
+        self.n_clears = 0
+
+    def set_geometry(self, geometry):
+        """ Set cell geometry, clearing atlas if changed
+        :geometry: hashable description of cell layout
+                e.g. (draw width, draw height, grid width, grid height)
+        """
+        if geometry != self.geometry:
+            if self.geometry is not None:
+                SlTrace.lg(f"BrailleCellAtlas: geometry {self.geometry}"
+                           f" => {geometry}", "cell_atlas")
+            self.clear()
+            self.geometry = geometry
+
+    def get_bitmap(self, dots, color, mtype, width, height):
+        """ Get cell bitmap, rendering if not present
+        :dots: cell's braille dots (1-6)
+        :color: dot color
+        :mtype: cell mark type e.g. BrailleCell.MARK_UNMARKED
+        :width: cell width (right - left)
+        :height: cell height (bottom - top)
+        :returns: wx.Bitmap of size (width+1, height+1)
+        """
+        key = (tuple(sorted(dots)), color, mtype, width, height)
+        bitmap = self.bitmaps.get(key)
+        if bitmap is not None:
+            self.bitmaps.move_to_end(key)
+            self.hits += 1
+            return bitmap
+
+        self.misses += 1
+        bitmap = self.render(*key)
+        self.bitmaps[key] = bitmap
+        while len(self.bitmaps) > self.max_entries:
+            self.bitmaps.popitem(last=False)
+        return bitmap
+
+    def render(self, dots, color, mtype, width, height):
+        """ Draw cell image, as previously drawn by
+        rectangle and oval canvas items
+        :returns: wx.Bitmap
+        """
+        bitmap = wx.Bitmap(int(width)+1, int(height)+1)
+        dc = wx.MemoryDC(bitmap)
+        if mtype == BrailleCell.MARK_UNMARKED:
+            fill = "#d3d3d3"
+        else:
+            fill = "#b0b0b0"
+        dc.SetPen(wx.Pen("dark gray", style=wx.SOLID))
+        dc.SetBrush(wx.Brush(fill, wx.SOLID))
+        dc.DrawRectangle(0, 0, int(width)+1, int(height)+1)
+
+        dot_size = self.DOT_SIZE*width
+        dot_radius = dot_size//2
+        dc.SetPen(wx.Pen("black", style=wx.SOLID))
+        dc.SetBrush(wx.Brush(color, wx.SOLID))
+        for dot in dots:
+            off_x_f, off_y_f = self.DOT_OFFSET[dot]
+            dx = off_x_f*width
+            dy = off_y_f*height
+            dc.DrawEllipse(int(dx-dot_radius), int(dy),
+                           int(2*dot_radius), int(dot_size))
+        dc.SelectObject(wx.NullBitmap)
+        SlTrace.lg(lambda: f"BrailleCellAtlas.render: dots:{dots} {color}"
+                           f" mtype:{mtype} {width}x{height}", "cell_atlas")
+        return bitmap
+
+    def clear(self):
+        """ Remove all bitmaps, keeping stats
+        """
+        if len(self.bitmaps) > 0:
+            self.n_clears += 1
+        self.bitmaps.clear()
+
+    def get_stats(self):
+        """ Get atlas statistics
+        :returns: dictionary of entries, hits, misses, clears
+        """
+        return dict(entries=len(self.bitmaps), hits=self.hits,
+                    misses=self.misses, clears=self.n_clears)
@@ -54,7 +54,9 @@ class BrailleDisplay:
                  tk_items=False,
                  canvas_items=False,
                  silent=False,
-                 speaker_control=None
+                 speaker_control=None,
+                 app=None,
+                 pgm_exit=None
                  ):
         """ Setup display
         :wxr
@@ -110,6 +112,11 @@ class BrailleDisplay:
         :silent: starting val default: False
         :speaker_control: unified sound speach and text control
                 default: create
+        :app: wx application object
+                default: create
+        :pgm_exit: function called upon exit request, returning
+                True if handled, with process continuing
+                default: self.exit - end process
         """
         self.id_title = id_title
         self.title = title
@@ -157,7 +164,12 @@ class BrailleDisplay:
         self.shift_to_edge = shift_to_edge
         self.tk_items = tk_items
         self.canvas_items = canvas_items
-        self.app = wx.App()
+        if app is None:
+            app = wx.App()
+        self.app = app
+        if pgm_exit is None:
+            pgm_exit = self.exit
+        self.pgm_exit = pgm_exit
         SlTrace.lg(f"\nBrailleDisplay: title: {title}\n display_list:{display_list}",
                    "cell_spec,braille_display")
         """
@@ -258,7 +270,7 @@ class BrailleDisplay:
                             title=title,
                             speaker_control=self.speaker_control,
                             iy0_is_top=True,
-                            pgmExit=self.exit,
+                            pgmExit=self.pgm_exit,
                             ###x_min=self.x_min, y_min=self.y_min,
                             ###x_max=self.x_max, y_max=self.y_max,
                             silent=silent)
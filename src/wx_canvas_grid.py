@@ -16,6 +16,7 @@ Provide list of canvas items overlapping a region (display cell rectangle).
 import sys
 import os
 import copy
+import bisect
 import tkinter as tk
 
 from select_trace import SlTrace
@@ -24,6 +25,8 @@ from braille_cell import BrailleCell
 from magnify_info import MagnifySelect, MagnifyInfo, MagnifyDisplayRegion
 from wx_speaker_control import SpeakerControlLocal
 import canvas_copy  # To support snapshot copy
+from canvas_item_index import CanvasItemIndex, CanvasChangeTracker
+from canvas_item_index import read_canvas_items
 
 """
 We now think explicit .base.fn_name is better
@@ -31,6 +34,108 @@ for indirect call of tk.Canvas calls:
     find_overlapping, gettags, itemconfigure, type
 """
 
+class CellSpecView:
+    """ Cell colors last returned for one set of get_cell_specs grid args
+    """
+    def __init__(self, cell_rects):
+        """ Setup view
+        :cell_rects: dictionary by (ix,iy) of cell canvas rectangle
+        """
+        self.cell_rects = cell_rects
+        self.cell_colors = {}       # by (ix,iy) color
+        self.serial = None          # Change serial when last updated
+        self.x_edges = self.get_axis_edges(0)
+        self.y_edges = self.get_axis_edges(1)
+
+    def get_axis_edges(self, axis):
+        """ Get cell edges along one axis, for bisection
+        A cell's x edges depend only on ix, y edges only on iy
+        :axis: 0 - x (ix), 1 - y (iy)
+        :returns: (lows, high_maxes, edges)
+                edges: list of (low, high, index) sorted by low
+                lows: edges' low values
+                high_maxes: running maximum of edges' high values
+        """
+        bounds = {}
+        for ixy, rect in self.cell_rects.items():
+            lo, hi = rect[axis], rect[axis+2]
+            bounds[ixy[axis]] = (min(lo,hi), max(lo,hi))
+        edges = sorted((lo, hi, index) for index, (lo, hi) in bounds.items())
+        lows = [edge[0] for edge in edges]
+        high_maxes = []
+        high_max = None
+        for edge in edges:
+            if high_max is None or edge[1] > high_max:
+                high_max = edge[1]
+            high_maxes.append(high_max)
+        return lows, high_maxes, edges
+
+    @staticmethod
+    def get_axis_indexes(axis_edges, lo, hi):
+        """ Get cell indexes whose edges overlap lo..hi
+        :axis_edges: from get_axis_edges
+        :lo, hi: range, lo <= hi
+        :returns: list of indexes
+        """
+        lows, high_maxes, edges = axis_edges
+        i_beg = bisect.bisect_left(high_maxes, lo)
+        i_end = bisect.bisect_right(lows, hi)
+        return [index for _, high, index in edges[i_beg:i_end]
+                if high >= lo]
+
+    def get_dirty_cells(self, changes):
+        """ Get cells touched by changes
+        :changes: list of changed regions (x1,y1,x2,y2), x1<=x2, y1<=y2
+        :returns: set of (ix,iy)
+        """
+        dirty_cells = set()
+        for x1,y1,x2,y2 in changes:
+            ixs = self.get_axis_indexes(self.x_edges, x1, x2)
+            if not ixs:
+                continue
+            
+            iys = self.get_axis_indexes(self.y_edges, y1, y2)
+            for ix in ixs:
+                for iy in iys:
+                    if (ix,iy) in self.cell_rects:
+                        dirty_cells.add((ix,iy))
+        return dirty_cells
+
+    def set_colors(self, new_colors, partial=False):
+        """ Update cell colors
+        :new_colors: dictionary by (ix,iy) of color, None - no color
+        :partial: True - only new_colors cells are updated
+                  False - new_colors has all colored cells
+        :returns: (cell colors dictionary, delta dictionary)
+        """
+        added = []
+        removed = []
+        changed = []
+        if not partial:
+            for ixy in self.cell_colors:
+                if ixy not in new_colors:
+                    new_colors[ixy] = None
+        for ixy, color in new_colors.items():
+            ix,iy = ixy
+            old_color = self.cell_colors.get(ixy)
+            if color == old_color:
+                continue
+            
+            if color is None:
+                removed.append((ix,iy,old_color))
+                del self.cell_colors[ixy]
+            else:
+                if old_color is None:
+                    added.append((ix,iy,color))
+                else:
+                    changed.append((ix,iy,color))
+                self.cell_colors[ixy] = color
+        delta = {"added" : sorted(added),
+                 "removed" : sorted(removed),
+                 "changed" : sorted(changed)}
+        return self.cell_colors, delta
+
+
 class CanvasGrid(tk.Canvas):
         
     def __init__(self,
@@ -40,6 +145,8 @@ class CanvasGrid(tk.Canvas):
                  g_xmin=None, g_xmax=None, g_ymin=None, g_ymax=None,
                  g_nrows=25, g_ncols=40,
                  x_offset=None, y_offset=None,
+                 use_item_index=True,
+                 track_changes=False,
                  **kwargs):
         """ Set up canvas object with grid
         :master: widget master
@@ -59,8 +166,20 @@ class CanvasGrid(tk.Canvas):
                 default: 1/2 (x_max-x_min)        
         :y_offset: offset external to internal
                 default: 1/2 (y_max-y_min)
+        :use_item_index: True - read canvas items once per scan,
+                    checking overlaps via CanvasItemIndex
+                    False - use per cell base.find_overlapping
+                    default: True
+        :track_changes: True - hook base canvas item creation,
+                    change and deletion so get_cell_specs only
+                    recomputes cells touched since the last call
+                    default: False
         """
         self.ncall_get_cell_specs = 0       # Facilitate tracking          
+        self.use_item_index = use_item_index
+        self.change_tracker = None          # Set if tracking changes
+        self.cell_views = {}                # CellSpecView by (delta, grid args)
+        self.last_snapshot = None           # Most recent snapshot()
         self.master = master
         if base is None:
             base = tk.Canvas(master) 
@@ -94,6 +213,15 @@ class CanvasGrid(tk.Canvas):
         self.grid_tag = None        # Most recent grid paint tag
         self.set_grid_lims()
         self.set_cell_lims()
+        if track_changes:
+            self.track_changes()
+
+    def track_changes(self):
+        """ Start tracking base canvas changes
+        """
+        if self.change_tracker is None:
+            self.change_tracker = CanvasChangeTracker(self.base)
+            self.use_item_index = True
 
     def get_canvas_lims(self, win_fract=True):
         """ Get canvas limits - internal values, to which
@@ -477,7 +605,7 @@ class CanvasGrid(tk.Canvas):
         SlTrace.lg(f"xmin={xmin}, xmax={xmax}"
                    f", ymin={ymin},ymax={ymax}"
                    f", ncols={ncols},nrows={nrows}", "canvas_items")
-        SlTrace.lg(f"xs:{xs}\nys:{ys}", "canvas_items")
+        SlTrace.lg(lambda: f"xs:{xs}\nys:{ys}", "canvas_items")
         ixy_ids_list = []       # Building list of (ix,iy), [overlapping ids]
         if types is not None and ex_types is not None:
             raise BrailleError("Don't support both types and ex_types")
@@ -501,11 +629,18 @@ class CanvasGrid(tk.Canvas):
         SlTrace.lg(f"get_canvas_items"
                    f" xmin={xmin}, xmax={xmax}, ymin={ymin}, ymax={ymax}",
                    "canvas_items")
+        if self.use_item_index:
+            return self.get_canvas_items_indexed(xs=xs, ys=ys,
+                                    types=types, ex_types=ex_types,
+                                    tags=tags, ex_tags=ex_tags,
+                                    get_color=get_color)
+            
+        trace_items = SlTrace.enabled("canvas_items")
         for ix in range(len(xs)):
             for iy in range(len(ys)):
                 cx1,cy1,cx2,cy2 = self.get_grid_ullr(ix=ix, iy=iy, xs=xs, ys=ys)
                 item_ids_over_raw = self.base.find_overlapping(cx1,cy1,cx2,cy2)
-                if self.ncall_get_cell_specs > 0 or SlTrace.trace("canvas_items"):
+                if trace_items:
                     if len(item_ids_over_raw) > 0:
                         color = self.item_to_color(item_ids=item_ids_over_raw)
                     else:
@@ -559,34 +694,201 @@ class CanvasGrid(tk.Canvas):
                     ixy_ids_list.append(((ix,iy), item_infos_over))
         return ixy_ids_list
 
+    def get_item_index(self):
+        """ Get index of current base canvas items
+        :returns: CanvasItemIndex
+        """
+        if self.change_tracker is not None:
+            self.change_tracker.update()
+            return self.change_tracker.item_index
+        
+        return CanvasItemIndex.from_canvas(self.base)
+
+    def get_canvas_items_indexed(self, xs, ys,
+                        types=None, ex_types=None,
+                        tags=None, ex_tags=None, get_color=False):
+        """ Get items within grid cells, reading the canvas only once
+        Same results as the per cell find_overlapping scan
+        of get_canvas_items
+        :xs,ys: grid limits from get_grid_lims()
+        :types,ex_types,tags,ex_tags: lists - see get_canvas_items
+        :get_color: True - returns list of cell colors default: return cell id
+        :returns: list of overlapping canvas entries - see get_canvas_items
+        """
+        item_index = self.get_item_index()
+        ixy_ids_list = []       # Building list of (ix,iy), [overlapping ids]
+        for ix in range(len(xs)):
+            for iy in range(len(ys)):
+                cx1,cy1,cx2,cy2 = self.get_grid_ullr(ix=ix, iy=iy, xs=xs, ys=ys)
+                item_ids_over = item_index.find_overlapping(cx1,cy1,cx2,cy2)
+                if len(item_ids_over) == 0:
+                    continue    # Skip if none to check
+                
+                if (types is not None or ex_types is not None 
+                        or tags is not None or ex_tags is not None):
+                    item_ids_over = [item_id for item_id in item_ids_over
+                                     if self.is_item_chosen(
+                                         item_index.get_spec(item_id),
+                                         types=types, ex_types=ex_types,
+                                         tags=tags, ex_tags=ex_tags)]
+                    if len(item_ids_over) == 0:
+                        continue
+                    
+                if get_color:
+                    item_infos_over = item_index.item_to_color(item_ids_over)
+                else:
+                    item_infos_over = list(item_ids_over)
+                ixy_ids_list.append(((ix,iy), item_infos_over))
+        SlTrace.lg(f"get_canvas_items_indexed: {len(ixy_ids_list)} cells",
+                   "canvas_items")
+        return ixy_ids_list
+
+    def is_item_chosen(self, item_spec,
+                       types=None, ex_types=None,
+                       tags=None, ex_tags=None):
+        """ Check item against type and tag selections
+        :item_spec: CanvasItemSpec
+        :types,ex_types,tags,ex_tags: lists - see get_canvas_items
+        :returns: True if item is selected
+        """
+        if types and item_spec.type not in types:
+            return False
+        
+        if ex_types and item_spec.type in ex_types:
+            return False
+        
+        if tags:
+            for tag in item_spec.tags:
+                if tag in tags:
+                    break
+            else:
+                return False        # No requisite tag
+            
+        if ex_tags:
+            for tag in item_spec.tags:
+                if tag in ex_tags:
+                    return False    # Has an excluded tag
+                
+        return True
+
 
     def get_cell_specs(self,
                         win_fract=True,
                         x_min=None, x_max=None,
                         y_min=None, y_max=None,
-                        n_cols=None, n_rows=None):
+                        n_cols=None, n_rows=None,
+                        delta=False):
         """ Get cell specifications (ix,iy,color) from grid
         :win_fract: True - x_min,... are fractions of region
                     False x_min are coordinates
         :xmin,xmax,ymin,ymax, ncols, nrows: see get_grid_lims()
                         default: CanvasGrid instance values
+        :delta: True - return changes since the previous delta call
+                    with these grid args, as dictionary:
+                        "added": [(ix,iy,color)...]
+                        "removed": [(ix,iy,old_color)...]
+                        "changed": [(ix,iy,color)...]
+                default: False - return list of all cell specs
+                Plain calls do not affect what delta calls report
         """
         self.ncall_get_cell_specs += 1
+        if delta or self.change_tracker is not None:
+            cell_colors, cell_delta = self.update_cell_view(
+                                        win_fract=win_fract,
+                                        x_min=x_min, x_max=x_max,
+                                        y_min=y_min, y_max=y_max,
+                                        n_cols=n_cols, n_rows=n_rows,
+                                        delta=delta)
+            if delta:
+                SlTrace.lg(f"cell_specs delta: {cell_delta}", "cell_specs")
+                return cell_delta
+            
+            cell_specs = [(ix, iy, cell_colors[(ix,iy)])
+                          for ix,iy in sorted(cell_colors)]
+            SlTrace.lg(f"cell_specs: {cell_specs}", "cell_specs")
+            return cell_specs
+        
         ixy_items = self.get_canvas_items(win_fract=win_fract,
                                           xmin=x_min, xmax=x_max,
                                           ymin=y_min,ymax=y_max,
                                           ncols=n_cols,
-                                          nrows=n_rows)
+                                          nrows=n_rows,
+                                          get_color=True)
         cell_specs = []
         for ixy_item in ixy_items:
-            (ix,iy), ids = ixy_item
-            color = self.item_to_color(item_ids=ids)
+            (ix,iy), color = ixy_item
             if color is not None:
                 cell_spec = (ix, iy, color)
                 cell_specs.append(cell_spec)
         SlTrace.lg(f"cell_specs: {cell_specs}", "cell_specs")
         return cell_specs
 
+    def update_cell_view(self,
+                        win_fract=True,
+                        x_min=None, x_max=None,
+                        y_min=None, y_max=None,
+                        n_cols=None, n_rows=None,
+                        delta=False):
+        """ Bring cell colors for these grid args up to date
+        With change tracking only cells touched by changed items
+        are recomputed, else the whole grid is rescanned.
+        Args: see get_cell_specs
+        :delta: True - update the delta callers' view, kept apart
+                from plain callers' view so plain calls don't
+                consume the delta default: False
+        :returns: (cell colors dictionary by (ix,iy), delta dictionary)
+        """
+        view_key = (delta, win_fract, x_min, x_max, y_min, y_max,
+                    n_cols, n_rows)
+        view = self.cell_views.get(view_key)
+        if view is None:
+            xs,ys = self.get_grid_lims(win_fract=win_fract,
+                                       xmin=x_min, xmax=x_max,
+                                       ymin=y_min, ymax=y_max,
+                                       ncols=n_cols, nrows=n_rows)
+            cell_rects = {}
+            for ix in range(len(xs)):
+                for iy in range(len(ys)):
+                    cell_rects[(ix,iy)] = self.get_grid_ullr(ix=ix, iy=iy,
+                                                            xs=xs, ys=ys)
+            view = CellSpecView(cell_rects)
+            self.cell_views[view_key] = view
+        tracker = self.change_tracker
+        if tracker is None:
+            new_colors = {}
+            ixy_items = self.get_canvas_items(win_fract=win_fract,
+                                          xmin=x_min, xmax=x_max,
+                                          ymin=y_min,ymax=y_max,
+                                          ncols=n_cols,
+                                          nrows=n_rows,
+                                          get_color=True)
+            for (ix,iy), color in ixy_items:
+                if color is not None:
+                    new_colors[(ix,iy)] = color
+            return view.set_colors(new_colors)
+        
+        serial = tracker.update()
+        item_index = tracker.item_index
+        changes = None
+        if view.serial is not None:
+            changes = tracker.get_changes(view.serial)
+        if changes is None:
+            dirty_cells = view.cell_rects       # Everything
+        else:
+            dirty_cells = view.get_dirty_cells(changes)
+        new_colors = {}
+        for ixy in dirty_cells:
+            cx1,cy1,cx2,cy2 = view.cell_rects[ixy]
+            item_ids = item_index.find_overlapping(cx1,cy1,cx2,cy2)
+            new_colors[ixy] = item_index.item_to_color(item_ids)
+        SlTrace.lg(f"update_cell_view: {len(dirty_cells)} cells recomputed",
+                   "cell_specs")
+        ret = view.set_colors(new_colors, partial=changes is not None)
+        view.serial = serial
+        tracker.prune_changes(min(view.serial for view in self.cell_views.values()
+                                  if view.serial is not None))
+        return ret
+
     def show_canvas(self, title=None, types=None, ex_types=None,
                   tags=None, ex_tags=None, get_color=False,
                   always_list=None,
@@ -824,8 +1126,29 @@ class CanvasGrid(tk.Canvas):
         new_copy = copy.copy(self)
         new_base = canvas_copy.deep_copy_canvas(self.base)
         new_copy.base = new_base
+        new_copy.change_tracker = None      # Copy is not tracked
+        new_copy.cell_views = {}
         return new_copy
     
+    def snapshot(self):
+        """ Create snapshot of current canvas contents
+        Unlike copy(), no tk canvas is created, just the display list,
+        whose unchanged item specs are shared with the previous snapshot
+        :returns: CanvasGridSnapshot
+        """
+        tracker = self.change_tracker
+        if tracker is not None:
+            tracker.update()
+            order_by_id = tracker.item_index.order_by_id
+            item_specs = sorted(tracker.item_index.spec_by_id.values(),
+                                key=lambda spec: order_by_id[spec.item_id])
+        else:
+            item_specs = read_canvas_items(self.base)
+        snapshot = CanvasGridSnapshot(self, item_specs,
+                                      prev=self.last_snapshot)
+        self.last_snapshot = snapshot
+        return snapshot
+    
     def canvas_show_items(self, exclude_types=None, show_coords=True,
                       show_options=True,
                       use_value_cache=True):
@@ -835,6 +1158,130 @@ class CanvasGrid(tk.Canvas):
                         show_options=show_options,
                         use_value_cache=use_value_cache)
         return str
+
+
+class CanvasGridSnapshot:
+    """ Immutable view of a CanvasGrid's canvas at one time
+    Holds the grid geometry and the display list (CanvasItemSpec
+    tuple, stacking order) - no tk objects - so get_cell_specs
+    is answered in Python.  Specs are never modified, so unchanged
+    items are shared between consecutive snapshots, as are the
+    item index and cell specs if nothing changed.
+    """
+    GEOMETRY_ATTRS = ("g_xmin", "g_xmax", "g_ymin", "g_ymax",
+                      "g_width", "g_height", "g_nrows", "g_ncols",
+                      "grid_xs", "grid_ys", "cell_xs", "cell_ys",
+                      "cell_y_increase")
+    
+                        # Grid geometry and item scan, as CanvasGrid
+    get_canvas_lims = CanvasGrid.get_canvas_lims
+    get_grid_lims = CanvasGrid.get_grid_lims
+    get_grid_ullr = CanvasGrid.get_grid_ullr
+    get_cell_y12 = CanvasGrid.get_cell_y12
+    is_item_chosen = CanvasGrid.is_item_chosen
+    get_canvas_items_indexed = CanvasGrid.get_canvas_items_indexed
+    
+    def __init__(self, canvas_grid, item_specs, prev=None):
+        """ Setup snapshot
+        :canvas_grid: CanvasGrid whose geometry is used
+        :item_specs: list of CanvasItemSpec in stacking order
+        :prev: previous snapshot, with which unchanged
+                specs are shared default: no sharing
+        """
+        self.title = canvas_grid.title
+        for name in self.GEOMETRY_ATTRS:
+            value = getattr(canvas_grid, name)
+            if isinstance(value, list):
+                value = tuple(value)
+            setattr(self, name, value)
+        prev_by_id = {} if prev is None else prev.spec_by_id
+        specs = []
+        self.n_shared = 0       # specs shared with prev
+        for spec in item_specs:
+            prev_spec = prev_by_id.get(spec.item_id)
+            if prev_spec is not None and (prev_spec is spec
+                        or prev_spec.get_values() == spec.get_values()):
+                spec = prev_spec
+                self.n_shared += 1
+            specs.append(spec)
+        if (prev is not None and len(specs) == len(prev.item_specs)
+                and all(spec is prev_spec for spec, prev_spec
+                        in zip(specs, prev.item_specs))
+                and self.get_geometry() == prev.get_geometry()):
+            self.item_specs = prev.item_specs   # Nothing changed
+            self.spec_by_id = prev.spec_by_id
+            self.item_index = prev.item_index
+            self.cell_specs_cache = prev.cell_specs_cache
+        else:
+            self.item_specs = tuple(specs)
+            self.spec_by_id = {spec.item_id : spec for spec in specs}
+            self.item_index = None      # Built when first needed
+            self.cell_specs_cache = {}  # by grid args, tuple of cell specs
+        SlTrace.lg(f"CanvasGridSnapshot: {len(specs)} items"
+                   f" {self.n_shared} shared", "snapshot")
+
+    def get_geometry(self):
+        """ Get grid geometry values, for comparison
+        """
+        return tuple(getattr(self, name) for name in self.GEOMETRY_ATTRS)
+    
+    def get_item_index(self):
+        """ Get index of snapshot items
+        :returns: CanvasItemIndex
+        """
+        if self.item_index is None:
+            self.item_index = CanvasItemIndex(self.item_specs)
+        return self.item_index
+
+    def get_cell_specs(self,
+                        win_fract=True,
+                        x_min=None, x_max=None,
+                        y_min=None, y_max=None,
+                        n_cols=None, n_rows=None):
+        """ Get cell specifications (ix,iy,color) from snapshot
+        Args: see CanvasGrid.get_cell_specs (no delta)
+        :returns: list of cell specs
+        """
+        cell_key = (win_fract, x_min, x_max, y_min, y_max, n_cols, n_rows)
+        cell_specs = self.cell_specs_cache.get(cell_key)
+        if cell_specs is None:
+            xs,ys = self.get_grid_lims(win_fract=win_fract,
+                                       xmin=x_min, xmax=x_max,
+                                       ymin=y_min, ymax=y_max,
+                                       ncols=n_cols, nrows=n_rows)
+            ixy_items = self.get_canvas_items_indexed(xs=xs, ys=ys,
+                                                      get_color=True)
+            cell_specs = tuple((ix, iy, color)
+                               for (ix,iy), color in ixy_items
+                               if color is not None)
+            self.cell_specs_cache[cell_key] = cell_specs
+        if SlTrace.trace("cell_specs"):
+            SlTrace.lg(f"snapshot cell_specs: {cell_specs}")
+        return list(cell_specs)
+
+    def canvas_show_items(self, exclude_types=None, show_coords=True,
+                          show_options=True):
+        """ List snapshot items, as CanvasGrid.canvas_show_items
+        :exclude_types: list of types to exclude default: none
+        :show_coords: show coordinates for each item
+        :show_options: show drawing options
+        :returns: items string
+        """
+        res = ""
+        for spec in self.item_specs:
+            if exclude_types is not None and spec.type in exclude_types:
+                continue
+            
+            res += f"\n    {spec.type}:"
+            if show_coords:
+                res += f"({list(spec.coords)})"
+            if show_options:
+                res += f" fill={spec.fill} width={spec.width}"
+                if spec.outline != "":
+                    res += f" outline={spec.outline}"
+                if len(spec.tags) > 0:
+                    res += f" tags={spec.tags}"
+        return res
         
 if __name__ == "__main__":
     import sys
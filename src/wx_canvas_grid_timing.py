@@ -0,0 +1,73 @@
+# wx_canvas_grid_timing.py  18Oct2026  crs, Author
+""" Compare CanvasGrid.get_cell_specs timing:
+    per cell find_overlapping scan vs CanvasItemIndex scan
+Usage: python wx_canvas_grid_timing.py [--ncols N] [--nrows N] [--repeat N]
+"""
+import argparse
+import time
+import tkinter as tk
+
+from select_trace import SlTrace
+from wx_canvas_grid import CanvasGrid
+
+def draw_test_figure(cvg):
+    """ Draw a mix of the items turtle programs create
+    """
+    colors = ["red","orange","yellow","green",
+              "blue","indigo","violet"]
+    for i, colr in enumerate(colors):
+        x0 = -350 + i*100
+        cvg.base.create_line(x0, -400, x0+80, 400, width=10,
+                             fill=colr, capstyle=tk.ROUND)
+        cvg.base.create_oval(x0, -50, x0+60, 10, fill=colr, outline=colr)
+    cvg.base.create_rectangle(-200, -300, 0, -100, fill="pink")
+    cvg.base.create_rectangle(50, 100, 300, 300, outline="black", width=4)
+    cvg.base.create_polygon(-300,200, -100,350, -50,150, -150,250,
+                            fill="brown", outline="")
+    cvg.base.create_line(-400,0, 0,-380, 400,0, 0,380, -400,0,
+                         width=3, fill="black")
+
+def time_cell_specs(cvg, use_item_index, repeat=5, **kwargs):
+    """ Time get_cell_specs
+    :returns: (seconds per call, cell_specs)
+    """
+    cvg.use_item_index = use_item_index
+    t_beg = time.perf_counter()
+    for _ in range(repeat):
+        cell_specs = cvg.get_cell_specs(**kwargs)
+    t_per = (time.perf_counter()-t_beg)/repeat
+    return t_per, cell_specs
+
+if __name__ == "__main__":
+    SlTrace.clearFlags()
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--ncols', type=int, dest='ncols', default=40)
+    parser.add_argument('--nrows', type=int, dest='nrows', default=25)
+    parser.add_argument('--repeat', type=int, dest='repeat', default=5)
+    args = parser.parse_args()
+
+    root = tk.Tk()
+    canvas = tk.Canvas(root, width=800, height=800)
+    canvas.pack()
+    canvas.configure(scrollregion=(-400,-400,400,400))  # turtle like
+    root.update()
+    cvg = CanvasGrid(base=canvas)
+    draw_test_figure(cvg)
+    root.update()
+    for ncols, nrows in [(args.ncols, args.nrows),
+                         (args.ncols*2, args.nrows*2)]:
+        t_cell, specs_cell = time_cell_specs(cvg, use_item_index=False,
+                                    repeat=args.repeat,
+                                    n_cols=ncols, n_rows=nrows)
+        t_index, specs_index = time_cell_specs(cvg, use_item_index=True,
+                                    repeat=args.repeat,
+                                    n_cols=ncols, n_rows=nrows)
+        diffs = set(specs_cell) ^ set(specs_index)
+        SlTrace.lg(f"{ncols}x{nrows}: per cell: {t_cell*1000:.1f} msec"
+                   f"  indexed: {t_index*1000:.1f} msec"
+                   f"  speedup: {t_cell/max(t_index,1e-9):.1f}"
+                   f"  cells: {len(specs_cell)} differences: {len(diffs)}")
+        for diff in sorted(diffs):
+            in_which = "per cell" if diff in specs_cell else "indexed"
+            SlTrace.lg(f"    only {in_which}: {diff}")
+    root.destroy()
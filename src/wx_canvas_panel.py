@@ -68,10 +68,17 @@ class CanvasPanel(wx.Panel):
         self.items_by_id = {}   # Items stored by item.canv_id
                                 # Augmented by CanvasPanelItem.__init__()
         self.items = []         # Items in order drawn
+        self.n_deleted = 0      # deleted items not yet compacted out
+        self.scaled_points = {} # scaled points, by canv_id, for scaled_size
+        self.scaled_size = None
+        self.backing = None     # Off-screen wx.Bitmap of static items
+        self.backing_full = True    # True - all of backing needs drawing
+        self.backing_dirty = [] # wx.Rect regions of backing needing drawing
         self.adw_dp = AdwDisplayPending(self)        
         self.prev_reg = None    # Previously displayed
 
         #self.Bind(wx.EVT_PAINT, self.OnPaint)
+        self.grid_panel.SetBackgroundStyle(wx.BG_STYLE_PAINT)  # OnPaint covers all
         self.grid_panel.Bind(wx.EVT_PAINT, self.OnPaint)
         self.grid_panel.Bind(wx.EVT_SIZE, self.OnSize)
         self.grid_panel.Bind(wx.EVT_KEY_DOWN, self.on_key_down)
@@ -268,17 +275,38 @@ class CanvasPanel(wx.Panel):
 
     def delete_id(self, id_tag):
         """ Delete items having id or tag
+        Deleted items are dropped from the display scene
+        and compacted out of items
         :id_tag: id or tag
         """
-        for item in self.items:
-            if type(id_tag) == int:
-                if id_tag == item.canv_id:
-                    item.deleted = True
-                    item.refresh()          # Force redraw
-                    break   # id is unique
-            
-                if id_tag in item.tags:
-                    item.deleted = True
+        if type(id_tag) == int:
+            item = self.items_by_id.get(id_tag)
+            if item is not None and not item.deleted:
+                self.delete_item(item)
+                item.refresh()          # Force redraw
+        else:
+            for item in self.items:
+                if id_tag in item.tags and not item.deleted:
+                    self.delete_item(item)
+        if self.n_deleted > len(self.items)//2 + 100:
+            self.compact_items()
+
+    def delete_item(self, item):
+        """ Mark item, and any composite parts, deleted
+        :item: CanvasPanelItem
+        """
+        n_parts = len(item.get_parts()) if item.canv_type == "create_composite" else 0
+        item.delete()
+        self.n_deleted += 1 + n_parts
+        self.adw_dp.remove_item(item)
+
+    def compact_items(self):
+        """ Remove deleted items from items, items_by_id
+        """
+        self.items = [item for item in self.items if not item.deleted]
+        self.items_by_id = {item.canv_id : item for item in self.items}
+        self.scaled_points = {}
+        self.n_deleted = 0
 
     def OnSize(self, e):
         self.Refresh()
@@ -288,13 +316,15 @@ class CanvasPanel(wx.Panel):
         SlTrace.lg(f"panel size: {size}", "paint")
         e.Skip()
 
-    def draw_item(self, item):
+    def draw_item(self, item, rect=None, dc=None):
         """ Draw item
         :item: CanvasPanalItem/canv_id item to draw
+        :rect: limit drawing to this rectangle default: no limit
+        :dc: device context default: grid panel wx.PaintDC
         """
         if type(item) == int:
             item = self.id_to_item(item)
-        item.draw()
+        item.draw(rect=rect, dc=dc)
         
     def draw_items(self, items=None, rect=None,
                    types="create_composite"):
@@ -327,19 +357,23 @@ class CanvasPanel(wx.Panel):
         if len(items) == 0:
             return      # Short circuit if no items
         
-        items_points = self.get_items_points(items)
-        items_points_scaled = self.scale_points(items_points)
-
-        ipo = 0     # current offset into items_points_scaled
-        for item in items:                
-            npts = len(item.points)
-            points = items_points_scaled[ipo:ipo+npts]
+        size_key = (self.cur_size.x, self.cur_size.y)
+        if size_key != self.scaled_size:
+            self.scaled_points = {}     # Scaled for previous size
+            self.scaled_size = size_key
+        for item in items:
+            if item.deleted:
+                continue
+            
             SlTrace.lg(f"item: {item}", "item")
             if ((do_composite and item.canv_type == "create_composite")
                     or (do_all and item.canv_type != "create_composite")
                     or (item.canv_type in types)):
+                points = self.scaled_points.get(item.canv_id)
+                if points is None or len(points) != len(item.points):
+                    points = self.scale_points(item.points)
+                    self.scaled_points[item.canv_id] = points
                 item.draw(points=points, rect=rect)
-            ipo += npts # move to next item
 
     def get_items_points(self, items=None):
         """ Get all drawing points, or embeded figures
@@ -351,7 +385,7 @@ class CanvasPanel(wx.Panel):
         if items is None:
             items = self.items
         points = []
-        for item in self.items:
+        for item in items:
             points += item.points
         return points
                     
@@ -396,13 +430,107 @@ class CanvasPanel(wx.Panel):
             SlTrace.lg(f"Frame size: {self.frame.GetSize()}", "paint")
             pass
 
-        self.display_pending(dc)
+        self.update_backing()
+        if self.backing is not None:
+            dc.DrawBitmap(self.backing, 0, 0)   # Clipped to update region
+        self.display_pending(dc, rects=self.get_update_rects(),
+                             overlay=True)
 #        self.check_for_display()    # TFD - wait while events are processed
         self.prev_pos = self.cur_pos
         self.prev_size = self.cur_size
         SlTrace.lg(f"OnPaint: {self.cur_pos} {self.cur_size}", "paint")
         self.display_cursor(dc)     # Display cursor if any
 
+    def invalidate_backing(self, bounds=None):
+        """ Mark backing store region as needing redrawing
+        Does not refresh the screen
+        :bounds: (x0,y0,x1,y1) region default: all of backing
+        """
+        if bounds is None:
+            self.backing_full = True
+            self.backing_dirty = []
+            return
+        
+        if self.backing_full:
+            return      # Already all to be drawn
+        
+        x0,y0,x1,y1 = bounds
+        self.backing_dirty.append(wx.Rect(wx_Point(x0,y0), wx_Point(x1,y1)))
+
+    def invalidate_item(self, item):
+        """ Mark item's backing store region as needing redrawing
+        e.g. after in place attribute change
+        :item: CanvasPanelItem
+        """
+        if not item.is_overlay():
+            self.invalidate_backing(self.adw_dp.get_bounds(item))
+
+    def reindex_item(self, item):
+        """ Reindex displayed item whose parts changed e.g.
+        composite part added, invalidating old and new bounds
+        :item: CanvasPanelItem
+        """
+        self.adw_dp.reindex_item(item)
+
+    def update_backing(self):
+        """ Bring off-screen backing store up to date:
+        (re)create to grid panel size, redraw invalidated
+        regions with static (non overlay) items
+        """
+        size = self.grid_panel.GetClientSize()
+        if size.x < 1 or size.y < 1:
+            return
+        
+        self.adw_dp.reindex_composites()    # Before dirty regions are taken
+        if self.backing is None or self.backing.GetSize() != size:
+            self.backing = wx.Bitmap(size.x, size.y)
+            self.backing_full = True
+        if not self.backing_full and len(self.backing_dirty) == 0:
+            return      # Up to date
+        
+        if self.backing_full:
+            rects = [wx.Rect(0, 0, size.x, size.y)]
+        else:
+            region = wx.Region()
+            for rect in self.backing_dirty:
+                region.Union(rect)
+            rects = []
+            region_iter = wx.RegionIterator(region)
+            while region_iter.HaveRects():
+                rects.append(region_iter.GetRect())
+                region_iter.Next()
+        SlTrace.lg(lambda: f"update_backing: full:{self.backing_full}"
+                           f" rects:{len(rects)}", "paint")
+        mdc = wx.MemoryDC(self.backing)
+        for rect in rects:
+            mdc.SetClippingRegion(rect)
+            mdc.SetPen(wx.Pen(self.color))
+            mdc.SetBrush(wx.Brush(self.color, wx.SOLID))
+            mdc.DrawRectangle(rect)
+            self.adw_dp.display_pending(mdc,
+                            rects=None if self.backing_full else [rect],
+                            overlay=False)
+            mdc.DestroyClippingRegion()
+        mdc.SelectObject(wx.NullBitmap)
+        self.backing_full = False
+        self.backing_dirty = []
+        
+    def get_update_rects(self):
+        """ Get rectangles of grid panel update region
+        Only called from OnPaint
+        :returns: list of wx.Rect, None if region unavailable
+        """
+        region = self.grid_panel.GetUpdateRegion()
+        if region is None or region.IsEmpty():
+            return None     # Draw everything
+        
+        rects = []
+        region_iter = wx.RegionIterator(region)
+        while region_iter.HaveRects():
+            rects.append(region_iter.GetRect())
+            region_iter.Next()
+        return rects
+
     def display_cursor(self, dc):
         """ Display cursor, if any
         This is called at end of OnPaint 
@@ -428,12 +556,18 @@ class CanvasPanel(wx.Panel):
                 wx.Point(x+sur, y+sur))
                                     
     def refresh_cursor(self):
-        """ Refresh previous cursor if any
+        """ Refresh previous cursor if any, and new cursor
+        Only a backing store blit plus overlays
         """
         if self._cursor_rect is not None:
-            self.RefreshRect(self._cursor_rect)
+            self.grid_panel.RefreshRect(self._cursor_rect)
             #self.Refresh()
             self._cursor_rect = None
+        if self.adw._cursor_xy is not None:
+            x,y = self.adw._cursor_xy
+            sur = 10        # radius plus pen
+            self.grid_panel.RefreshRect(wx.Rect(wx_Point(x-sur, y-sur),
+                                                wx_Point(x+sur, y+sur)))
             
         
     def set_check_proceed(self, proceed=True):
@@ -466,8 +600,11 @@ class CanvasPanel(wx.Panel):
         self.items_by_id = {}   # Items stored by item.canv_id
                                 # Augmented by CanvasPanelItem.__init__()
         self.items = []         # Items in order drawn
+        self.n_deleted = 0
+        self.scaled_points = {}
         self.prev_reg = None    # Previously displayed
         self.adw_dp.clear()
+        self.invalidate_backing()
         #self.Refresh()
         
                 
@@ -490,6 +627,7 @@ class CanvasPanel(wx.Panel):
                         item.kwargs[kw] = val
                     else:
                         raise SelectError(f"itemconfig doesn't support {kw} (val:{val})")    
+                self.invalidate_item(item)
 
     
     def update_item(self, item, **kwargs):
@@ -501,6 +639,7 @@ class CanvasPanel(wx.Panel):
         if type(item) == int:
             item = self.items_by_id[item]
         item.update(**kwargs)
+        self.invalidate_item(item)
         bdrect = item.bounding_rect()
         self.grid_panel.RefreshRect(rect=bdrect)
 
@@ -868,11 +1007,14 @@ class CanvasPanel(wx.Panel):
         self.adw_dp.add_cursor(cursor)
 
     
-    def display_pending(self, dc):
-        """ Display list and clear it
+    def display_pending(self, dc, rects=None, overlay=None):
+        """ Display items intersecting update rectangles
         :dc: wx.PaintDC(self)
+        :rects: list of update wx.Rect default: all items
+        :overlay: True - only overlay items, False - only static
+                items default: None - all items
         """
-        self.adw_dp.display_pending(dc)
+        self.adw_dp.display_pending(dc, rects=rects, overlay=overlay)
 
 if __name__ == "__main__":
     add_menus = True     # True add menus to frame
@@ -19,6 +19,8 @@ class CanvasPanelItem:
     DT_CURSOR = "DT_CURSOR"         # Cursor
     DT_MAG_SEL = "DT_MAG_SEL"       # Magnification selection
     DT_SCAN_ITEM = "DT_SCAN_ITEM"   # Scanning item display
+    # Transient display types, drawn over the backing store
+    DT_OVERLAYS = (DT_CURSOR, DT_MAG_SEL, DT_SCAN_ITEM)
     
     def __init__(self, canvas_panel,
                  canv_type,
@@ -87,6 +89,7 @@ class CanvasPanelItem:
             part = self.canvas_panel.items_by_id[part]
         self.points.extend(part.points)     # Accumulate points of components            
         self.comp_parts.append(part)
+        self.canvas_panel.reindex_item(self)    # New bounds to backing
         
     def refresh(self):
         """ Set item to be redrawn
@@ -100,7 +103,18 @@ class CanvasPanelItem:
         """
         for kw in kwargs:
             self.kwargs[kw] = kwargs[kw]
-            
+
+    def coords(self, x0,y0,x1,y1):
+        """ Move two point item (rectangle, bitmap, oval, cursor)
+        like tkinter canvas coords
+        :x0,y0,x1,y1: new corners
+        """
+        if self.canv_type not in ("create_rectangle", "create_bitmap",
+                                  "create_oval", "create_cursor"):
+            raise Exception(f"coords: unsupported type: {self.canv_type}")
+        self.args = (x0,y0,x1,y1)
+        self.points = [wx_Point(x0,y0), wx_Point(x1,y1)]
+
     def __str__(self):
         st = "CanvasPanelItem:"
         st += f"[{self.canv_id}]"
@@ -119,7 +133,7 @@ class CanvasPanelItem:
         return st
         
 
-    def draw(self, points=None, rect=None):
+    def draw(self, points=None, rect=None, dc=None):
         """ Draw canvas item
         scaled drawings if points is not None
         
@@ -127,6 +141,8 @@ class CanvasPanelItem:
                 default: self.points (initialized points)
         :rect: limit drawing to those within this rectangle
                 default: no limitation - draw item
+        :dc: device context e.g. paint dc or backing store
+                wx.MemoryDC default: wx.PaintDC of grid panel
         """
         if self.deleted:
             return      # Already deleted
@@ -151,24 +167,41 @@ class CanvasPanelItem:
             self.tags = self.kwargs["tags"]
         
         if self.canv_type == "create_composite":
-            ret = self.create_composite_draw(points, rect=rect)
+            ret = self.create_composite_draw(points, rect=rect, dc=dc)
         elif self.canv_type == "create_rectangle":
-            ret = self.create_rectangle_draw(points, rect=rect)
+            ret = self.create_rectangle_draw(points, rect=rect, dc=dc)
         elif self.canv_type == "create_bitmap":
-            ret = self.create_bitmap_draw(points, rect=rect)
+            ret = self.create_bitmap_draw(points, rect=rect, dc=dc)
         elif self.canv_type == "create_oval":
-            ret = self.create_oval_draw(points, rect=rect)
+            ret = self.create_oval_draw(points, rect=rect, dc=dc)
         elif self.canv_type == "create_line":
-            ret = self.create_line_draw(points, rect=rect)
+            ret = self.create_line_draw(points, rect=rect, dc=dc)
         elif self.canv_type == "create_text":
-            ret = self.create_text_draw(points, rect=rect)
+            ret = self.create_text_draw(points, rect=rect, dc=dc)
         elif self.canv_type == "create_cursor":
-            ret = self.create_cursor_draw(points, rect=rect)
+            ret = self.create_cursor_draw(points, rect=rect, dc=dc)
         else:
             raise Exception(f"draw: unrecognized type: {self.canv_type}")
         
         return ret
 
+    def is_overlay(self):
+        """ Check if item is a transient overlay (cursor,
+        magnification selection, scan item), drawn on each paint
+        rather than into the static backing store
+        :returns: True if overlay
+        """
+        return (self.disp_type in self.DT_OVERLAYS
+                or self.canv_type == "create_cursor")
+
+    def get_dc(self, dc=None):
+        """ Get drawing device context
+        :dc: context, if one default: wx.PaintDC of grid panel
+        """
+        if dc is None:
+            dc = wx.PaintDC(self.canvas_panel.grid_panel)
+        return dc
+
     def get_parts(self):
         """ Get parts (non composites), self if not composite
         :returns: list of composite parts
@@ -233,7 +266,7 @@ class CanvasPanelItem:
         return brect
          
     ###### create_composite    
-    def create_composite_draw(self, points=None, rect=None):
+    def create_composite_draw(self, points=None, rect=None, dc=None):
         """ draw composite figure
         :points: accumulated points from all components
         :rect: rectangle if not overlapping don't draw
@@ -245,10 +278,10 @@ class CanvasPanelItem:
             return      # empty list
 
         for part in self.comp_parts:
-            part.draw(rect=rect)
+            part.draw(rect=rect, dc=dc)
          
     ###### create_rectangle    
-    def create_rectangle_draw(self, points, rect=None):
+    def create_rectangle_draw(self, points, rect=None, dc=None):
         """ Simulate tkinter canvas create_rectangle drawing
         :points: points deternining figure
                 default: use items points
@@ -264,7 +297,7 @@ class CanvasPanelItem:
         if rect is not None and not brect.Intersects(rect):
             return
              
-        dc = wx.PaintDC(self.canvas_panel.grid_panel)
+        dc = self.get_dc(dc)
         dc.SetPen(wx.Pen(self.outline, style=wx.SOLID))
         dc.SetBrush(wx.Brush(self.fill, wx.SOLID))
         dc.DrawRectangle(brect)
@@ -274,7 +307,7 @@ class CanvasPanelItem:
 
          
     ###### create_bitmap    
-    def create_bitmap_draw(self, points, rect=None):
+    def create_bitmap_draw(self, points, rect=None, dc=None):
         """ draw bitmap
         :points: points deternining figure
                 default: use items points
@@ -290,7 +323,7 @@ class CanvasPanelItem:
         if rect is not None and not brect.Intersects(rect):
             return
              
-        dc = wx.PaintDC(self.canvas_panel.grid_panel)
+        dc = self.get_dc(dc)
         SlTrace.lg(f"DrawBitMap: {self.fill} {points[0]},"
                    f"  {points[1]}", "draw_rect")
         kwargs = self.kwargs
@@ -300,7 +333,7 @@ class CanvasPanelItem:
 
 
     ###### create_oval
-    def create_oval_draw(self, points=None, rect=None):
+    def create_oval_draw(self, points=None, rect=None, dc=None):
         """ Simulate tkinter canvas create_oval
         :points: wx.Point(x0,y0), wx.Point(x1,y1)
                 default: self.points
@@ -315,7 +348,7 @@ class CanvasPanelItem:
         if rect is not None and not brect.Intersects(rect):
             return
         
-        dc = wx.PaintDC(self.canvas_panel.grid_panel)
+        dc = self.get_dc(dc)
         dc.SetPen(wx.Pen(self.outline, style=wx.SOLID))
         dc.SetBrush(wx.Brush(self.fill, wx.SOLID))
         size=wx.Size(points[1].x-points[0].x,
@@ -324,7 +357,7 @@ class CanvasPanelItem:
         SlTrace.lg(f"DrawElipse: {self.fill} {points[0]} {size}", "draw_oval")
         
     #### create_line
-    def create_line_draw(self, points=None, rect=None):
+    def create_line_draw(self, points=None, rect=None, dc=None):
         """ Implement tkinter's create_line
         :args: x1,y1,...xn,yn
         :kwargs:  width=, fill=, tags=[]
@@ -336,12 +369,12 @@ class CanvasPanelItem:
         if len(points) == 0:
             return      # empty list
         
-        dc = wx.PaintDC(self.canvas_panel.grid_panel)
+        dc = self.get_dc(dc)
         dc.SetPen(wx.Pen(self.fill, style=wx.SOLID, width=self.width))
         dc.DrawLines(points)
 
     ####### create_text
-    def create_text_draw(self, points=None, rect=None):
+    def create_text_draw(self, points=None, rect=None, dc=None):
         """ Simulate tkinter canvas create_text
         :rect: rectangle if not overlapping don't draw TBD
                 default: always draw
@@ -358,7 +391,7 @@ class CanvasPanelItem:
             font = wx.Font(self.kwargs["font"])
             
         
-        dc = wx.PaintDC(self.canvas_panel.grid_panel)
+        dc = self.get_dc(dc)
         dc.SetPen(wx.Pen(self.outline, style=wx.SOLID))
         dc.SetBrush(wx.Brush(self.fill, wx.SOLID))
         
@@ -368,7 +401,7 @@ class CanvasPanelItem:
         dc.DrawText(text=text, pt=title_pt)
                 
     ###### create_cursor
-    def create_cursor_draw(self, points=None, rect=None):
+    def create_cursor_draw(self, points=None, rect=None, dc=None):
         """ Create cursor - oval create_oval
         :points: wx.Point(x0,y0), wx.Point(x1,y1)
                 default: self.points
@@ -383,7 +416,7 @@ class CanvasPanelItem:
         if rect is not None and not brect.Intersects(rect):
             return
         
-        dc = wx.PaintDC(self.canvas_panel.grid_panel)
+        dc = self.get_dc(dc)
         dc.SetPen(wx.Pen(self.outline, style=wx.SOLID))
         dc.SetBrush(wx.Brush(self.fill, wx.SOLID))
         size=wx.Size(points[1].x-points[0].x,
@@ -395,7 +428,7 @@ class CanvasPanelItem:
     def delete(self):
         """ delete item
         """
-        if self.create_composite_draw:
+        if self.canv_type == "create_composite":
             for part in self.comp_parts:
                 part.delete()
         self.deleted = True
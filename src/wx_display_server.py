@@ -0,0 +1,231 @@
+#wx_display_server.py  18Oct2026  crs, Author
+"""
+Persistent wxPython display server
+
+wx_turtle_braille.setup_main normally starts a new
+wx_display_main.py process for each turtle program, paying for
+python, wx, sound and speech startup before the braille window
+appears.  The display server is started once, keeping wx, sound
+and speech warm, and opens a new AudioDrawWindow per drawing
+session, over the same TkRPCHost/TkRPCUser link.
+    open_session(host_port, ...) - start session, returns session_num
+    is_session_open(session_num) - True while session windows are up
+    end_session(session_num) - close session, as if its window exited
+Exiting a session's window closes the session, not the server.
+Session state (is_open) is only changed in the wx thread; the
+RPC threads just read it.
+setup_main uses a running server (wx_display_server_link
+connect_display_server), else starts wx_display_main.py as before.
+Usage: python wx_display_server.py [--port PORT]
+"""
+import threading as th
+import wx
+
+from select_trace import SlTrace
+from wx_rpc import RPCServer
+import wx_display_server_link
+from wx_braille_display import BrailleDisplay
+from wx_braille_cell_list import BrailleCellList
+from wx_speaker_control import SpeakerControlLocal
+from wx_tk_rpc_user import TkRPCUser
+
+
+class DisplaySession:
+    """ One turtle program's display
+    """
+    def __init__(self, session_num, host_port, id_title="", title=None,
+                 src_file=None):
+        self.session_num = session_num
+        self.host_port = host_port
+        self.id_title = id_title
+        self.title = title
+        self.src_file = src_file
+        self.tkr = None         # Set when linked to host
+        self.bd = None          # Set when displayed
+        self.is_open = True     # Cleared in wx thread, once closed
+
+
+class DisplayServer:
+    SERVER_PORT = wx_display_server_link.SERVER_PORT
+    NO_SERVER_ENV = wx_display_server_link.NO_SERVER_ENV
+
+    def __init__(self, host_name='localhost', port=None,
+                 app=None, speaker_control=None):
+        """ Setup display server
+        :host_name: host name default: localhost - same machine
+        :port: port accepting sessions default: SERVER_PORT
+        :app: wx application object default: create
+        :speaker_control: sound/speech shared by sessions
+                default: create
+        """
+        if port is None:
+            port = DisplayServer.SERVER_PORT
+        self.host_name = host_name
+        self.port = port
+        if app is None:
+            app = wx.App()
+        app.SetExitOnFrameDelete(False)     # Outlive session windows
+        self.app = app
+        if speaker_control is None:
+            speaker_control = SpeakerControlLocal()     # warm for sessions
+        self.speaker_control = speaker_control
+        self.sessions = {}      # by session_num
+        self.session_num = 0    # Last session number
+        self.sessions_lock = th.Lock()
+
+        self.session_server = RPCServer(self.host_name, self.port)
+        self.session_server.registerMethod(self.open_session)
+        self.session_server.registerMethod(self.is_session_open)
+        self.session_server.registerMethod(self.end_session)
+        self.session_server.registerMethod(self.get_sessions)
+        th.Thread(target=self.session_server.run, daemon=True).start()
+        SlTrace.lg(f"DisplayServer: port {self.port}", "display_server")
+
+    def run(self):
+        """ Run display, till killed
+        """
+        self.app.MainLoop()
+
+    """
+    Session functions, remotely requested from turtle programs
+    """
+
+    def open_session(self, host_port, id_title="", title=None,
+                     src_file=None):
+        """ Start session, displaying host's canvas
+        Returns before the display is up, so the host can
+        serve our TkRPCUser requests
+        :host_port: session's TkRPCHost port
+        :id_title: identification title
+        :title: display title
+        :src_file: turtle program file
+        :returns: session number
+        """
+        with self.sessions_lock:
+            self.session_num += 1
+            session = DisplaySession(self.session_num, host_port,
+                                     id_title=id_title, title=title,
+                                     src_file=src_file)
+            self.sessions[session.session_num] = session
+        SlTrace.lg(f"open_session: {session.session_num}"
+                   f" host_port:{host_port} {id_title}", "display_server")
+        th.Thread(target=self.link_session, args=[session],
+                  daemon=True).start()
+        return session.session_num
+
+    def is_session_open(self, session_num):
+        """ Check if session is still displayed
+        Called in RPC thread - only reads the session's flag
+        :session_num: session number
+        :returns: True if open
+        """
+        session = self.sessions.get(session_num)
+        return session is not None and session.is_open
+
+    def end_session(self, session_num):
+        """ Close session, as if its window exited e.g. program
+        done without waiting for the user
+        :session_num: session number
+        """
+        session = self.sessions.get(session_num)
+        if session is not None:
+            wx.CallAfter(self.close_session, session)
+
+    def get_sessions(self):
+        """ Get open sessions
+        :returns: list of (session_num, host_port, id_title)
+        """
+        return [(session.session_num, session.host_port, session.id_title)
+                for session in list(self.sessions.values())
+                if session.is_open]
+
+    def link_session(self, session):
+        """ Link to session's host, get cells, then display
+        in wx thread
+        :session: DisplaySession
+        """
+        try:
+            session.tkr = TkRPCUser(host_name=self.host_name,
+                                    host_port=session.host_port)
+            cells = session.tkr.get_cell_specs()  # gets (ix,iy,color)*
+        except Exception as e:
+            SlTrace.lg(f"session {session.session_num} link failed: {e}")
+            wx.CallAfter(self.close_session, session)
+            return
+
+        SlTrace.lg(f"session {session.session_num} cells: {cells}",
+                   "cell_specs")
+        bdlist = BrailleCellList(cells).to_string()
+        wx.CallAfter(self.display_session, session, bdlist)
+
+    def display_session(self, session, bdlist):
+        """ Create session's window, as wx_display_main.py
+        :session: DisplaySession
+        :bdlist: display list string
+        """
+        if not session.is_open:
+            return
+
+        session.bd = BrailleDisplay(session.tkr, id_title=session.id_title,
+                                    title=session.title,
+                                    src_file=session.src_file,
+                                    display_list=bdlist,
+                                    app=self.app,
+                                    speaker_control=self.speaker_control,
+                                    pgm_exit=lambda: self.close_session(session))
+        session.bd.display(title=session.title)
+        adw = session.bd.adw
+        adw.Bind(wx.EVT_WINDOW_DESTROY,
+                 lambda event: self.on_window_destroy(event, session, adw))
+        session.tkr.setup_from_host_requests()  # Wait till after initial display
+        SlTrace.lg(f"session {session.session_num} displayed",
+                   "display_server")
+
+    def on_window_destroy(self, event, session, adw):
+        """ Close session when its window goes, however closed
+        :event: wx.WindowDestroyEvent
+        :session: DisplaySession
+        :adw: session's window
+        """
+        event.Skip()
+        if event.GetEventObject() is adw:       # Not a child window
+            wx.CallAfter(self.close_session, session)
+
+    def close_session(self, session):
+        """ Close session's windows and host link, leaving
+        the server running.  Called in wx thread
+        :session: DisplaySession
+        :returns: True - exit handled
+        """
+        if not session.is_open:
+            return True
+
+        session.is_open = False
+        SlTrace.lg(f"close_session: {session.session_num}", "display_server")
+        if session.bd is not None:
+            self.speaker_control.clear()    # Drop leftover speech, tones
+        tkr = session.tkr
+        if tkr is not None:
+            for adw in [tkr.adw] + tkr.snapshots:
+                if adw:             # Not already destroyed
+                    adw.Destroy()
+            tkr.close()
+        with self.sessions_lock:
+            del self.sessions[session.session_num]
+        return True
+
+
+if __name__ == '__main__':      # Required because we use multiprocessing
+                                # in some modules e.g. pyttsx_proc.py
+    import argparse
+
+    SlTrace.clearFlags()
+    port = DisplayServer.SERVER_PORT
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--port', type=int, dest='port', default=port)
+    args = parser.parse_args()             # or die "Illegal options"
+    SlTrace.lg(f"args: {args}\n")
+
+    display_server = DisplayServer(port=args.port)
+    SlTrace.lg(f"wx_display_server.py waiting for sessions on port {args.port}")
+    display_server.run()
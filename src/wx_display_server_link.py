@@ -0,0 +1,37 @@
+#wx_display_server_link.py  18Oct2026  crs, Author
+"""
+Link from turtle programs (wx_turtle_braille.setup_main) to a
+running display server (wx_display_server.py)
+Only wx_rpc is imported - not wx, the braille display or the
+speaker stack, which the server keeps warm - so a turtle program
+pays little to look for a server.
+"""
+import os
+
+from select_trace import SlTrace
+from wx_rpc import RPCClient
+
+SERVER_PORT = 50030
+NO_SERVER_ENV = "WX_NO_DISPLAY_SERVER"  # set non-empty: setup_main
+                                        # always starts a display process
+
+def connect_display_server(host_name='localhost', port=None):
+    """ Connect to running display server
+    :host_name: server host default: localhost
+    :port: server port default: SERVER_PORT
+    :returns: RPCClient, None if no server running or
+            NO_SERVER_ENV is set
+    """
+    if os.environ.get(NO_SERVER_ENV):
+        return None
+
+    if port is None:
+        port = SERVER_PORT
+    server = RPCClient(host_name, port)
+    try:
+        server.connect()
+    except OSError:
+        SlTrace.lg(f"No display server on port {port}", "display_server")
+        return None
+
+    return server
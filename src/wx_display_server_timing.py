@@ -0,0 +1,148 @@
+# wx_display_server_timing.py  18Oct2026  crs, Author
+""" Turtle program done() to braille window latency:
+    process - new wx_display_main.py process per program
+            (WX_NO_DISPLAY_SERVER set)
+    server  - session on a running wx_display_server.py, started
+            here if none is running
+Each run is a small turtle program, timing setup_main (as done()),
+which returns once the window is displayed and linked
+(TkRPCHost.wait_for_user).  Needs a display (DISPLAY / Xvfb)
+and POSIX process groups, to clean up display processes.
+Usage: python wx_display_server_timing.py [--nrun N] [--timeout SEC]
+"""
+import argparse
+import os
+import re
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from select_trace import SlTrace
+from wx_display_server_link import connect_display_server, NO_SERVER_ENV
+
+TIMED_PROGRAM = '''
+import os
+import time
+import wx_turtle_braille as wtb
+from wx_turtle_braille import *
+
+for colr in ["red", "orange", "yellow", "green"]:
+    color(colr)
+    width(40)
+    forward(200)
+    right(90)
+t_done = time.perf_counter()
+wtb.setup_main()                # As done(), returns with window up
+print(f"done_to_window: {time.perf_counter()-t_done:.4f}", flush=True)
+if wtb.display_session is not None:
+    wtb.display_server.end_session(wtb.display_session)
+    wtb.disconnect_display_server()
+os._exit(0)
+'''
+
+def kill_group(proc):
+    """ Kill process, and those it started (start_new_session)
+    """
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+    proc.wait()
+
+def run_timed(pgm_file, env, timeout):
+    """ Run timed program once
+    :returns: done to window seconds, None if failed
+    """
+    proc = subprocess.Popen([sys.executable, pgm_file], env=env,
+                            cwd=os.path.dirname(pgm_file),
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                            text=True, start_new_session=True)
+    latency = None
+    timer = threading.Timer(timeout, kill_group, args=[proc])
+    timer.start()
+    try:
+        for line in proc.stdout:
+            match = re.match(r'done_to_window: ([\d.]+)', line)
+            if match:
+                latency = float(match.group(1))
+                break
+    finally:
+        timer.cancel()
+        kill_group(proc)        # e.g. wx_display_main.py
+    return latency
+
+def start_server(src_dir, wait=30.):
+    """ Start display server, unless one is running
+    :returns: Popen, None if already running
+    """
+    server = connect_display_server()
+    if server is not None:
+        server.disconnect()
+        SlTrace.lg("Using running display server", to_stdout=True)
+        return None
+
+    proc = subprocess.Popen([sys.executable, "wx_display_server.py"],
+                            cwd=src_dir, start_new_session=True,
+                            stdout=subprocess.DEVNULL,
+                            stderr=subprocess.DEVNULL)
+    t_end = time.time() + wait
+    while time.time() < t_end:
+        time.sleep(.2)
+        server = connect_display_server()
+        if server is not None:
+            server.disconnect()
+            return proc
+    kill_group(proc)
+    raise Exception("display server did not start")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--nrun', type=int, dest='nrun', default=5)
+    parser.add_argument('--timeout', type=float, dest='timeout', default=60)
+    args = parser.parse_args()
+
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    pgm_dir = tempfile.mkdtemp()
+    pgm_file = os.path.join(pgm_dir, "display_latency_pgm.py")
+    with open(pgm_file, "w") as fpgm:
+        fpgm.write(TIMED_PROGRAM)
+    env = dict(os.environ)
+    python_path = env.get("PYTHONPATH")
+    env["PYTHONPATH"] = (src_dir if not python_path
+                         else src_dir + os.pathsep + python_path)
+    env_process = dict(env)
+    env_process[NO_SERVER_ENV] = "1"
+    env_server = dict(env)
+    env_server.pop(NO_SERVER_ENV, None)
+
+    server_proc = None
+    try:
+        for name, run_env in [("process", env_process), ("server", env_server)]:
+            if name == "server":
+                server_proc = start_server(src_dir)
+            latencies = []
+            n_fail = 0
+            for _ in range(args.nrun):
+                latency = run_timed(pgm_file, run_env, args.timeout)
+                if latency is None:
+                    n_fail += 1
+                else:
+                    latencies.append(latency)
+            if latencies:
+                SlTrace.lg(f"{name:8} done->window sec:"
+                           f" min: {min(latencies):6.3f}"
+                           f" median: {statistics.median(latencies):6.3f}"
+                           f" max: {max(latencies):6.3f}"
+                           f"  runs: {len(latencies)} failed: {n_fail}",
+                           to_stdout=True)
+            else:
+                SlTrace.lg(f"{name:8} all {n_fail} runs failed", to_stdout=True)
+    finally:
+        if server_proc is not None:
+            kill_group(server_proc)
+        os.remove(pgm_file)
+        os.rmdir(pgm_dir)
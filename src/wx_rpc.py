@@ -1,13 +1,15 @@
 # wx_rpc.py 30Aug2024  crs  from examples/rpc.py 
 # rpc.py    27Aug2024  from https://github.com/TarasZhere/RPC
-
-import json
+""" Socket rpc, using length prefixed frames (wx_rpc_frame.py)
+with request ids, to support several calls in flight and
+batches of calls in one frame
+"""
 import socket
 import inspect
 import traceback
-from threading import Thread
+from threading import Thread, Lock, Condition
 from select_trace import SlTrace
-SIZE = 2**16
+from wx_rpc_frame import send_frame, recv_frame, BATCH_CALL
 
 
 class RPCServer:
@@ -17,6 +19,8 @@ class RPCServer:
         self.port = port
         self.address = (host, port)
         self._methods = {}
+        self._sock = None           # Listening socket, while running
+        self._stopping = False
 
     def help(self) -> None:
         SlTrace.lg('REGISTERED METHODS:')
@@ -58,41 +62,52 @@ class RPCServer:
         SlTrace.lg(f'Managing requests from {address}.', "rpc")
         while True:
             try:
-                functionName, args, kwargs = json.loads(client.recv(SIZE).decode())
+                req_id, functionName, args, kwargs = recv_frame(client)
             except: 
                 SlTrace.lg(f'! Client {address} disconnected.')
                 break
             # Showing request Type
-            SlTrace.lg(f'> {address} : {functionName}({args})', "rpc")
+            SlTrace.lg(f'> {address} : [{req_id}] {functionName}({args})', "rpc")
             
-            try:
-                response = self._methods[functionName](*args, **kwargs)
-            except Exception as e:
-                estr = "Exception:" + str(e)
-                tbstk = traceback.extract_stack()
-                tbstk_lst = traceback.format_list(tbstk)
-                tbstr = "\n".join(tbstk_lst)
-                SlTrace.lg(f"RPCServer Exception: {estr}")
-                SlTrace.lg(f"__handle__({functionName}, {args}, {kwargs})")
-                SlTrace.lg(f"{tbstr}\n")
-                # Send back exeption if function called by client is not registred 
-                client.sendall(json.dumps(estr).encode())
+            if functionName == BATCH_CALL:
+                response = [self.call_method(*call) for call in args[0]]
             else:
-                client.sendall(json.dumps(response).encode())
-
+                response = self.call_method(functionName, args, kwargs)
+            send_frame(client, (req_id, True, response))
 
         SlTrace.lg(f'Completed request from {address}.')
         client.close()
+
+    def call_method(self, functionName, args, kwargs):
+        """ Call registered method
+        :returns: method's return, "Exception:..." string if it failed
+        """
+        try:
+            return self._methods[functionName](*args, **kwargs)
+        
+        except Exception as e:
+            estr = "Exception:" + str(e)
+            tbstk = traceback.extract_stack()
+            tbstk_lst = traceback.format_list(tbstk)
+            tbstr = "\n".join(tbstk_lst)
+            SlTrace.lg(f"RPCServer Exception: {estr}")
+            SlTrace.lg(f"__handle__({functionName}, {args}, {kwargs})")
+            SlTrace.lg(f"{tbstr}\n")
+            # Send back exeption if function called by client is not registred 
+            return estr
     
     def run(self) -> None:
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             sock.bind(self.address)
             sock.listen()
+            self._sock = sock
 
             SlTrace.lg(f'+ Server {self.address} running', "rpc")
             while True:
                 try:
                     client, address = sock.accept()
+                    client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
 
                     Thread(target=self.__handle__, args=[client, address]).start()
 
@@ -100,18 +115,40 @@ class RPCServer:
                     SlTrace.lg(f'- Server {self.address} interrupted')
                     break
 
+                except OSError:
+                    if not self._stopping:
+                        raise
+                    SlTrace.lg(f'- Server {self.address} stopped', "rpc")
+                    break
+
+    def stop(self) -> None:
+        """ Stop accepting clients, freeing our port
+        Connected clients are served till they disconnect
+        """
+        self._stopping = True
+        if self._sock is not None:
+            try:
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._sock.close()
+
 
 
 class RPCClient:
     def __init__(self, host:str='localhost', port:int=8080) -> None:
         self.__sock = None
         self.__address = (host, port)
+        self.__req_id = 0               # Last request id
+        self.__send_lock = Lock()
+        self.__recv_cond = Condition()  # Guards __responses, __reading
+        self.__reading = False          # Set while a caller reads the socket
+        self.__responses = {}           # Received, unclaimed, by req_id
 
 
     def isConnected(self):
         try:
-            self.__sock.sendall(b'test')
-            self.__sock.recv(SIZE)
+            self.batch([])
             return True
 
         except:
@@ -121,6 +158,7 @@ class RPCClient:
     def connect(self):
         try:
             self.__sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.__sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             SlTrace.lg(f"connect({self.__address})", "rpc")
             self.__sock.connect(self.__address)
         except EOFError as e:
@@ -134,14 +172,54 @@ class RPCClient:
         except:
             pass
 
+    def call_async(self, function_name, *args, **kwargs):
+        """ Send call without waiting for its return
+        :function_name: remote function name
+        :args, kwargs: function's args
+        :returns: request id, for get_result()
+        """
+        with self.__send_lock:
+            self.__req_id += 1
+            req_id = self.__req_id
+            send_frame(self.__sock, (req_id, function_name, args, kwargs))
+        return req_id
+
+    def get_result(self, req_id):
+        """ Wait for call's return
+        Other calls' returns, arriving first, are kept for their callers
+        Several threads may wait at once, e.g. for long polls
+        :req_id: request id from call_async()
+        :returns: remote function's return
+        """
+        with self.__recv_cond:
+            while req_id not in self.__responses:
+                if self.__reading:
+                    self.__recv_cond.wait()     # Another caller is reading
+                    continue
+                
+                self.__reading = True
+                self.__recv_cond.release()
+                try:
+                    resp_id, _, value = recv_frame(self.__sock)
+                finally:
+                    self.__recv_cond.acquire()
+                    self.__reading = False
+                    self.__recv_cond.notify_all()
+                self.__responses[resp_id] = value
+            return self.__responses.pop(req_id)
+
+    def batch(self, calls):
+        """ Make several calls, in one frame each way
+        :calls: list of (function_name, args, kwargs)
+        :returns: list of returns
+        """
+        calls = [(name, tuple(args), dict(kwargs))
+                 for name, args, kwargs in calls]
+        return self.get_result(self.call_async(BATCH_CALL, calls))
 
     def __getattr__(self, __name: str):
         def excecute(*args, **kwargs):
-            self.__sock.sendall(json.dumps((__name, args, kwargs)).encode())
-
-            response = json.loads(self.__sock.recv(SIZE).decode())
-   
-            return response
+            return self.get_result(self.call_async(__name, *args, **kwargs))
         
         return excecute
 
@@ -149,4 +227,4 @@ class RPCClient:
         try:
             self.__sock.close()
         except:
-            pass
\ No newline at end of file
+            pass
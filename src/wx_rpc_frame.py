@@ -0,0 +1,62 @@
+# wx_rpc_frame.py  18Oct2026  crs, Author
+"""
+Length prefixed message framing for wx_rpc / wx_bg_rpc
+
+Each frame: 4 byte (network order) body length + pickle body
+    request:  (req_id, function_name, args, kwargs)
+    response: (req_id, is_ok, value)
+A BATCH_CALL request's args hold a list of
+(function_name, args, kwargs), its response value
+the list of the calls' returns.
+
+Request ids allow several calls in flight on one socket.
+Pickle is used, so both ends must be trusted (our own processes).
+"""
+import pickle
+import struct
+
+HEADER = struct.Struct("!I")
+PICKLE_PROTOCOL = 5
+BATCH_CALL = "__batch__"
+MAX_FRAME = 2**30           # Sanity limit on frame length
+
+
+def send_frame(sock, obj):
+    """ Send one object as a frame
+    :sock: connected socket
+    :obj: picklable object
+    """
+    body = pickle.dumps(obj, protocol=PICKLE_PROTOCOL)
+    sock.sendall(HEADER.pack(len(body)) + body)
+
+
+def recv_exact(sock, nbytes):
+    """ Receive exactly nbytes
+    :sock: connected socket
+    :nbytes: number of bytes
+    :returns: bytearray of nbytes
+    :raises: EOFError if connection closes first
+    """
+    buf = bytearray(nbytes)
+    view = memoryview(buf)
+    nread = 0
+    while nread < nbytes:
+        nrecv = sock.recv_into(view[nread:], nbytes-nread)
+        if nrecv == 0:
+            raise EOFError(f"connection closed after {nread} of {nbytes} bytes")
+
+        nread += nrecv
+    return buf
+
+
+def recv_frame(sock):
+    """ Receive one frame
+    :sock: connected socket
+    :returns: unpickled object
+    :raises: EOFError if connection closed
+    """
+    body_len, = HEADER.unpack(recv_exact(sock, HEADER.size))
+    if body_len > MAX_FRAME:
+        raise EOFError(f"frame length {body_len} exceeds {MAX_FRAME}")
+
+    return pickle.loads(recv_exact(sock, body_len))
@@ -0,0 +1,99 @@
+# wx_rpc_timing.py  18Oct2026  crs, Author
+""" RPC throughput, calls per second:
+    before: one json blob per call, single recv (previous wx_rpc protocol)
+    after:  framed calls (wx_rpc_frame.py) - one at a time,
+            pipelined and batched
+Usage: python wx_rpc_timing.py [--ncalls N] [--port PORT]
+"""
+import argparse
+import json
+import socket
+import time
+from threading import Thread
+
+from select_trace import SlTrace
+from wx_rpc import RPCServer, RPCClient
+
+def get_cell_rect_tur(ix, iy):
+    """ Stand in for CanvasGrid.get_cell_rect_tur
+    """
+    return (ix*20-400, 250-iy*20, ix*20-380, 230-iy*20)
+
+def json_server(port):
+    """ Previous protocol: one json blob each way
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('localhost', port))
+        sock.listen()
+        client, _ = sock.accept()
+        client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        while True:
+            data = client.recv(2**16)
+            if not data:
+                break
+            _, args, kwargs = json.loads(data.decode())
+            ret = get_cell_rect_tur(*args, **kwargs)
+            client.sendall(json.dumps(ret).encode())
+        client.close()
+
+def time_json(port, ncalls):
+    Thread(target=json_server, args=[port], daemon=True).start()
+    time.sleep(.2)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.connect(('localhost', port))
+    t_beg = time.perf_counter()
+    for i in range(ncalls):
+        sock.sendall(json.dumps(("get_cell_rect_tur", (i%40, i%25), {})).encode())
+        json.loads(sock.recv(2**16).decode())
+    t_dur = time.perf_counter() - t_beg
+    sock.close()
+    return ncalls/t_dur
+
+def time_framed(port, ncalls):
+    """ :returns: (sequential, pipelined, batched) calls per second
+    """
+    server = RPCServer('localhost', port)
+    server.registerMethod(get_cell_rect_tur)
+    Thread(target=server.run, daemon=True).start()
+    time.sleep(.2)
+    client = RPCClient('localhost', port)
+    client.connect()
+    ixys = [(i%40, i%25) for i in range(ncalls)]
+
+    t_beg = time.perf_counter()
+    for ix,iy in ixys:
+        client.get_cell_rect_tur(ix, iy)
+    seq_rate = ncalls/(time.perf_counter() - t_beg)
+
+    t_beg = time.perf_counter()
+    req_ids = [client.call_async("get_cell_rect_tur", ix, iy)
+               for ix,iy in ixys]
+    for req_id in req_ids:
+        client.get_result(req_id)
+    pipe_rate = ncalls/(time.perf_counter() - t_beg)
+
+    t_beg = time.perf_counter()
+    rets = client.batch([("get_cell_rect_tur", ixy, {}) for ixy in ixys])
+    batch_rate = ncalls/(time.perf_counter() - t_beg)
+    assert rets[-1] == get_cell_rect_tur(*ixys[-1])
+    client.disconnect()
+    return seq_rate, pipe_rate, batch_rate
+
+if __name__ == "__main__":
+    SlTrace.clearFlags()
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--ncalls', type=int, dest='ncalls', default=5000)
+    parser.add_argument('--port', type=int, dest='port', default=50110)
+    args = parser.parse_args()
+
+    json_rate = time_json(args.port, args.ncalls)
+    seq_rate, pipe_rate, batch_rate = time_framed(args.port+1, args.ncalls)
+    SlTrace.lg(f"calls per second ({args.ncalls} calls)", to_stdout=True)
+    SlTrace.lg(f"    before, json per call: {json_rate:10.0f}", to_stdout=True)
+    SlTrace.lg(f"    framed, sequential:    {seq_rate:10.0f}", to_stdout=True)
+    SlTrace.lg(f"    framed, pipelined:     {pipe_rate:10.0f}", to_stdout=True)
+    SlTrace.lg(f"    framed, batched:       {batch_rate:10.0f}", to_stdout=True)
+    SlTrace.onexit()
+    import os
+    os._exit(0)         # Server threads don't return
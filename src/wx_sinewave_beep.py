@@ -107,7 +107,7 @@ class SineWaveBeep:
 
     def announce_next_pcells(self, pc_ixys, volume=None, dur=None,
                              dur_sep=None, delay_before=None,
-                             ):
+                             key=None, group=None):
         """ Announce next cell
         :pc_ixy: (ix,iy) of next cell
         :volume: sound volume default: self.volume_base
@@ -116,6 +116,8 @@ class SineWaveBeep:
         :dur_sep: length of silence between cell default: self.dur_sep
         :delay_before: delay before first cell's start(now) in series
                      default: dur+dur_sep (assumes previous cell has same dur)
+        :key: replace queued tones with this key default: none
+        :group: don't replace tones of this key, group default: replace
         """
         if volume is None:
             volume = self.volume_base
@@ -130,12 +132,16 @@ class SineWaveBeep:
         for idx, pc_ixy in enumerate(pc_ixys):
             ndx = idx+1
             dly = delay_before if idx == 0 else delay_before + idx*(dur_sep+dur)
-            self.announce_pcell(pc_ixy=pc_ixy, volume=volume-ndx*10, dur=dur, dly=dly)
+            self.announce_pcell(pc_ixy=pc_ixy, volume=volume-ndx*10, dur=dur, dly=dly,
+                                key=key, group=group)
         
-    def announce_pcell(self, pc_ixy, volume=None, dur=None, dly=None):
+    def announce_pcell(self, pc_ixy, volume=None, dur=None, dly=None,
+                       key=None, group=None):
         """ Announce cell
         :volume: stereo volume default: calculate based on pc_ixy
         :dly: delay before the sound
+        :key: replace queued tones with this key default: none
+        :group: don't replace tones of this key, group default: replace
         """
         if self.silence():
             return
@@ -159,7 +165,8 @@ class SineWaveBeep:
                             "pos_tracking")
             else:
                 pitch = self.color_pitches[color]
-            self.play_tone(pitch=pitch, volume=volume, dur=dur, dly=dly)
+            self.play_tone(pitch=pitch, volume=volume, dur=dur, dly=dly,
+                           key=key, group=group)
             SlTrace.lg(f"in cell: play_tone(pitch={pitch},"
                        f" vol_l={volume[0]:.3f} vol_r={volume[1]:.3f}"
                        f" dur={dur}, dly={dly})"
@@ -170,7 +177,7 @@ class SineWaveBeep:
             SlTrace.lg(f"announce blank: play_blank(dur={self.dur_blank})"
                        f" {cell} at {pc_ixy}", "pos_tracking")
             self.play_blank(ix=ix, iy=iy, dur=self.dur_blank,
-                             dly=dly)
+                             dly=dly, key=key, group=group)
             
     def out_of_bounds_check(self, pc_ixy):
         """ Check for out of bounds / illegal location
@@ -198,7 +205,8 @@ class SineWaveBeep:
 
         return False        
 
-    def play_blank(self, ix, iy, dur=None, volume=None, dly=None):
+    def play_blank(self, ix, iy, dur=None, volume=None, dly=None,
+                   key=None, group=None):
         """ Play sound indicating blank area - non-blocking
         Treat a blank as white (combo of red, green, blue)
         :ix,iy: location
@@ -206,6 +214,8 @@ class SineWaveBeep:
         :volume: (vl,vr) stereo sound volume in decibels
              default: calculated
         :dly: delay(silence) before sound
+        :key: replace queued tones with this key default: none
+        :group: don't replace tones of this key, group default: replace
         """
         if dur is None:
             dur = self.dur_blank
@@ -216,7 +226,8 @@ class SineWaveBeep:
         vl,vr = volume
         SlTrace.lg(f"play_blank:volume:{vl:.1f},{vr:.1f}", "pos_tracking")
         self.play_tone(pitch=self.color2pitch("BLANK"), dur=self.dur_blank,
-                                               volume=volume)
+                                               volume=volume,
+                                               key=key, group=group)
 
     def play_tones(self,pitches, dur=None, volume=None, dly=None):
         """ Play sound - non-blocking
@@ -258,12 +269,15 @@ class SineWaveBeep:
     ############################################################
     """
 
-    def play_tone(self,pitch, dur=None, volume=None, dly=None):
+    def play_tone(self,pitch, dur=None, volume=None, dly=None,
+                  key=None, group=None):
         """ Play sound - non-blocking
         :pitch: sound pitch
         :dur: sound duration default:dur_base (msec)
         :volume: sound volume in decibels default: volume_base
         :dly: delay(silence) before sound
+        :key: replace queued tones with this key default: none
+        :group: don't replace tones of this key, group default: replace
         """
         if not isinstance(volume, tuple):
             volume = (volume,volume)
@@ -274,7 +288,8 @@ class SineWaveBeep:
             vol_right += vol_adj
             volume = (vol_left,vol_right)
 
-        self.speaker_control.play_tone(pitch=pitch, dur=dur, volume=volume, dly=dly)
+        self.speaker_control.play_tone(pitch=pitch, dur=dur, volume=volume, dly=dly,
+                                       key=key, group=group)
 
 
     def get_vol_adj(self):
@@ -4,23 +4,30 @@ Support thread safe non-blocking speaker control:
     1. text to speech encapsulation of pyttsxN facilitating
      talk from multiple AudioDrawWindow sources
     2. tone playing using SineWaveNumPy, audio-sounddevice
+       through one persistent AudioOutputStream
     3. Using wxPython utilities for time control
     4. Using PyttsxProc for speech to text
     
 """
+import os
 import threading
-import queue
 import time
 import wx
 
-import sounddevice as sd
+try:
+    import sounddevice as sd
+except (ImportError, OSError):   # OSError: no PortAudio library
+    sd = None           # headless e.g. null audio test runs
 
 from format_exception import format_exception
 from select_trace import SlTrace, SelectError
 from wx_play_sound_control import PlaySoundControl
 from sinewave_numpy import SineWaveNumPy
+from audio_output_stream import AudioOutputStream
 
 from pyttsx_proc import PyttsxProc
+from speech_clip_cache import SpeechClipCache
+from speaker_cmd_queue import SpeakerCmdQueue
 from speech_maker_cmd import SpeechMakerCmd
 
 
@@ -138,7 +145,8 @@ class SpeakerControlCmd:
 
     def __init__(self, cmd_type=None, msg=None, msg_type=None,
                  rate=None, volume=None,
-                 tone=None, waveform=None, fr=None, after=None):
+                 tone=None, waveform=None, fr=None, after=None,
+                 key=None, group=None, priority=None):
         """ Setup command
         :cmd_type: command to execute
                 "CMD_MSG" - speak message - msg REQUIRED
@@ -160,9 +168,17 @@ class SpeakerControlCmd:
         :fr: SpeakerControlLocal's window reference
         :after: function to call after cmd completion
                 default: no call
+        :key: queued commands with the same key are replaced
+                by this one e.g. "pos_report" default: no key
+        :group: commands with the same key and group don't
+                replace each other e.g. tones of one report
+                default: replace all with key
+        :priority: higher priority commands are played first
+                default: by msg_type SpeakerControl.MSG_PRIORITY, else 0
         """
         self.cmd_id = SpeakerControl.new_id()
         self.cmd_type = cmd_type
+        self.time_created = time.time()     # For start wait stats
                 
         self.msg = msg
         self.msg_type = msg_type
@@ -172,6 +188,11 @@ class SpeakerControlCmd:
         self.waveform = waveform
         self.fr = fr
         self.after = after
+        self.key = key
+        self.group = group
+        if priority is None:
+            priority = SpeakerControl.MSG_PRIORITY.get(msg_type, 0)
+        self.priority = priority
         if after is not None:
             if fr is None:
                 ###wxport###raise SpeakerControlError(f"after missing fr cmd:{self}")
@@ -199,6 +220,10 @@ class SpeakerControlCmd:
             ret += f" {self.waveform}"
         if self.after is not None:
             ret += f" fr:{self.fr} after:{self.after}"
+        if self.key is not None:
+            ret += f" key:{self.key}"
+            if self.group is not None:
+                ret += f" group:{self.group}"
         
         return ret
 
@@ -207,6 +232,19 @@ class SpeakerControl(Singleton):
     CMDS_SIZE = 150
     SOUND_SIZE = 150
     #SOUND_SIZE = 30        # To force filling
+    AUDIO_STREAM = True     # True - tones, waveforms via AudioOutputStream
+                            # False - sd.play/sd.stop per sound
+    AUDIO_DEVICE = None     # AudioOutputStream device e.g. "null" headless
+    AUDIO_FILE = None       # wav file for AUDIO_DEVICE "file"
+    AUDIO_MAX_AHEAD = 10.   # Most seconds queued in AudioOutputStream,
+                            # oldest dropped, as sc_sound_queue drops
+    AUDIO_LOOK_AHEAD = .2   # Seconds fed to AudioOutputStream ahead of
+                            # output, the backlog waits in sc_sound_queue,
+                            # by priority, so an ECHO is played next
+    SPEECH_CACHE = False    # True - speak messages from rendered clips
+                            # when available (requires AUDIO_STREAM)
+    SPEECH_CACHE_DIR = None # clip directory default: temp directory
+    MSG_PRIORITY = {"ECHO": 2, "CMD": 1}    # by msg_type, others 0
     cmd_id = 0
     
     @classmethod
@@ -244,13 +282,35 @@ class SpeakerControl(Singleton):
         self.psc = PlaySoundControl()
         self.sound_lock = threading.Lock()
         self.cmds_in_progress = {}   # cmd ins process by cmd_id
-        self.sc_cmd_queue = queue.Queue(self.cmds_size)  # Command queue of SpeakerControlCmd
+        # Command queue of SpeakerControlCmd - FIFO, so CLEAR stays in order
+        self.sc_cmd_queue = SpeakerCmdQueue(self.cmds_size, use_priority=False,
+                                            on_drop=self.cmd_dropped,
+                                            cmd_class=self.cmd_class)
         self.sc_cmd_thread = threading.Thread(target=self.sc_cmd_proc_thread)
-        self.sc_sound_queue = queue.Queue(self.sound_size)  # speech queue of SpeakerControlCmd 
+        # speech queue of SpeakerControlCmd - by priority
+        self.sc_sound_queue = SpeakerCmdQueue(self.sound_size,
+                                              on_drop=self.cmd_dropped,
+                                              cmd_class=self.cmd_class)
         self.sc_sound_thread = threading.Thread(target=self.sc_sound_proc_thread)
-        self.sc_sound_thread.start()
-        self.sc_cmd_thread.start()
+        self.start_stats = {}           # sound start waits, by cmd_class
         self.sc_tone_busy = False       # True - iff toneing
+        if getattr(self, "audio_stream", None) is not None:
+            self.audio_stream.close()   # Restarting
+        self.audio_stream = None
+        if self.AUDIO_STREAM:           # Started on first use
+            self.audio_stream = AudioOutputStream(sample_rate=self.sample_rate,
+                                                  device=self.AUDIO_DEVICE,
+                                                  file_name=self.AUDIO_FILE,
+                                                  max_segments=self.sound_size,
+                                                  max_ahead=self.AUDIO_MAX_AHEAD)
+        if getattr(self, "speech_cache", None) is not None:
+            self.speech_cache.close()
+        self.speech_cache = None
+        if self.SPEECH_CACHE and self.audio_stream is not None:
+            self.speech_cache = SpeechClipCache(cache_dir=self.SPEECH_CACHE_DIR,
+                                                sample_rate=self.sample_rate)
+        self.sc_sound_thread.start()    # After audio_stream is setup
+        self.sc_cmd_thread.start()
 
         
     def sc_cmd_proc_thread(self):
@@ -318,7 +378,7 @@ class SpeakerControl(Singleton):
         """ Clear queue
         """
         SlTrace.lg("speech clearing")
-        sd.stop()
+        self.stop_sound()
         self.clear_cmd_queue()
         SlTrace.lg(f"self.sc_cmd_queue.qsize(): {self.sc_cmd_queue.qsize()}")
         self.clear_sound_queue()
@@ -331,22 +391,89 @@ class SpeakerControl(Singleton):
         """ Stop current scan
         """
         self.clear()
+
+    def stop_sound(self):
+        """ Stop current and queued tones/waveforms
+        """
+        if self.audio_stream is not None:
+            self.audio_stream.clear()
+        else:
+            sd.stop()
     
     def stop_speak_text(self):
         """ Stop current and pending text speach
+        With speech cache, clips share the audio stream with tones,
+        so pending tones are also stopped
         """
         self.pyttsx_proc.clear()
+        if self.speech_cache is not None:
+            self.audio_stream.clear()
         
 
     def clear_cmd_queue(self):
-        while self.sc_cmd_queue.qsize() > 0:
-            cmd = self.sc_cmd_queue.get()
+        for cmd in self.sc_cmd_queue.clear():
             SlTrace.lg(f"removing cmd entry: {cmd}")
 
     def clear_sound_queue(self):
-        while self.sc_sound_queue.qsize() > 0:
-            cmd = self.sc_sound_queue.get()
+        for cmd in self.sc_sound_queue.clear():
             SlTrace.lg(f"removing speech queue entry: {cmd}")
+
+    @staticmethod
+    def cmd_class(cmd):
+        """ Get command class for queue statistics
+        :cmd: SpeakerControlCmd
+        :returns: msg_type for messages e.g. "REPORT", else cmd_type
+        """
+        if cmd.cmd_type == "CMD_MSG":
+            return cmd.msg_type if cmd.msg_type is not None else "REPORT"
+        return cmd.cmd_type
+
+    def cmd_dropped(self, cmd, reason):
+        """ Queued command superseded or dropped
+        :cmd: SpeakerControlCmd
+        :reason: "superseded" or "dropped"
+        """
+        SlTrace.lg(f"{reason}: {cmd}", "sound_queue")
+        self.cmd_done(cmd)
+
+    def count_start(self, cmd, time_start=None):
+        """ Record command's start wait, sent to sound start
+        :cmd: SpeakerControlCmd
+        :time_start: (expected) sound start time default: now
+        """
+        if time_start is None:
+            time_start = time.time()
+        wait = time_start - cmd.time_created
+        cls = self.cmd_class(cmd)
+        stats = self.start_stats.get(cls)
+        if stats is None:
+            stats = self.start_stats[cls] = dict(n_started=0, wait_total=0.,
+                                                 wait_max=0.)
+        stats["n_started"] += 1
+        stats["wait_total"] += wait
+        stats["wait_max"] = max(stats["wait_max"], wait)
+
+    def get_start_stats(self):
+        """ Get sound start wait statistics by command class
+        :returns: dictionary by class of dictionary:
+                    n_started, wait_avg, wait_max (seconds)
+        """
+        stats = {}
+        for cls, cls_stats in list(self.start_stats.items()):
+            n_started = cls_stats["n_started"]
+            stats[cls] = dict(n_started=n_started,
+                    wait_avg=cls_stats["wait_total"]/n_started,
+                    wait_max=cls_stats["wait_max"])
+        return stats
+
+    def get_queue_stats(self):
+        """ Get command and sound queue statistics by command class
+        :returns: dictionary of "cmd", "sound" SpeakerCmdQueue.get_stats(),
+                    "start" get_start_stats()
+        """
+        return dict(cmd=self.sc_cmd_queue.get_stats(),
+                    sound=self.sc_sound_queue.get_stats(),
+                    start=self.get_start_stats())
             
     def force_clear(self):
         """ force Clear
@@ -357,7 +484,7 @@ class SpeakerControl(Singleton):
         SlTrace.lg(f"self.sc_cmd_queue.qsize(): {self.sc_cmd_queue.qsize()}")
         self.clear_sound_queue()
         SlTrace.lg(f"self.sc_sound_queue.qsize(): {self.sc_sound_queue.qsize()}")
-        sd.stop()                   # Stop waveform
+        self.stop_sound()               # Stop waveform
         self.forced_clear = True        # stoping waits...
 
         #if self.pyttsxN_engine.isBusy():
@@ -380,6 +507,9 @@ class SpeakerControl(Singleton):
         if self.pyttsx_proc.is_busy() or self.sc_tone_busy:     # Fast check
             return True
         
+        if self.audio_stream is not None and self.audio_stream.is_busy():
+            return True
+        
         if self.get_cmd_queue_size() > 0:
             return True
          
@@ -415,25 +545,19 @@ class SpeakerControl(Singleton):
         while True:
             qsize = self.sc_sound_queue.qsize()
             SlTrace.lg(f"sound_queue {qsize}: BEFORE sc_sound_queue.get()", "sound_queue")
-            buffer = 10
-            space_left = self.sound_size - qsize
-            if space_left < buffer:
-                SlTrace.lg(f"Speech queue filling qsize:{qsize}"
-                           f" of {self.sound_size}")
-                while True:
-                    qsize = self.sc_sound_queue.qsize()
-                    space_left = self.sound_size - qsize
-                    if space_left < 2*buffer:
-                        cmd = self.sc_sound_queue.get()
-                        SlTrace.lg(f"dropping {cmd}")
-                    else:
-                        break
-            
+            # When full, sc_sound_queue drops lowest priority, oldest first
             self.sound_busy = True  # Busy till complete
                                     # Avoid hazard of empty queue
                                     # and no active sound        
+            if self.audio_stream is not None:
+                # Backlog stays in sc_sound_queue, where priority counts
+                self.audio_stream.wait_ahead(self.AUDIO_LOOK_AHEAD)
             cmd = self.sc_sound_queue.get()
+            ahead = 0.      # Seconds before cmd's sound starts
+            if self.audio_stream is not None:
+                ahead = self.audio_stream.get_ahead()
             SlTrace.lg(f"speech queue: cmd: {cmd}", "sound_queue")
+            queued = False      # True - cmd_done called when played
             if cmd.cmd_type == "CLEAR":
                 continue
             elif cmd.cmd_type == "QUIT":
@@ -441,28 +565,53 @@ class SpeakerControl(Singleton):
                 break
 
             elif cmd.cmd_type == "CMD_MSG":
-                msg = cmd.msg
-                msg_type = cmd.msg_type
-                self.speak_text(msg, msg_type=msg_type,
-                                rate=cmd.rate, volume=cmd.volume)
-                SlTrace.lg(f"sound_queue: cmd: {cmd} AFTER speak_text", "sound_queue")
+                clip = None
+                if self.speech_cache is not None:
+                    clip = self.speech_cache.get_waveform(cmd.msg,
+                                            rate=cmd.rate, volume=cmd.volume)
+                if clip is not None:        # Rendered - play after tones
+                    waveform = SpeakerWaveform(clip, dur=None,
+                                               sample_rate=self.sample_rate)
+                    self.count_start(cmd, time.time() + ahead)
+                    queued = self.play_waveform(waveform, cmd=cmd)
+                    SlTrace.lg(f"sound_queue: cmd: {cmd} AFTER cached speech",
+                               "sound_queue")
+                else:
+                    if self.audio_stream is not None:
+                        self.audio_stream.wait_idle()   # Speak after the
+                                                        # look ahead tones
+                    self.count_start(cmd)
+                    msg = cmd.msg
+                    msg_type = cmd.msg_type
+                    self.speak_text(msg, msg_type=msg_type,
+                                    rate=cmd.rate, volume=cmd.volume)
+                    SlTrace.lg(f"sound_queue: cmd: {cmd} AFTER speak_text", "sound_queue")
             elif cmd.cmd_type == "CMD_TONE":
-                self.play_tone(cmd.tone)
+                self.count_start(cmd, time.time() + ahead)
+                queued = self.play_tone(cmd.tone, cmd=cmd)
                 SlTrace.lg(f"sound_queue: cmd: {cmd} AFTER play_tone", "sound_queue")
             elif cmd.cmd_type == "CMD_WAVEFORM":
-                self.play_waveform(cmd.waveform)
+                self.count_start(cmd, time.time() + ahead)
+                queued = self.play_waveform(cmd.waveform, cmd=cmd)
                 SlTrace.lg(f"sound_queue: cmd: {cmd} AFTER play_waveform", "sound_queue")
             else:
                 raise SpeakerControlError(f"Unrecognized speaker cmd type:{cmd.cmd_type} in {cmd}")
-            if cmd.after is not None:
-                cmd_id = cmd.cmd_id
-                if cmd.fr is None:
-                    ###wxportraise SpeakerControlError(f"after missing fr in cmd {cmd}")
-                    pass
-                if cmd_id in self.cmds_in_progress:
-                    del self.cmds_in_progress[cmd_id]
+            if not queued:
+                self.cmd_done(cmd)
                 
         SlTrace.lg("sc_sound_proc_thread returning")
+
+    def cmd_done(self, cmd):
+        """ Command completed
+        :cmd: SpeakerControlCmd
+        """
+        if cmd.after is not None:
+            cmd_id = cmd.cmd_id
+            if cmd.fr is None:
+                ###wxportraise SpeakerControlError(f"after missing fr in cmd {cmd}")
+                pass
+            if cmd_id in self.cmds_in_progress:
+                del self.cmds_in_progress[cmd_id]
             
     def quit(self):
         SlTrace.lg("SpeakerControl quitting")
@@ -470,6 +619,10 @@ class SpeakerControl(Singleton):
         self._running = False       # All our threads watch this
         self.sc_cmd_queue.put(SpeakerControlCmd(cmd_type="QUIT"))   # drop the wait
         self.sc_sound_queue.put(SpeakerControlCmd(cmd_type="QUIT"))   # drop the wait
+        if self.audio_stream is not None:
+            self.audio_stream.close()
+        if self.speech_cache is not None:
+            self.speech_cache.close()
         SlTrace.lg("Force threads stop")
         #self.sc_sound_thread.join()
         #self.sc_cmd_thread.join()
@@ -493,12 +646,25 @@ class SpeakerControl(Singleton):
         while not self._delay.is_end():
             time.sleep(.001) 
         
-    def play_tone(self, tone):
+    def play_tone(self, tone, cmd=None):
         """ Called to play pending tone
         :tone: (SpeakerTone) tuple left,right or monoral
+        :cmd: SpeakerControlCmd, if any, completed by cmd_done
+        :returns: True if queued to audio_stream - cmd_done called
+                    when played, False if played
         """
         if type(tone.volume) != tuple:
             tone.volume = (tone.volume,tone.volume)
+        if self.audio_stream is not None:
+            vol_left,vol_right = tone.volume
+            stereo_waveform = SineWaveNumPy(pitch = tone.pitch,
+                duration=tone.dur,
+                decibels_left=vol_left,
+                decibels_right=vol_right)
+            self.audio_stream.play(stereo_waveform.wf_ndarr, delay=tone.delay,
+                                   on_done=self.on_done_fun(cmd),
+                                   **self.supersede_args(cmd))
+            return True
             
         self.sc_tone_busy = True
         SlTrace.lg(f"play_tone: qsize: {self.get_sound_queue_size()}",
@@ -522,25 +688,61 @@ class SpeakerControl(Singleton):
             SlTrace.lg("Printing the full traceback as if we had not caught it here...")
             SlTrace.lg(format_exception(e))
         self.sc_tone_busy = False
+        return False
+
+    def on_done_fun(self, cmd):
+        """ Get audio_stream on_done function for cmd
+        :cmd: SpeakerControlCmd or None
+        :returns: function(segment) or None
+        """
+        if cmd is None:
+            return None
+        
+        return lambda seg: self.cmd_done(cmd)
+
+    @staticmethod
+    def supersede_args(cmd):
+        """ Get audio_stream key, group for cmd, so a superseding
+        command also cancels segments already in the stream
+        :cmd: SpeakerControlCmd or None
+        :returns: dictionary of key, group
+        """
+        if cmd is None:
+            return dict(key=None, group=None)
+        
+        return dict(key=cmd.key, group=cmd.group)
         
-    def play_waveform(self, waveform):
+    def play_waveform(self, waveform, cmd=None):
         """ Called to play pending waveform
         :waveform: (SpeakerWaveform) waveform to play
         :dur: duration default: waveform.dur
         :sample_rate: sample rate default: waveform.sample_rate,
                                            else: self.sample_rate
+        :cmd: SpeakerControlCmd, if any, completed by cmd_done
+        :returns: True if queued to audio_stream - cmd_done called
+                    when played, False if played
         """
-        self.sc_tone_busy = True
         dur = waveform.dur
         sample_rate = waveform.sample_rate
         if sample_rate is None:
             sample_rate = self.sample_rate
+        wf_len = waveform.ndarr.shape[0]
         if dur is None or waveform.calculate_dur:
-            wf_shape = waveform.ndarr.shape
-            wf_len = wf_shape[0]
             dur = wf_len/sample_rate
         SlTrace.lg(f"play_waveform: len:{wf_len} dur: {dur}",
                     "sound_time")
+        if (self.audio_stream is not None
+                and sample_rate == self.audio_stream.sample_rate):
+            nframes = int(round(dur*sample_rate))
+            ndarr = waveform.ndarr
+            if nframes < wf_len:
+                ndarr = ndarr[:nframes]     # Truncate, as does delay_for
+            self.audio_stream.play(ndarr, delay=waveform.delay,
+                                   on_done=self.on_done_fun(cmd),
+                                   **self.supersede_args(cmd))
+            return True
+        
+        self.sc_tone_busy = True
         try:                
             with self.sound_lock:
                 if waveform.delay is not None:
@@ -557,6 +759,7 @@ class SpeakerControl(Singleton):
             SlTrace.lg("Printing the full traceback as if we had not caught it here...")
             SlTrace.lg(format_exception(e))
         self.sc_tone_busy = False
+        return False
                 
     def speak_text(self, msg, msg_type=None,
                    rate=240, volume=.9):
@@ -581,7 +784,8 @@ class SpeakerControl(Singleton):
 
     def send_cmd(self, cmd_type='speak', msg=None, msg_type=None,
                  rate=None, volume=None, tone=None,
-                 waveform=None, fr=None, after=None):
+                 waveform=None, fr=None, after=None,
+                 key=None, group=None, priority=None):
         """ Send cmd to speaker control engine
             storing hash of cmds in process
             Sets self.sc_busy True, which is cleared
@@ -603,6 +807,10 @@ class SpeakerControl(Singleton):
         :fr: SpeakerControlLocal's window reference
         :after: function to call after cmd completion
                 default: no call
+        :key: replace queued commands with this key default: none
+        :group: don't replace commands of this key and group
+                default: replace all with key
+        :priority: play priority default: by msg_type
         :returns: cmd, cmd_id, after is needed but cmd is for documentation
         """
         self.sc_busy = True
@@ -611,7 +819,8 @@ class SpeakerControl(Singleton):
                                  msg_type=msg_type,
                                  rate=rate, volume=volume,
                                  tone=tone, waveform=waveform,
-                                 after=after)
+                                 after=after, key=key, group=group,
+                                 priority=priority)
         cmd_id = cmd.cmd_id
         self.cmds_in_progress[cmd_id] = cmd
         self.sc_cmd_queue.put(cmd)
@@ -639,7 +848,8 @@ class SimpleSpeakerControl():
     
     def send_cmd(self, cmd_type='speak', msg=None, msg_type=None,
                  rate=None, volume=None, tone=None,
-                 waveform=None, fr=None, after=None):
+                 waveform=None, fr=None, after=None,
+                 key=None, group=None, priority=None):
         """ Stub out major cmd processing
         """
 
@@ -666,7 +876,18 @@ class SpeakerControlLocal:
     """ Localinstance of SpeakerControl
     """
 
+    NULL_AUDIO_ENV = "WX_NULL_AUDIO"    # set non-empty: simple_speaker
+                                        # e.g. headless test runs
+
     def __init__(self, logging_sound=False, simple_speaker=False):
+        """ Setup local speaker control
+        :logging_sound: log spoken text default: False
+        :simple_speaker: True - no sound/speech (SimpleSpeakerControl)
+                default: False unless WX_NULL_AUDIO environment
+                variable is set
+        """
+        if os.environ.get(self.NULL_AUDIO_ENV):
+            simple_speaker = True
         self.make_silent(False)
         self.logging_sound = logging_sound
         self.simple_speaker = simple_speaker
@@ -727,6 +948,12 @@ class SpeakerControlLocal:
         """
         return self.sc.is_busy()
 
+    def get_queue_stats(self):
+        """ Get queue wait times, superseded and dropped counts
+        by command class
+        """
+        return self.sc.get_queue_stats()
+
     def wait_while_busy(self):
         while self.sc.busy_parts():
             pass    ###wxport###
@@ -734,16 +961,23 @@ class SpeakerControlLocal:
     def quit(self):    
         self.sc.quit()
 
-    def play_tone(self, pitch, dur=None, volume=None, dly=None):
+    def play_tone(self, pitch, dur=None, volume=None, dly=None,
+                  key=None, group=None, priority=None):
         """ play tone
         :pitch: tone pitch
         :dur: tone duration
         :volume: (left,right) decibels
         :dly: delay(seconds) from start default: no delay
+        :key: replace queued tones with this key
+                e.g. "pos_tone" default: no key
+        :group: don't replace tones of this key and group
+                e.g. position report number default: replace all with key
+        :priority: play priority default: 0
         """
         tone = SpeakerTone(pitch=pitch, dur=dur, volume=volume)
         SlTrace.lg(f"play_tone tone: {tone}", "play_tone")
-        self.sc.send_cmd(cmd_type="CMD_TONE", tone=tone)
+        self.sc.send_cmd(cmd_type="CMD_TONE", tone=tone,
+                         key=key, group=group, priority=priority)
         
     def play_waveform(self, ndarr, dur=None, dly=None,
                                sample_rate=None,
@@ -812,7 +1046,8 @@ class SpeakerControlLocal:
                         
     def speak_text(self, msg, dup_stdout=True,
                    msg_type=None,
-                   rate=None, volume=None):
+                   rate=None, volume=None,
+                   key=None, priority=None):
         """ Speak text, if possible else write to stdout
         :msg: text message, iff speech
         :dup_stdout: duplicate to stdout default: True
@@ -823,18 +1058,23 @@ class SpeakerControlLocal:
         :rate: speech rate words per minute
                 default: 240
         :volume: volume default: .9
-            
+        :key: replace queued messages with this key
+                e.g. "pos_report" default: no key
+        :priority: play priority default: by msg_type
+                ECHO before CMD before REPORT
         """
         if msg_type is None:
             msg_type = "REPORT"
         if self.logging_sound:
             SlTrace.lg(msg)
         text_lines = msg.split("\n")
-        for text_line in text_lines:
+        group = SpeakerControl.new_id() if key is not None else None
+        for text_line in text_lines:    # lines don't replace each other
             if not self._silent:
                 self.sc.send_cmd(cmd_type="CMD_MSG", msg=text_line,
                                   msg_type=msg_type,
-                                  rate=rate, volume=volume)
+                                  rate=rate, volume=volume,
+                                  key=key, group=group, priority=priority)
         if dup_stdout and not self.logging_sound:
             SlTrace.lg(msg)
 
@@ -0,0 +1,127 @@
+# wx_speaker_control_timing.py  18Oct2026  crs, Author
+""" Position tone lag, through SpeakerControl's AudioOutputStream
+(AUDIO_STREAM, "null" device - real time, no sound)
+Simulated moves, faster than their tones play, each sending a
+group of keyed position tones, as AdwFrontEnd position reports:
+    unkeyed - every move's tones are played
+    keyed - key "pos_tone", group per move: a move's tones
+            supersede those of earlier moves, queued in
+            sc_sound_queue or already in the audio stream
+lag: last move to last tone played
+Then an ECHO message sent behind a tone backlog (--nbacklog tones):
+only AUDIO_LOOK_AHEAD of tones is in the audio stream, the rest
+wait in sc_sound_queue, where the ECHO is got first.
+Start wait (sent to sound start) and sound queue wait are
+reported by command class.
+Checks that unkeyed tones were all played, that keyed tones
+were superseded, and that the ECHO start wait is within the
+look ahead, not behind the backlog.
+Usage: python wx_speaker_control_timing.py [--nmove N] [--move_int SEC]
+                [--nbacklog N]
+"""
+import argparse
+import sys
+import time
+
+from select_trace import SlTrace
+from wx_speaker_control import SpeakerControl, SpeakerTone
+
+
+def run_moves(sc, nmove, move_int, ntone, dur, key=None):
+    """ Send moves' tones, wait till all played
+    :returns: lag seconds
+    """
+    for imove in range(nmove):
+        for itone in range(ntone):
+            tone = SpeakerTone(pitch=440+imove*10, volume=(-20,-20),
+                               dur=dur, delay=dur/2)
+            sc.send_cmd(cmd_type="CMD_TONE", tone=tone,
+                        key=key, group=imove)
+        time.sleep(move_int)
+    t_last_move = time.perf_counter()
+    while sc.get_cmd_queue_size() > 0 or sc.get_sound_queue_size() > 0:
+        time.sleep(.001)
+    sc.audio_stream.wait_idle()
+    return time.perf_counter() - t_last_move
+
+
+def run_echo(sc, nbacklog, dur):
+    """ Send a tone backlog, then an ECHO message, wait till
+    the ECHO is started and the tones played
+    """
+    for itone in range(nbacklog):
+        tone = SpeakerTone(pitch=440+itone*10, volume=(-20,-20), dur=dur)
+        sc.send_cmd(cmd_type="CMD_TONE", tone=tone)
+    time.sleep(dur)         # Backlog playing
+    sc.send_cmd(cmd_type="CMD_MSG", msg="echo", msg_type="ECHO")
+    t_end = time.perf_counter() + nbacklog*dur + 5.
+    while ("ECHO" not in sc.get_start_stats()
+           and time.perf_counter() < t_end):
+        time.sleep(.001)
+    while sc.get_cmd_queue_size() > 0 or sc.get_sound_queue_size() > 0:
+        time.sleep(.001)
+    sc.audio_stream.wait_idle()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--nmove', type=int, dest='nmove', default=20)
+    parser.add_argument('--move_int', type=float, dest='move_int',
+                        default=.02)
+    parser.add_argument('--ntone', type=int, dest='ntone', default=3)
+    parser.add_argument('--dur', type=float, dest='dur', default=.05)
+    parser.add_argument('--nbacklog', type=int, dest='nbacklog',
+                        default=40)
+    args = parser.parse_args()
+    SpeakerControl.AUDIO_STREAM = True
+    SpeakerControl.AUDIO_DEVICE = "null"
+    sc = SpeakerControl()
+    failed = False
+    for name, key in [("unkeyed", None), ("keyed", "pos_tone")]:
+        stats_before = sc.audio_stream.get_stats()
+        q_before = sc.get_queue_stats()["sound"].get("CMD_TONE", {})
+        lag = run_moves(sc, args.nmove, args.move_int,
+                        args.ntone, args.dur, key=key)
+        stats = sc.audio_stream.get_stats()
+        q_stats = sc.get_queue_stats()["sound"].get("CMD_TONE", {})
+        n_superseded = stats["superseded"] - stats_before["superseded"]
+        n_cancelled = stats["cancelled"] - stats_before["cancelled"]
+        n_q_superseded = (q_stats.get("n_superseded", 0)
+                          - q_before.get("n_superseded", 0))
+        SlTrace.lg(f"{name:8} {args.nmove} moves lag: {lag:6.3f} sec"
+                   f"  superseded queue: {n_q_superseded}"
+                   f" stream: {n_superseded}"
+                   f" cancelled: {n_cancelled}", to_stdout=True)
+        if key is None and n_cancelled > 0:
+            SlTrace.lg(f"{name}: unkeyed tones cancelled", to_stdout=True)
+            failed = True
+        if key is not None and n_superseded + n_q_superseded == 0:
+            SlTrace.lg(f"{name}: no tones superseded", to_stdout=True)
+            failed = True
+
+    run_echo(sc, args.nbacklog, args.dur)
+    q_stats = sc.get_queue_stats()
+    backlog = args.nbacklog*args.dur
+    SlTrace.lg(f"ECHO behind {backlog:.2f} sec tone backlog,"
+               f" look ahead {sc.AUDIO_LOOK_AHEAD:.2f} sec", to_stdout=True)
+    for cls in sorted(q_stats["start"]):
+        start = q_stats["start"][cls]
+        sound = q_stats["sound"].get(cls, {})
+        SlTrace.lg(f"{cls:10} n:{start['n_started']:4}"
+                   f"  start wait avg: {start['wait_avg']:6.3f}"
+                   f" max: {start['wait_max']:6.3f} sec"
+                   f"  queue wait avg: {sound.get('wait_avg', 0.):6.3f}"
+                   f" max: {sound.get('wait_max', 0.):6.3f} sec",
+                   to_stdout=True)
+    echo_start = q_stats["start"].get("ECHO")
+    echo_limit = sc.AUDIO_LOOK_AHEAD + args.dur + .1
+    if echo_start is None:
+        SlTrace.lg("ECHO: not started", to_stdout=True)
+        failed = True
+    elif echo_start["wait_max"] > echo_limit:
+        SlTrace.lg(f"ECHO: start wait {echo_start['wait_max']:.3f}"
+                   f" > {echo_limit:.3f} sec", to_stdout=True)
+        failed = True
+    sc.quit()
+    SlTrace.lg("check " + ("FAILED" if failed else "passed"), to_stdout=True)
+    SlTrace.onexit()
+    sys.exit(1 if failed else 0)
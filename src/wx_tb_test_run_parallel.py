@@ -0,0 +1,291 @@
+# wx_tb_test_run_parallel.py    18Oct2026  crs, Author, from wx_tb_test_run.py
+"""
+Run wx_tb_test list programs in parallel, headless
+    Programs are found in list file of the wx_tb_test_run.py format:
+        # comment line - ignored
+        python_test_file [; timeout seconds]
+    Each test runs as its own process, up to --jobs at a time:
+        under a virtual X display (Xvfb) if available and no
+            --no_xvfb (Linux)
+        with null audio/speech: WX_NULL_AUDIO environment
+            (SpeakerControlLocal simple_speaker)
+    Each test's output is placed in test_out_dir/<test>_<ts>.out
+    Each test runs in its own process group (session), killed
+    whole on timeout, and when the test exits, so display processes
+    it started do not outlive it.
+    Per test wall time, peak RSS and status are appended to a JSONL
+    history file.  Peak RSS (os.wait4) is the test process's own, or
+    that of a descendant it waited for - not of processes killed
+    with its group; tests taking longer than previous passing runs
+    are flagged as timing regressions.
+Usage: python wx_tb_test_run_parallel.py [--list FILE] [--jobs N]
+            [--timeout SEC] [--out_dir DIR] [--history FILE]
+            [--tolerance F] [--min_sec SEC] [--no_xvfb]
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import json
+import os
+import re
+import shutil
+import signal
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+from select_trace import SlTrace
+
+def read_test_list(test_list_file, timeout):
+    """ Read test list file
+    :test_list_file: test list file name
+    :timeout: default timeout seconds
+    :returns: list of (pgm_file, timeout)
+    """
+    tests = []
+    in_triple_single_quote = False
+    with open(test_list_file) as tlfp:
+        for line in tlfp:
+            if in_triple_single_quote:
+                if re.match(r"'''", line):
+                    in_triple_single_quote = False  # End it
+                continue            # Ignore all lines, including end
+
+            line = re.sub(r'\n$', '', line)     # remove eol if one
+            line = re.sub(r'\s*#.*', '', line)
+            if re.match(r'^\s*$', line):
+                continue
+
+            if re.match(r"'''", line):
+                in_triple_single_quote = True
+                continue            # Ignore current line
+
+            file_time = line.split(";")
+            pgm_file = file_time[0].strip()
+            pgm_time = timeout
+            if len(file_time) > 1:
+                pgm_time = float(file_time[1].strip())
+            tests.append((pgm_file, pgm_time))
+    return tests
+
+def start_xvfb():
+    """ Start virtual X display, if needed and available
+    :returns: (Popen or None, DISPLAY value or None)
+    """
+    if sys.platform.startswith("win") or sys.platform == "darwin":
+        return None, None       # Native display
+
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        SlTrace.lg("Xvfb not found - using current DISPLAY", to_stdout=True)
+        return None, os.environ.get("DISPLAY")
+
+    for display_num in range(99, 199):
+        if os.path.exists(f"/tmp/.X11-unix/X{display_num}"):
+            continue            # In use
+        display = f":{display_num}"
+        proc = subprocess.Popen([xvfb, display, "-screen", "0", "1280x1024x24",
+                                 "-nolisten", "tcp"],
+                                stdout=subprocess.DEVNULL,
+                                stderr=subprocess.DEVNULL)
+        time.sleep(.5)          # Let server start
+        if proc.poll() is None:
+            SlTrace.lg(f"Xvfb display {display}", to_stdout=True)
+            return proc, display
+    SlTrace.lg("Xvfb failed to start - using current DISPLAY", to_stdout=True)
+    return None, os.environ.get("DISPLAY")
+
+def run_test(pgm_file, pgm_time, out_file, env):
+    """ Run one test program
+    :pgm_file: python test file
+    :pgm_time: timeout seconds
+    :out_file: file for program stdout+stderr
+    :env: environment
+    :returns: result dictionary
+    """
+    result = dict(test=pgm_file, timeout=pgm_time, out_file=out_file,
+                  returncode=None, wall_time=None, max_rss_kb=None)
+    if not os.path.exists(pgm_file):
+        result["status"] = "missing"
+        return result
+
+    timed_out = threading.Event()
+    time_start = time.time()
+    with open(out_file, "w") as outfp:
+        proc = subprocess.Popen([sys.executable, pgm_file], env=env,
+                                stdout=outfp, stderr=subprocess.STDOUT,
+                                start_new_session=True)    # POSIX
+
+        def kill_proc():
+            timed_out.set()
+            kill_group(proc)
+
+        timer = threading.Timer(pgm_time, kill_proc)
+        timer.start()
+        try:
+            if hasattr(os, "wait4"):    # Gives this child's peak RSS
+                _, status, rusage = os.wait4(proc.pid, 0)
+                proc.returncode = os.waitstatus_to_exitcode(status)
+                result["max_rss_kb"] = rusage.ru_maxrss     # Linux: KB
+                if sys.platform == "darwin":
+                    result["max_rss_kb"] //= 1024           # bytes
+            else:
+                proc.wait()
+        finally:
+            timer.cancel()
+            kill_group(proc)            # Leftover e.g. wx_display_main
+    result["wall_time"] = time.time() - time_start
+    result["returncode"] = proc.returncode
+    with open(out_file, errors="replace") as outfp:
+        out_str = outfp.read()
+    if timed_out.is_set():
+        result["status"] = "timeout"
+    elif (proc.returncode != 0 or "FAILED" in out_str
+            or "Unexpected exception" in out_str):
+        result["status"] = "fail"
+    else:
+        result["status"] = "success"
+    return result
+
+def kill_group(proc):
+    """ Kill process and the processes it started (its process
+    group, from start_new_session), e.g. display processes
+    started with shell=True
+    :proc: Popen of group leader
+    """
+    if not hasattr(os, "killpg"):
+        if proc.returncode is None:
+            proc.kill()             # Windows: just the process
+        return
+
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass                        # Group already gone
+
+def read_history(history_file):
+    """ Read previous results
+    :returns: list of result dictionaries, oldest first
+    """
+    if not os.path.exists(history_file):
+        return []
+
+    results = []
+    with open(history_file) as hfp:
+        for line in hfp:
+            line = line.strip()
+            if line:
+                results.append(json.loads(line))
+    return results
+
+def check_regression(result, history, tolerance, min_sec, n_prev=5):
+    """ Compare wall time with previous successful runs of test
+    :result: this run's result
+    :history: previous results
+    :tolerance: allowed fractional increase over previous median
+    :min_sec: allowed increase in seconds, to ignore small tests' jitter
+    :n_prev: number of previous runs compared default: 5
+    :returns: message if a regression else None
+    """
+    if result["status"] != "success":
+        return None
+
+    prev_times = [prev["wall_time"] for prev in history
+                  if prev["test"] == result["test"]
+                  and prev["status"] == "success"][-n_prev:]
+    if len(prev_times) == 0:
+        return None
+
+    prev_median = statistics.median(prev_times)
+    wall_time = result["wall_time"]
+    if (wall_time > prev_median*(1+tolerance)
+            and wall_time - prev_median > min_sec):
+        return (f"{result['test']} time {wall_time:.1f}s >"
+                f" previous median {prev_median:.1f}s"
+                f" of {len(prev_times)} runs")
+    return None
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--list', dest='test_list_file',
+                        default="wx_tb_test_list.tests")
+    parser.add_argument('--jobs', type=int, dest='jobs',
+                        default=os.cpu_count())
+    parser.add_argument('--timeout', type=float, dest='timeout', default=160)
+    parser.add_argument('--out_dir', dest='out_dir', default="../tests")
+    parser.add_argument('--history', dest='history_file', default=None,
+                        help="JSONL history default: out_dir/wx_tb_test_history.jsonl")
+    parser.add_argument('--tolerance', type=float, dest='tolerance', default=.25)
+    parser.add_argument('--min_sec', type=float, dest='min_sec', default=2.)
+    parser.add_argument('--no_xvfb', action='store_true', dest='no_xvfb')
+    args = parser.parse_args()
+
+    SlTrace.setLogToStd(False)      # Clean display
+    SlTrace.setLogStdTs(on=False)   # No Ts on printed lines
+    SlTrace.clearFlags()
+    test_out_dir = os.path.abspath(args.out_dir)
+    if not os.path.exists(test_out_dir):
+        SlTrace.lg(f"Creating test output directory {test_out_dir}")
+        os.mkdir(test_out_dir)
+    history_file = args.history_file
+    if history_file is None:
+        history_file = os.path.join(test_out_dir, "wx_tb_test_history.jsonl")
+    history = read_history(history_file)
+    tests = read_test_list(args.test_list_file, args.timeout)
+
+    env = dict(os.environ)
+    env["WX_NULL_AUDIO"] = "1"      # SpeakerControlLocal simple_speaker
+    xvfb_proc, display = (None, None) if args.no_xvfb else start_xvfb()
+    if display is not None:
+        env["DISPLAY"] = display
+
+    tsp = SlTrace.getTs()
+    run_time_start = time.time()
+    results = []
+    regressions = []
+    try:
+        with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+            futures = []
+            for pgm_file, pgm_time in tests:
+                out_base_name = re.sub(r'\.[^.]+$', '', os.path.basename(pgm_file))
+                out_file = os.path.join(test_out_dir,
+                                        f"{out_base_name}_{tsp}.out")
+                futures.append(executor.submit(run_test, pgm_file, pgm_time,
+                                               out_file, env))
+            for future in as_completed(futures):
+                result = future.result()
+                result["run_ts"] = tsp
+                regression = check_regression(result, history,
+                                              args.tolerance, args.min_sec)
+                result["regression"] = regression is not None
+                if regression is not None:
+                    regressions.append(regression)
+                results.append(result)
+                wall_str = ("" if result["wall_time"] is None
+                            else f" {result['wall_time']:.2f} sec")
+                rss_str = ("" if result["max_rss_kb"] is None
+                           else f" rss: {result['max_rss_kb']/1024:.0f} MB")
+                SlTrace.lg(f"{result['status']:8} {result['test']}"
+                           f"{wall_str}{rss_str}", to_stdout=True)
+    finally:
+        if xvfb_proc is not None:
+            xvfb_proc.terminate()
+
+    with open(history_file, "a") as hfp:
+        for result in results:
+            print(json.dumps(result), file=hfp)
+
+    run_time_end = time.time()
+    n_status = {}
+    for result in results:
+        n_status[result["status"]] = n_status.get(result["status"], 0) + 1
+    SlTrace.lg(f"\nEnd of Testing Run time: {run_time_end-run_time_start:.1f}"
+               f" jobs: {args.jobs}", to_stdout=True)
+    SlTrace.lg("  ".join(f"{status}: {n}" for status, n in sorted(n_status.items())),
+               to_stdout=True)
+    for regression in regressions:
+        SlTrace.lg(f"Timing regression: {regression}", to_stdout=True)
+    SlTrace.lg(f"History file: {history_file}", to_stdout=True)
+    n_bad = sum(n for status, n in n_status.items() if status != "success")
+    sys.exit(1 if n_bad > 0 or regressions else 0)
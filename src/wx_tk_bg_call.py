@@ -4,6 +4,9 @@ Background caller to facilitate calling functions from within tkinter's main thr
 Tkinter requires that some functions be executed in the main thread
 """
 import queue
+import socket
+import threading as th
+import time
 import tkinter as tk
 import copy
 
@@ -30,6 +33,9 @@ class BgCallEntry:
         self.call_num = call_num
         self.ret = ret
         self.done = False       # Set when call complete
+        self.time_queued = time.perf_counter()
+        self.time_started = None
+        self.time_done = None
 
     def get_name(self):
         """ Get function name
@@ -43,65 +49,181 @@ class BgCallEntry:
 class TkBgCall:
     
     def __init__(self, root, canvas_grid=None,
-                 canvas_grid_snapshots = [], check_queue_int=10):
+                 canvas_grid_snapshots = [], check_queue_int=10,
+                 check_queue_int_max=100, tick_budget_ms=20,
+                 evict_fetched=True):
         """ Setup for background call in which runctions are called
         :root: root (root) object
         :canvas_grid: base canvas
-        :check_int: queue check interval (msec)
+        :check_queue_int: queue check interval (msec), when busy
+        :check_queue_int_max: longest check interval (msec), when idle
+                    The interval doubles each idle check up to this,
+                    only where enqueued calls also wake the tk loop
+                    directly (socket notifier, tk file handlers).
+                    Without (e.g. Windows) we keep to check_queue_int.
+        :tick_budget_ms: time (msec) spent per check draining
+                    pending calls, before letting tk run
+        :evict_fetched: True - drop call returns once fetched
+                    via get_ret/wait_ret default: True
         """
         self.root = root
         self.canvas_grid = canvas_grid
         self.canvas_grid_snapshots = canvas_grid_snapshots
         self.check_queue_int = check_queue_int
+        self.check_queue_int_max = check_queue_int_max
+        self.check_queue_int_now = check_queue_int
+        self.tick_budget_ms = tick_budget_ms
+        self.evict_fetched = evict_fetched
         self.call_num = 0               # Unique call #
-        self.call_entry_d = {}          # dictionary of pending calls
+        self.call_num_lock = th.Lock()  # Calls are set from server threads
         self.call_rets = {}             # Dictionary by call_num of pending call returns
         self.call_queue = queue.Queue()
-        self.call_ret_queue = queue.Queue()
-        cell_specs = self.canvas_grid.get_cell_specs()
-        SlTrace.lg(f"TkBgCall: cell_specs: {cell_specs}", "cell_specs")
+        self.call_done = th.Condition()   # Notified as calls complete
+        self.n_calls = 0                # Completed calls
+        self.n_checks = 0               # Queue checks with work
+        self.max_queue_depth = 0
+        self.total_wait_time = 0.       # queued to start, seconds
+        self.max_wait_time = 0.
+        self.total_exec_time = 0.       # start to done, seconds
+        self.max_exec_time = 0.
+        self.wake_recv = None           # Socket notifier pair, if supported
+        self.wake_send = None
+        self.setup_wake()
+        if self.canvas_grid is not None and SlTrace.trace("cell_specs"):
+            cell_specs = self.canvas_grid.get_cell_specs()
+            SlTrace.lg(f"TkBgCall: cell_specs: {cell_specs}", "cell_specs")
         self.set_check_queue()
 
+    def setup_wake(self):
+        """ Setup socket notifier, to wake tk loop on enqueue
+        Server threads only write a byte to the socket, never calling
+        tk; tk's event loop (mainloop or update) calls on_wake in the
+        main thread.  Without tk file handlers (e.g. Windows) we rely
+        on check_queue polling, at check_queue_int.
+        """
+        try:
+            wake_recv, wake_send = socket.socketpair()
+        except OSError as e:
+            SlTrace.lg(f"TkBgCall: no wake socket: {e}", "bg_caller")
+            return
+        
+        wake_recv.setblocking(False)
+        wake_send.setblocking(False)
+        try:
+            self.root.tk.createfilehandler(wake_recv, tk.READABLE,
+                                           self.on_wake)
+        except (AttributeError, tk.TclError) as e:
+            SlTrace.lg(f"TkBgCall: no wake file handler: {e}", "bg_caller")
+            wake_recv.close()
+            wake_send.close()
+            return
+        
+        self.wake_recv = wake_recv
+        self.wake_send = wake_send
+
     def set_check_queue(self):
         """Set check interval"
         """
-        self.root.after(self.check_queue_int, self.check_queue)
+        self.root.after(self.check_queue_int_now, self.check_queue)
                 
     def check_queue(self):
         """ check for and process any pending commands for background
+        Backs off while idle, checks quickly while busy
+        Without a wake socket, polling is all we have, so
+        no back off - the first call after idle waits as before
         """
         SlTrace.lg("check_queue", "check_queue")
+        if (self.drain_queue() > 0 or not self.call_queue.empty()
+                or self.wake_send is None):
+            self.check_queue_int_now = self.check_queue_int
+        else:
+            self.check_queue_int_now = min(self.check_queue_int_now*2,
+                                           self.check_queue_int_max)
+        self.set_check_queue()    
+
+    def on_wake(self, file=None, mask=None):
+        """ Enqueue wake up, in main thread
+        :file, mask: from tk file handler
+        """
+        try:
+            while self.wake_recv.recv(4096):
+                pass            # Wake ups since last time
+        except BlockingIOError:
+            pass
+        
+        if self.drain_queue() > 0:
+            self.check_queue_int_now = self.check_queue_int
         if not self.call_queue.empty():
-            call_entry = self.call_queue.get()
+            self.wake()         # Out of time budget - continue after tk runs
+        
+    def drain_queue(self):
+        """ Process pending calls, till queue is empty
+        or the tick's time budget is used
+        MUST BE CALLED FROM MAIN THREAD
+        :returns: number of calls processed
+        """
+        depth = self.call_queue.qsize()
+        if depth > self.max_queue_depth:
+            self.max_queue_depth = depth
+        t_end = time.perf_counter() + self.tick_budget_ms/1000.
+        ncall = 0
+        while True:
+            try:
+                call_entry = self.call_queue.get_nowait()
+            except queue.Empty:
+                break
+            
             SlTrace.lg(f"check_queue call_entry:{call_entry}", "check_queue")
             self.bg_caller(call_entry)
-        self.set_check_queue()    
-            
-
+            ncall += 1
+            if time.perf_counter() >= t_end:
+                break
+        if ncall > 0:
+            self.n_checks += 1
+        return ncall
+    
+    def wake(self):
+        """ Wake tk main thread to process queue now
+        Safe from any thread.  Falls back on check_queue's fixed
+        interval polling if there is no socket notifier
+        """
+        if self.wake_send is None:
+            return
+        
+        try:
+            self.wake_send.send(b"w")
+        except BlockingIOError:
+            pass                # Socket full - wake ups already pending
+        except OSError as e:
+            SlTrace.lg(f"TkBgCall: wake failed: {e}", "bg_caller")
+        
     def next_call_num(self, call_num=None):
         """ Get/adjust next call number
         :call_num: next call number
             default: increase number by one
         :returns: updated call number
         """
-        if call_num is None:
-            call_num = self.call_num + 1
-        self.call_num = call_num
-        return self.call_num
+        with self.call_num_lock:
+            if call_num is None:
+                call_num = self.call_num + 1
+            self.call_num = call_num
+            return self.call_num
 
 
     
     def bg_caller(self, call_entry):
         """ Calls function.  Signals when call is complete
         MUST BE CALLED FROM MAIN THREAD
-        :call_num: index in self.call_entry_d of function entry 
+        :call_entry: BgCallEntry of function
         """
         SlTrace.lg(f"bg_caller calling {call_entry}", "bg_calling")
+        call_entry.time_started = time.perf_counter()
         name = call_entry.get_name()
         if name == "get_cell_specs":
-            cell_specs = self.canvas_grid.get_cell_specs()
-            SlTrace.lg(f"\nTkBgCall:bg_caller cell_specs: {cell_specs}",
-                       "cell_specs")
+            if SlTrace.trace("cell_specs"):
+                cell_specs = self.canvas_grid.get_cell_specs()
+                SlTrace.lg(f"\nTkBgCall:bg_caller cell_specs: {cell_specs}",
+                           "cell_specs")
             if "snapshot_num" in call_entry.kwargs:
                 snapshot_num = call_entry.kwargs["snapshot_num"]
                 SlTrace.lg(f"bg_caller snapshot[{snapshot_num}]", "bg_caller")                
@@ -127,10 +249,42 @@ class TkBgCall:
         SlTrace.lg(f"TkBgCall.bg_caller: retorig:{retorig}", "bg_caller")
         ret = copy.copy(retorig)
         SlTrace.lg(f"TkBgCall:bg_caller ret: {ret}", "bg_caller")
-        self.call_rets[call_entry.call_num] = ret
-        call_entry.ret = ret     # Save function return for delayed return
-        call_entry.done = True   # Set call completion indicator
-        self.call_ret_queue.put(call_entry)
+        call_entry.time_done = time.perf_counter()
+        self.record_call_times(call_entry)
+        with self.call_done:
+            self.call_rets[call_entry.call_num] = ret
+            call_entry.ret = ret     # Save function return for delayed return
+            call_entry.done = True   # Set call completion indicator
+            self.call_done.notify_all()
+
+    def record_call_times(self, call_entry):
+        """ Update latency counters from completed call
+        """
+        wait_time = call_entry.time_started - call_entry.time_queued
+        exec_time = call_entry.time_done - call_entry.time_started
+        self.n_calls += 1
+        self.total_wait_time += wait_time
+        self.total_exec_time += exec_time
+        if wait_time > self.max_wait_time:
+            self.max_wait_time = wait_time
+        if exec_time > self.max_exec_time:
+            self.max_exec_time = exec_time
+
+    def get_stats(self):
+        """ Get queue counters
+        :returns: dictionary of counters, times in seconds
+        """
+        n_calls = max(self.n_calls, 1)
+        return {"queue_depth" : self.call_queue.qsize(),
+                "max_queue_depth" : self.max_queue_depth,
+                "unfetched_rets" : len(self.call_rets),
+                "n_calls" : self.n_calls,
+                "n_checks" : self.n_checks,
+                "check_queue_int" : self.check_queue_int_now,
+                "avg_wait_time" : self.total_wait_time/n_calls,
+                "max_wait_time" : self.max_wait_time,
+                "avg_exec_time" : self.total_exec_time/n_calls,
+                "max_exec_time" : self.max_exec_time}
     
     def set_call(self, function, *args, **kwargs):
         """ Setup call function and args in dictionary to be called in the future in bacground
@@ -144,26 +298,51 @@ class TkBgCall:
         call_entry = BgCallEntry(self, function, args, kwargs, root=self.root)
         SlTrace.lg(f"call_queue.put {call_entry}", "bg_caller")
         self.call_queue.put(call_entry)
+        self.wake()
         return call_entry.call_num
        
     def get_ret(self, call_num):
         """ Get call return
+        If evict_fetched, the return is dropped once fetched
         :call_num: unique call number
         :returns: call's return, None if not ready
         """
-        if call_num in self.call_rets:
-            return self.call_rets[call_num]
+        with self.call_done:
+            if call_num in self.call_rets:
+                if self.evict_fetched:
+                    return self.call_rets.pop(call_num)
+                return self.call_rets[call_num]
         
         return None
+
+    def wait_ret(self, call_num, timeout=None):
+        """ Wait, without polling, for call return
+        NOT to be called from main thread, which makes the call
+        :call_num: unique call number
+        :timeout: maximum wait in seconds default: no limit
+        :returns: (is_done, ret) is_done False if timed out
+        """
+        with self.call_done:
+            is_done = self.call_done.wait_for(
+                            lambda: call_num in self.call_rets,
+                            timeout=timeout)
+            if not is_done:
+                return False, None
+            
+            if self.evict_fetched:
+                return True, self.call_rets.pop(call_num)
+            return True, self.call_rets[call_num]
+        
     def wait_completion(self, call_num):
         """ Wait till call completed, giving background time to continue
         :call_num: call number
+        :returns: call's return
         """
         while True:
             self.root.update()
             call_ret = self.get_ret(call_num)
             if call_ret is not None:
-                break
+                return call_ret
 
 '''                    
     def call(self, *args, **kwargs):
@@ -191,12 +370,11 @@ if __name__ == '__main__':
     
     call_num = bg.set_call(test_fn, root,  "a1_val", kwa="kwa_val")
     print(f"call_num={call_num}")
-    bg.wait_completion(call_num)
-    ret = bg.get_ret(call_num)
+    ret = bg.wait_completion(call_num)
     print(f"call_ret: {ret}\n")
 
     call_num = bg.set_call(test_fn, root, "a1_second_call")
     print(f"call_num={call_num}")
-    bg.wait_completion(call_num)
-    ret = bg.get_ret(call_num)
+    ret = bg.wait_completion(call_num)
     print(f"call_ret: {ret}\n")
+    print(f"stats: {bg.get_stats()}")
@@ -66,9 +66,12 @@ class TkRPCHost:
         self.to_host_server.registerMethod(self.get_canvas_lims)
         self.to_host_server.registerMethod(self.get_cell_rect_tur)
         self.to_host_server.registerMethod(self.get_cell_specs)
+        self.to_host_server.registerMethod(self.get_cell_specs_delta)
         self.to_host_server.registerMethod(self.snapshot_complete)
         self.to_host_server.registerMethod(self.test_dummy)
         self.to_host_server.registerMethod(self.get_ret)
+        self.to_host_server.registerMethod(self.wait_ret, blocking=True)
+        self.to_host_server.registerMethod(self.get_bg_stats)
         th.Thread(target=self.cmd_in_th_proc).start()
 
         
@@ -129,10 +132,10 @@ class TkRPCHost:
         self.snapshot_is_complete = False
         SlTrace.lg(f"self.from_host_client.snapshot({title})", "snapshot")
         ###snapshot = copy.deepcopy(self.canvas_grid)   # fails
-        snapshot = self.canvas_grid.copy()
-        snapshot_str = snapshot.canvas_show_items()
+        snapshot = self.canvas_grid.snapshot()     # No tk copy
         sno = len(self.canvas_grid_snapshots)+1
-        SlTrace.lg(f"\nsnapshot[{sno}]: {snapshot_str}", "snapshot")
+        SlTrace.lg(lambda: f"\nsnapshot[{sno}]: {snapshot.canvas_show_items()}",
+                   "snapshot")
         self.canvas_grid_snapshots.append(snapshot)
         self.from_host_client.snapshot(f"{sno}: {title}",
                         snapshot_num=sno)
@@ -168,6 +171,20 @@ class TkRPCHost:
         :call_num: unique call number
         """
         return self.bg.get_ret(call_num)
+
+    def get_bg_stats(self):
+        """ Get main thread call queue counters (depth, latency)
+        :returns: dictionary of counters - see TkBgCall.get_stats
+        """
+        return self.bg.get_stats()
+
+    def wait_ret(self, call_num, timeout=None):
+        """ Long poll for call return - replaces get_ret polling
+        :call_num: unique call number
+        :timeout: maximum wait in seconds default: no limit
+        :returns: (is_done, ret) is_done False if timed out
+        """
+        return self.bg.wait_ret(call_num, timeout=timeout)
             
     def get_cell_specs(self,
                         snapshot_num=None,
@@ -176,12 +193,13 @@ class TkRPCHost:
                         x_max=None, y_max=None,
                         n_cols=None, n_rows=None):
 
-        cell_specs = self.canvas_grid.get_cell_specs()
-        SlTrace.lg(f"\nTkRPCHost:canvas_grid.get_cell_specs cell_specs(): {cell_specs}", "HOST")
+        if SlTrace.trace("HOST"):
+            cell_specs = self.canvas_grid.get_cell_specs()
+            SlTrace.lg(f"\nTkRPCHost:canvas_grid.get_cell_specs cell_specs(): {cell_specs}", "HOST")
         if snapshot_num is None or snapshot_num == 0:
             canvas_grid = self.canvas_grid
         else:
-            canvas_grid = self.canvas_grid_snapshots
+            canvas_grid = self.canvas_grid_snapshots[snapshot_num-1]
         ret = canvas_grid.get_cell_specs(
                         win_fract=win_fract, 
                         x_min=x_min, y_min=y_min,
@@ -195,6 +213,24 @@ class TkRPCHost:
                     """, "cell_specs")        
         return ret
         #return cell_specs   # TFD return strait from grid
+
+    def get_cell_specs_delta(self,
+                        win_fract=True, 
+                        x_min=None, y_min=None,
+                        x_max=None, y_max=None,
+                        n_cols=None, n_rows=None):
+        """ Get cell changes since previous call
+        :returns: dictionary of "added", "removed", "changed"
+                lists of (ix,iy,color)
+        """
+        ret = self.canvas_grid.get_cell_specs(
+                        win_fract=win_fract, 
+                        x_min=x_min, y_min=y_min,
+                        x_max=x_max, y_max=y_max,
+                        n_cols=n_cols, n_rows=n_rows,
+                        delta=True)
+        SlTrace.lg(f"TkRPCHost: get_cell_specs_delta ret : {ret}", "cell_specs")        
+        return ret
     '''        
     def get_cell_specs_set(self,
                         win_fract=None, 
@@ -220,15 +256,16 @@ class TkRPCHost:
         return ret     # TFD
             
 
-    def get_canvas_lims(self):
+    def get_canvas_lims(self, win_fract=True):
         """ Get canvas limits - internal values, to which
         self.base.find_overlapping(cx1,cy1,cx2,cy2) obeys.
         NOTE: These values, despite some vague documentation, may be negative
               to adhere to turtle coordinate settings.
-        
+        :win_fract: True - fractional 0. to 1.
+                    False - window coordinates
         :returns: internal (xmin, xmax, ymin, ymax)
         """
-        ret = self.canvas_grid.get_canvas_lims()
+        ret = self.canvas_grid.get_canvas_lims(win_fract=win_fract)
         return ret
         
     def test_command(self, message="No Message Sent"):
@@ -4,6 +4,7 @@ Supporting communication betw
 """
 import socket as sk
 import threading as th
+from concurrent.futures import ThreadPoolExecutor
 import queue
 import pickle
 import time
@@ -24,7 +25,8 @@ class TkRPCUser:
                  host_port=None,
                  max_recv=2**16, simulated=False,
                  cmd_time_ms= 500,
-                 figure=1):
+                 figure=1,
+                 wait_ret_timeout=5.):
         """ Handle user (wxPython) side of communications
         :host_name: servere host name default: localhost - same machine
         :host_port: port to send server requests
@@ -35,6 +37,8 @@ class TkRPCUser:
         :simulated: True: simulate tk input default: False
         :figure: simulated figure 1 - spokes, 2 - square
                 default=1 spokes
+        :wait_ret_timeout: longest single host wait_ret long poll,
+                    in seconds default: 5.
         """
         SlTrace.lg("TkRPCUser() __init__() BEGIN", "tk_link")
         self.adw = None         # Set when ready
@@ -51,6 +55,8 @@ class TkRPCUser:
         self.max_recv = max_recv
         self.cmd_time_ms = cmd_time_ms
         self.simulated = simulated
+        self.wait_ret_timeout = wait_ret_timeout
+        self.ret_executor = None        # Created on first host call
         SlTrace.lg("TkRPCUser() __init__()", "tk_link")
         if simulated:
             self.make_simulated(figure=figure)
@@ -73,6 +79,21 @@ class TkRPCUser:
         SlTrace.lg(f"USER: server_host_th_proc", "tk_link")
         self.from_host_server.run()
 
+    def close(self):
+        """ Close host link, freeing our user port
+        e.g. display server session ending, with process continuing
+        """
+        SlTrace.lg(f"USER: close host_port:{self.host_port}", "tk_link")
+        if self.simulated:
+            return
+
+        from_host_server = getattr(self, "from_host_server", None)
+        if from_host_server is not None:
+            from_host_server.stop()
+        if self.ret_executor is not None:
+            self.ret_executor.shutdown(wait=False)
+        self.to_host.disconnect()
+
     """
     User based functions
     remotely requested from the host  
@@ -112,6 +133,36 @@ class TkRPCUser:
 
         self.snapshot_complete()
 
+    def call_host(self, function_name, *args, **kwargs):
+        """ Call host function in the host's tk main thread
+        :function_name: registered host function name
+        :args, kwargs: function's args
+        :returns: concurrent.futures.Future of the function's return
+        """
+        if self.ret_executor is None:
+            self.ret_executor = ThreadPoolExecutor(max_workers=4,
+                                        thread_name_prefix="TkRPCUser")
+        call_num = getattr(self.to_host, function_name)(*args,
+                                    TK_EXECUTE_IN_MAIN_THREAD=True,
+                                    **kwargs)
+        SlTrace.lg(f"TkRPCUser:call_host {function_name} call_num:{call_num}",
+                   "tk_link")
+        return self.ret_executor.submit(self.wait_host_ret, call_num)
+
+    def wait_host_ret(self, call_num):
+        """ Wait for host call's return, via host long poll
+        :call_num: host's call number
+        :returns: call's return
+        """
+        while True:
+            is_done, ret = self.to_host.wait_ret(call_num,
+                                                 self.wait_ret_timeout)
+            if is_done:
+                return ret
+            
+            SlTrace.lg(f"TkRPCUser: still waiting for call {call_num}",
+                       "tk_link")
+            
     def snapshot_complete(self):
         """ Signal snapshot competion
         """
@@ -140,18 +191,37 @@ class TkRPCUser:
                         x_max=x_max, y_max=y_max,
                         n_cols=n_cols, n_rows=n_rows)
         
-        call_num = self.to_host.get_cell_specs(
-                    TK_EXECUTE_IN_MAIN_THREAD=True,
+        ret = self.call_host("get_cell_specs",
                     snapshot_num=snapshot_num,
                     x_min=x_min, y_min=y_min,
                     x_max=x_max, y_max=y_max,
-                    n_cols=n_cols, n_rows=n_rows)
-        SlTrace.lg(f"TkRPCUser:get_cell_specs call_num:{call_num}", "tk_link")
-        while True:
-            ret = self.to_host.get_ret(call_num)
-            if ret is not None:
-                break
-        SlTrace.lg(f"TkRPCUser:get_cell_specs[{call_num}] ret:{ret}", "tk_link")
+                    n_cols=n_cols, n_rows=n_rows).result()
+        SlTrace.lg(f"TkRPCUser:get_cell_specs ret:{ret}", "tk_link")
+        return ret    
+    
+    def get_cell_specs_delta(self,
+                        win_fract=True, 
+                        x_min=None, y_min=None,
+                        x_max=None, y_max=None,
+                        n_cols=None, n_rows=None):
+        """ Get cell changes, since our previous call, from remote tk canvas
+        :returns: dictionary of "added", "removed", "changed"
+                lists of (ix,iy,color)
+        """
+        if self.simulated:
+            return self.sim_cg.get_cell_specs(
+                        win_fract=win_fract, 
+                        x_min=x_min, y_min=y_min,
+                        x_max=x_max, y_max=y_max,
+                        n_cols=n_cols, n_rows=n_rows,
+                        delta=True)
+        
+        ret = self.call_host("get_cell_specs_delta",
+                    win_fract=win_fract,
+                    x_min=x_min, y_min=y_min,
+                    x_max=x_max, y_max=y_max,
+                    n_cols=n_cols, n_rows=n_rows).result()
+        SlTrace.lg(f"TkRPCUser:get_cell_specs_delta ret:{ret}", "tk_link")
         return ret    
     
     def get_cell_specs_simulated(self, 
@@ -202,15 +272,25 @@ class TkRPCUser:
             return self.get_cell_rect_tur_simulated(
                         ix=ix,iy=iy)
         
-        call_num = self.to_host.get_cell_rect_tur(ix, iy,
-                    TK_EXECUTE_IN_MAIN_THREAD=True)
-        while True:
-            ret = self.to_host.get_ret(call_num)
-            if ret is not None:
-                break
+        ret = self.call_host("get_cell_rect_tur", ix, iy).result()
         SlTrace.lg(f"get_cell_rect_tur ret:{ret}", "rpc,tk_link")
         return ret    
     
+    def get_cell_rect_turs(self, ixys):
+        """ Get several cells' turtle rectangles in one host exchange
+        :ixys: list of (ix,iy) cell indexes
+        :returns: list of (min_x,max_y, max_x,min_y)
+        """
+        if self.simulated:
+            return [self.get_cell_rect_tur_simulated(ix,iy)
+                    for ix,iy in ixys]
+        
+        # Cell rectangles are computed without tk - no main thread wait
+        ret = self.to_host.batch([("get_cell_rect_tur", (ix,iy), {})
+                                  for ix,iy in ixys])
+        SlTrace.lg(f"get_cell_rect_turs ret:{ret}", "rpc,tk_link")
+        return ret
+    
     def get_cell_rect_tur_simulated(self, 
                         ix,iy):
         """ Get cell rectangle
@@ -234,12 +314,7 @@ class TkRPCUser:
         
         #return self.to_host.get_canvas_lims(win_fract)
         
-        call_num = self.to_host.get_canvas_lims(win_fract,
-                    TK_EXECUTE_IN_MAIN_THREAD=True)
-        while True:
-            ret = self.to_host.get_canvas_lims(call_num)
-            if ret is not None:
-                break
+        ret = self.call_host("get_canvas_lims", win_fract).result()
         SlTrace.lg(f"get_canvas_lims ret:{ret}", "tk_link")
         return ret    
                         
@@ -28,6 +28,7 @@ from wx_tk_rpc_host import TkRPCHost
 from select_trace import SlTrace
 from wx_canvas_grid import CanvasGrid
 from wx_braille_cell_list import BrailleCellList
+from wx_display_server_link import connect_display_server
 """
 External functions 
 Some day may model after turtle's _make_global_funcs
@@ -37,18 +38,26 @@ tkh = None
 root = tk.Tk()
 root.withdraw()     # Hide tk window
 canvas = None
-pdisplay = None
+pdisplay = None         # display process, if started
+display_server = None   # display server link, if using server
+display_session = None  # display server session number
+MAX_CHECK_ERRORS = 5    # Consecutive server check failures
+                        # before taking the server as gone
+n_check_errors = 0
 
 def setup_main(title=None, port=None):
     global tkh
     global canvas
     global pdisplay
+    global display_server
+    global display_session
     
     if canvas is None:
         canvas = tur.getcanvas()
-    cg = CanvasGrid(base=canvas)
-    cells = cg.get_cell_specs()
-    SlTrace.lg(f"\nsetup_main: cells:{cells}", "cell_specs")
+    cg = CanvasGrid(base=canvas, track_changes=True)
+    if SlTrace.trace("cell_specs"):
+        cells = cg.get_cell_specs()
+        SlTrace.lg(f"\nsetup_main: cells:{cells}", "cell_specs")
     src_file = __file__     # To be replaced with src file
     if '__main__' in sys.modules:        
         src_file = sys.modules['__main__'].__file__
@@ -70,14 +79,21 @@ def setup_main(title=None, port=None):
     id_title = id_title.replace(" ", "_")
     title = id_title.replace(" ", "_")
     SlTrace.lg(f"setup_main: {id_title = }")
-    pdisplay = subprocess.Popen(f"python wx_display_main.py"
-                                f" --id_title {id_title}"
-                                f" --title {title}"
-                                f" --host_port={tkh.host_port}"
-                                f" --src_file={src_file}"
-                                 " --subprocess",
-                    cwd=src_dir,
-                    shell=True)
+    display_server = connect_display_server()
+    if display_server is not None:
+        display_session = display_server.open_session(tkh.host_port,
+                                    id_title=id_title, title=title,
+                                    src_file=src_file)
+        SlTrace.lg(f"setup_main: display server session {display_session}")
+    else:
+        pdisplay = subprocess.Popen(f"python wx_display_main.py"
+                                    f" --id_title {id_title}"
+                                    f" --title {title}"
+                                    f" --host_port={tkh.host_port}"
+                                    f" --src_file={src_file}"
+                                     " --subprocess",
+                        cwd=src_dir,
+                        shell=True)
     check_display()
     tkh.wait_for_user()     # Wait till setup, possibly snapshot is done
 
@@ -90,23 +106,46 @@ def mainloop(title=None, file=None, port=None):
     global tkh
     global canvas
     
-    if pdisplay is None:
+    if pdisplay is None and display_session is None:
         setup_main(title=title, port=port)
     tur.mainloop()
+    disconnect_display_server()
              
 def check_display():
-    """ Check if display process exited
+    """ Check if display process exited, or display
+    server session closed
     Recheck after delay
     """
     global n_check
-    if pdisplay is None:
+    global n_check_errors
+    global display_server
+    if pdisplay is None and display_session is None:
         return              # Start checking when launched
     
     n_check += 1
-    rc = pdisplay.poll()
+    if display_session is not None:
+        rc = None
+        try:
+            if display_server is None:
+                display_server = connect_display_server()
+            if display_server is None:
+                raise ConnectionError("no display server")
+            
+            if not display_server.is_session_open(display_session):
+                rc = "session closed"
+            n_check_errors = 0
+        except Exception as e:
+            n_check_errors += 1
+            SlTrace.lg(f"check_display: server error {n_check_errors}: {e}")
+            disconnect_display_server()     # reconnect on next check
+            if n_check_errors >= MAX_CHECK_ERRORS:
+                rc = "display server gone"
+    else:
+        rc = pdisplay.poll()
     #SlTrace.lg(f"check_display: {n_check}")
     if rc != None:
         SlTrace.lg(f"Subprocess exited with rc:{rc}")
+        disconnect_display_server()
         root.destroy()
         SlTrace.onexit()    # Close log
         os._exit(0)     # Stop all processes
@@ -114,6 +153,14 @@ def check_display():
     tur.ontimer(check_display, 1000)
     #tur.ontimer(check_display, 10)
         
+def disconnect_display_server():
+    """ Drop display server link, if one
+    """
+    global display_server
+    if display_server is not None:
+        display_server.disconnect()
+        display_server = None
+        
 #tur.mainloop()
 #sys.exit(0)
 
@@ -123,7 +170,7 @@ def snapshot(title=None, port=None):
     :title: Title description default: generated
     """
     SlTrace.lg(f"snapshot title={title} port={port}")
-    if pdisplay is None:
+    if pdisplay is None and display_session is None:
         setup_main(title="Setup for snapshots", port=port)                # Create first window with current display
     tkh.snapshot(title=title)
 